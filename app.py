@@ -7,13 +7,20 @@ from flask import Flask, render_template, request, redirect, url_for, session, j
 from flask_socketio import SocketIO, emit, join_room, leave_room, disconnect
 from functools import wraps
 import os
+import random
 from datetime import datetime
 from auth import auth_manager, User
 from package.banco import BancoDados
 from package.personagens.guerreiro import Guerreiro
 from package.personagens.mago import Mago
 from package.personagens.arqueiro import Arqueiro
-from package.combate import Combate
+from package.combate import Combate, ACAO_ATACAR, ACAO_DEFENDER
+from package.ia import JogadorMCTS
+
+try:
+    from eventlet import tpool
+except ImportError:
+    tpool = None
 
 
 class BattleSimulatorApp:
@@ -34,6 +41,12 @@ class BattleSimulatorApp:
         # Inicializar SocketIO
         self.socketio = SocketIO(self.app, cors_allowed_origins="*")
         
+        # Com eventlet, o bcrypt roda no pool de threads do eventlet para não
+        # travar o hub (e as batalhas em andamento) durante logins e registros
+        auth_manager.password_hasher.use_tpool = self.socketio.async_mode == 'eventlet'
+        # Pelo mesmo motivo, a busca da IA roda no pool de threads do eventlet
+        self.bot_em_tpool = self.socketio.async_mode == 'eventlet'
+        
         # Inicializar banco de dados do jogo
         self.banco = BancoDados()
         
@@ -43,6 +56,9 @@ class BattleSimulatorApp:
         # Usuários conectados (user_id -> socket_id)
         self.connected_users = {}
         
+        # Tempo de decisão da IA por jogada (ms)
+        self.orcamento_bot_ms = float(os.environ.get('BOT_ORCAMENTO_MS', '20'))
+        
         self._setup_routes()
         self._setup_socket_events()
     
@@ -150,8 +166,7 @@ class BattleSimulatorApp:
             user = request.current_user
             
             # Buscar personagens do usuário
-            personagens = self.banco.carregar_todos_personagens()
-            user_characters = [p for p in personagens if hasattr(p, 'owner_id') and p.owner_id == user.id]
+            user_characters = self.banco.carregar_personagens_do_usuario(user.id)
             
             return render_template('dashboard.html', 
                                  user=user, 
@@ -203,12 +218,99 @@ class BattleSimulatorApp:
         @self.require_auth
         def api_characters():
             """API para listar personagens do usuário."""
-            personagens = self.banco.carregar_todos_personagens()
-            user_characters = [
-                p.to_dict() for p in personagens 
-                if hasattr(p, 'owner_id') and p.owner_id == request.current_user.id
-            ]
-            return jsonify(user_characters)
+            personagens = self.banco.carregar_personagens_do_usuario(request.current_user.id)
+            return jsonify([p.to_dict() for p in personagens])
+    
+    def _executar_acao(self, combate: Combate, action: str, habilidade_id=None):
+        """
+        Executa uma ação no combate.
+        
+        Returns:
+            Resultado da ação, ou None se a ação for inválida
+        """
+        if action == 'atacar':
+            return combate.executar_ataque()
+        elif action == 'defender':
+            return combate.executar_defesa()
+        elif action == 'habilidade' and habilidade_id:
+            return combate.usar_habilidade(habilidade_id)
+        return None
+    
+    def _publicar_resultado(self, battle_room_id: str, combate: Combate, resultado) -> None:
+        """
+        Envia o resultado de uma ação para a sala e encerra a batalha se terminou.
+        """
+        # Atualizar estado da batalha
+        battle_update = {
+            'action_result': resultado,
+            'combate': combate.obter_resumo_combate()
+        }
+        
+        # Enviar atualização para ambos os jogadores (socketio.emit também
+        # funciona fora de um handler, na jogada da IA em segundo plano)
+        self.socketio.emit('battle_update', battle_update, room=battle_room_id)
+        
+        # Verificar se a batalha terminou
+        if combate.finalizado:
+            # Salvar no histórico (o oponente da IA não é um personagem salvo)
+            battle_data = self.active_battles[battle_room_id]
+            bots = (battle_data['bot_personagem'],) if 'bot' in battle_data else ()
+            self.banco.salvar_historico_combate(combate, bots)
+            
+            # Remover batalha ativa
+            del self.active_battles[battle_room_id]
+            
+            # Notificar fim da batalha
+            self.socketio.emit('battle_ended', {
+                'winner': combate.vencedor.nome if combate.vencedor else None,
+                'combate': combate.obter_resumo_combate()
+            }, room=battle_room_id)
+    
+    def _agendar_turno_bot(self, battle_room_id: str) -> None:
+        """
+        Agenda a jogada da IA em segundo plano se for a vez dela na batalha.
+        
+        O handler do socket retorna logo; a busca do MCTS não prende o
+        worker (nem o hub do eventlet) pelo orçamento de decisão.
+        """
+        battle_data = self.active_battles.get(battle_room_id)
+        if not battle_data or 'bot' not in battle_data or battle_data['bot_pensando']:
+            return
+        
+        combate = battle_data['combate']
+        if combate.finalizado or combate.personagem_ativo is not battle_data['bot_personagem']:
+            return
+        
+        battle_data['bot_pensando'] = True
+        self.socketio.start_background_task(self._jogar_turno_bot, battle_room_id, battle_data)
+    
+    def _jogar_turno_bot(self, battle_room_id: str, battle_data: dict) -> None:
+        """
+        Executa a jogada da IA (tarefa de segundo plano de _agendar_turno_bot).
+        """
+        combate = battle_data['combate']
+        try:
+            # A busca simula jogadas sobre uma cópia, então outros handlers
+            # podem ler e salvar o combate enquanto a IA pensa; só a ação
+            # escolhida é aplicada ao combate real
+            copia = combate.copiar()
+            if self.bot_em_tpool:
+                acao = tpool.execute(battle_data['bot'].escolher_acao, copia)
+            else:
+                acao = battle_data['bot'].escolher_acao(copia)
+            
+            if acao in (ACAO_ATACAR, ACAO_DEFENDER):
+                resultado = self._executar_acao(combate, acao)
+            else:
+                resultado = self._executar_acao(combate, 'habilidade', acao)
+            
+            # A batalha pode ter sido encerrada enquanto a IA pensava
+            if self.active_battles.get(battle_room_id) is battle_data:
+                self._publicar_resultado(battle_room_id, combate, resultado)
+        except Exception as e:
+            print(f"Erro na jogada da IA: {e}")
+        finally:
+            battle_data['bot_pensando'] = False
     
     def _setup_socket_events(self):
         """
@@ -391,39 +493,59 @@ class BattleSimulatorApp:
                 return
             
             # Executar ação
-            resultado = None
-            if action == 'atacar':
-                resultado = combate.executar_ataque()
-            elif action == 'defender':
-                resultado = combate.executar_defesa()
-            elif action == 'habilidade':
-                habilidade_id = data.get('habilidade_id')
-                if habilidade_id:
-                    resultado = combate.usar_habilidade(habilidade_id)
+            resultado = self._executar_acao(combate, action, data.get('habilidade_id'))
             
             if resultado:
-                # Atualizar estado da batalha
-                battle_update = {
-                    'action_result': resultado,
-                    'combate': combate.obter_resumo_combate()
-                }
-                
-                # Enviar atualização para ambos os jogadores
-                emit('battle_update', battle_update, room=battle_room_id)
+                self._publicar_resultado(battle_room_id, combate, resultado)
                 
-                # Verificar se a batalha terminou
-                if combate.finalizado:
-                    # Salvar no histórico
-                    self.banco.salvar_historico_combate(combate)
-                    
-                    # Remover batalha ativa
-                    del self.active_battles[battle_room_id]
-                    
-                    # Notificar fim da batalha
-                    emit('battle_ended', {
-                        'winner': combate.vencedor.nome if combate.vencedor else None,
-                        'combate': combate.obter_resumo_combate()
-                    }, room=battle_room_id)
+                # Em batalhas contra a IA, ela responde em seguida
+                self._agendar_turno_bot(battle_room_id)
+        
+        @self.socketio.on('start_bot_battle')
+        def handle_start_bot_battle(data):
+            """Iniciar batalha contra a IA."""
+            session_token = session.get('session_token')
+            user = auth_manager.validate_session(session_token)
+            
+            if not user:
+                emit('error', {'message': 'Não autenticado'})
+                return
+            
+            personagem = self.banco.carregar_personagem(data.get('character_id'))
+            if not personagem or getattr(personagem, 'owner_id', None) != user.id:
+                emit('error', {'message': 'Personagem não encontrado ou não pertence ao usuário'})
+                return
+            
+            # Criar oponente controlado pela IA
+            classes_bot = {'guerreiro': Guerreiro, 'mago': Mago, 'arqueiro': Arqueiro}
+            classe_bot = classes_bot.get(data.get('bot_classe')) or random.choice(list(classes_bot.values()))
+            bot_personagem = classe_bot(f"IA {classe_bot.__name__}")
+            bot_personagem.owner_id = None
+            
+            combate = Combate(personagem, bot_personagem)
+            battle_room_id = f"battle_{combate.id}"
+            
+            self.active_battles[battle_room_id] = {
+                'combate': combate,
+                'player1_id': user.id,
+                'player2_id': None,
+                'player1_socket': request.sid,
+                'player2_socket': None,
+                'bot': JogadorMCTS(orcamento_ms=self.orcamento_bot_ms),
+                'bot_personagem': bot_personagem,
+                'bot_pensando': False
+            }
+            
+            join_room(battle_room_id)
+            
+            emit('battle_started', {
+                'battle_id': combate.id,
+                'room_id': battle_room_id,
+                'combate': combate.obter_resumo_combate()
+            }, room=battle_room_id)
+            
+            # A IA pode ter a iniciativa
+            self._agendar_turno_bot(battle_room_id)
     
     def run(self, debug=True, host='127.0.0.1', port=5000):
         """
@@ -439,8 +561,10 @@ class BattleSimulatorApp:
         print(f"🔐 Sistema de autenticação ativo")
         print(f"⚡ WebSocket habilitado para batalhas em tempo real")
         
-        # Limpar sessões expiradas
-        auth_manager.cleanup_expired_sessions()
+        # Limpar sessões expiradas agora e periodicamente em segundo plano
+        auth_manager.start_session_reaper(
+            interval=float(os.environ.get('SESSION_REAPER_INTERVAL', '600'))
+        )
         
         self.socketio.run(self.app, debug=debug, host=host, port=port)
 
@@ -3,14 +3,25 @@ Sistema de Autenticação - Medieval Fantasy Battle Simulator
 Módulo responsável pelo controle de usuários, registro, login e segurança.
 """
 
+import atexit
 import hashlib
 import secrets
 import sqlite3
 import os
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 import bcrypt
 
+try:
+    from eventlet import tpool
+except ImportError:
+    tpool = None
+
 
 class User:
     """
@@ -53,28 +64,281 @@ class User:
         }
 
 
+class PasswordHasherBusy(Exception):
+    """
+    Erro lançado quando a fila de hashing de senhas está cheia.
+    """
+
+
+class PasswordHasher:
+    """
+    Executa o bcrypt em um pool limitado de threads de trabalho.
+    
+    O bcrypt é propositalmente lento e, chamado direto em um handler, trava
+    o hub do eventlet (e todas as batalhas em andamento) até terminar. Aqui
+    ele roda em threads do sistema: no pool de threads do eventlet
+    (``tpool``) quando use_tpool está ativo, ou em um ThreadPoolExecutor
+    próprio caso contrário. Operações além de max_pending são recusadas em
+    vez de enfileiradas sem limite.
+    """
+    
+    def __init__(self, rounds: int = 12, max_workers: int = 4, max_pending: int = 32,
+                 use_tpool: bool = False):
+        """
+        Inicializa o pool de hashing.
+        
+        Args:
+            rounds: Fator de custo do bcrypt (log2 do número de iterações, 4 a 31)
+            max_workers: Threads de trabalho do pool próprio
+            max_pending: Operações simultâneas (em execução ou na fila) aceitas
+            use_tpool: Usar o pool de threads do eventlet (servidor com eventlet)
+        """
+        if not 4 <= rounds <= 31:
+            raise ValueError(f"Custo do bcrypt deve estar entre 4 e 31: {rounds}")
+        if max_workers < 1 or max_pending < 1:
+            raise ValueError("O pool de hashing precisa de pelo menos uma thread e uma vaga")
+        
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.use_tpool = use_tpool
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+    
+    def _run(self, func, *args):
+        """
+        Executa uma função do bcrypt no pool e espera o resultado.
+        
+        Raises:
+            PasswordHasherBusy: Se já houver max_pending operações no pool
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy("Fila de hashing de senhas cheia")
+            self._pending += 1
+            if not self.use_tpool and self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="bcrypt")
+        
+        try:
+            if self.use_tpool:
+                # O greenlet cede o hub enquanto uma thread do sistema calcula
+                return tpool.execute(func, *args)
+            return self._executor.submit(func, *args).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+    
+    def hash(self, password: str) -> str:
+        """
+        Gera o hash bcrypt de uma senha.
+        
+        Args:
+            password: Senha em texto plano
+            
+        Returns:
+            Hash da senha
+        """
+        salt = bcrypt.gensalt(self.rounds)
+        return self._run(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+    
+    def verify(self, password: str, password_hash: str) -> bool:
+        """
+        Verifica se a senha corresponde ao hash.
+        
+        Args:
+            password: Senha em texto plano
+            password_hash: Hash armazenado
+            
+        Returns:
+            True se a senha estiver correta
+        """
+        return self._run(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna os contadores do pool.
+        
+        Returns:
+            Dicionário com operações pendentes, concluídas e recusadas
+        """
+        with self._lock:
+            return {
+                'pending': self._pending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'max_pending': self.max_pending,
+                'rounds': self.rounds
+            }
+    
+    def shutdown(self) -> None:
+        """
+        Encerra as threads do pool próprio.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+class ConnectionPool:
+    """
+    Pool de conexões SQLite reutilizadas entre operações.
+    
+    Cada operação pega uma conexão ociosa (ou abre uma nova) e a devolve ao
+    final, então threads ou greenlets simultâneos nunca compartilham uma
+    conexão, e cada worker acaba reutilizando sempre as mesmas. As conexões
+    são configuradas uma única vez, ao serem abertas.
+    """
+    
+    def __init__(self, db_path: str, max_idle: int = 16, cached_statements: int = 256):
+        """
+        Inicializa o pool.
+        
+        Args:
+            db_path: Caminho para o banco de dados SQLite
+            max_idle: Número máximo de conexões ociosas mantidas abertas
+            cached_statements: Tamanho do cache de comandos preparados por conexão
+        """
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self.cached_statements = cached_statements
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Abre e configura uma nova conexão.
+        
+        Returns:
+            Conexão em modo WAL com synchronous=NORMAL
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Empresta uma conexão do pool.
+        
+        Ao sair do bloco a transação é confirmada (ou desfeita em caso de
+        erro) e a conexão volta para o pool.
+        
+        Yields:
+            Conexão exclusiva durante o bloco
+        """
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+            with self._lock:
+                self.connections_opened += 1
+        
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+    
+    def close_all(self) -> None:
+        """
+        Fecha todas as conexões ociosas.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
 class AuthManager:
     """
     Gerenciador de autenticação responsável por todas as operações
     relacionadas a usuários e segurança.
     """
     
-    def __init__(self, db_path: str = "users.db"):
+    def __init__(self, db_path: str = "users.db", session_cache_ttl: float = 60.0,
+                 session_cache_size: int = 10000,
+                 password_hasher: Optional[PasswordHasher] = None,
+                 session_flush_interval: float = 0.0, session_flush_max_pending: int = 500):
         """
         Inicializa o gerenciador de autenticação.
         
         Args:
             db_path: Caminho para o banco de dados SQLite
+            session_cache_ttl: Segundos que uma sessão validada fica em memória
+                               antes de ser consultada de novo (0 desativa o cache)
+            session_cache_size: Número máximo de sessões em memória
+            password_hasher: Pool de hashing de senhas (padrão: PasswordHasher())
+            session_flush_interval: Segundos entre gravações em lote das sessões
+                                    criadas e do último login (0 grava a cada login).
+                                    É também o máximo de logins perdidos em uma queda
+            session_flush_max_pending: Logins pendentes que antecipam a gravação
         """
         self.db_path = db_path
         self.active_sessions = {}  # user_id -> session_token
+        self._pool = ConnectionPool(db_path)
+        self.password_hasher = password_hasher or PasswordHasher()
+        
+        # Cache de sessões validadas: token -> (usuário, expiração em time.monotonic())
+        # As menos usadas recentemente saem quando o limite é atingido
+        self.session_cache_ttl = session_cache_ttl
+        self.session_cache_size = session_cache_size
+        self._session_cache: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+        self._session_cache_lock = threading.Lock()
+        # Tokens de logout recente -> fim do bloqueio (time.monotonic()): uma
+        # validação que leu a sessão antes do logout não a coloca de volta no cache
+        self._revoked_sessions: "OrderedDict[str, float]" = OrderedDict()
+        self.session_cache_hits = 0
+        self.session_cache_misses = 0
+        self.session_cache_evictions = 0
+        
+        # Limpeza periódica de sessões expiradas (start_session_reaper)
+        self._reaper_stop = threading.Event()
+        self._reaper_thread: Optional[threading.Thread] = None
+        self.sessions_reaped = 0
+        
+        # Gravação adiada de logins: sessões novas (token -> (usuário, expiração))
+        # e último login por usuário, gravados em lote pela thread de gravação.
+        # Enquanto pendentes, as sessões são validadas a partir daqui
+        self.session_flush_interval = session_flush_interval
+        self.session_flush_max_pending = session_flush_max_pending
+        self._pending_sessions: Dict[str, Tuple[User, datetime]] = {}
+        self._pending_last_login: Dict[int, str] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher_stop = threading.Event()
+        self._flusher_wakeup = threading.Event()
+        self._flusher_thread: Optional[threading.Thread] = None
+        self.flushes = 0
+        self.sessions_flushed = 0
+        
         self._init_database()
+        
+        if session_flush_interval > 0:
+            self.start_write_behind()
     
     def _init_database(self) -> None:
         """
         Inicializa o banco de dados criando as tabelas necessárias.
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             
             # Tabela de usuários
@@ -101,6 +365,10 @@ class AuthManager:
                 )
             ''')
             
+            # Índices usados pela limpeza de sessões expiradas e por usuário
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions (user_id)')
+            
             conn.commit()
     
     def _hash_password(self, password: str) -> str:
@@ -113,9 +381,7 @@ class AuthManager:
         Returns:
             Hash da senha
         """
-        salt = bcrypt.gensalt()
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return password_hash.decode('utf-8')
+        return self.password_hasher.hash(password)
     
     def _verify_password(self, password: str, password_hash: str) -> bool:
         """
@@ -128,7 +394,7 @@ class AuthManager:
         Returns:
             True se a senha estiver correta
         """
-        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        return self.password_hasher.verify(password, password_hash)
     
     def _generate_session_token(self) -> str:
         """
@@ -162,7 +428,7 @@ class AuthManager:
             return {'success': False, 'message': 'Email inválido'}
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.cursor()
                 
                 # Verificar se usuário já existe
@@ -170,9 +436,12 @@ class AuthManager:
                              (username, email))
                 if cursor.fetchone():
                     return {'success': False, 'message': 'Usuário ou email já existe'}
-                
-                # Criar hash da senha
-                password_hash = self._hash_password(password)
+            
+            # Criar hash da senha fora da conexão: o bcrypt roda no pool de hashing
+            password_hash = self._hash_password(password)
+            
+            with self._pool.connection() as conn:
+                cursor = conn.cursor()
                 
                 # Inserir novo usuário
                 cursor.execute('''
@@ -189,6 +458,8 @@ class AuthManager:
                     'user_id': user_id
                 }
                 
+        except PasswordHasherBusy:
+            return {'success': False, 'message': 'Servidor ocupado, tente novamente em instantes'}
         except sqlite3.Error as e:
             return {'success': False, 'message': f'Erro no banco de dados: {str(e)}'}
     
@@ -204,7 +475,7 @@ class AuthManager:
             Dicionário com resultado da operação e token de sessão
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.cursor()
                 
                 # Buscar usuário por username ou email
@@ -217,62 +488,338 @@ class AuthManager:
                 user_data = cursor.fetchone()
                 if not user_data:
                     return {'success': False, 'message': 'Usuário não encontrado'}
+            
+            # Verificar senha fora da conexão: o bcrypt roda no pool de hashing
+            if not self._verify_password(password, user_data[3]):
+                return {'success': False, 'message': 'Senha incorreta'}
+            
+            # Criar usuário
+            user = User(*user_data)
+            
+            # Gerar token de sessão
+            session_token = self._generate_session_token()
+            expires_at = datetime.now() + timedelta(days=7)  # Sessão válida por 7 dias
+            
+            if self.session_flush_interval > 0:
+                # Gravação adiada: a sessão já vale pelo buffer em memória
+                self._buffer_login(user, session_token, expires_at)
+            else:
+                with self._pool.connection() as conn:
+                    cursor = conn.cursor()
+                    
+                    # Salvar sessão no banco
+                    cursor.execute('''
+                        INSERT INTO sessions (user_id, session_token, expires_at)
+                        VALUES (?, ?, ?)
+                    ''', (user.id, session_token, expires_at))
+                    
+                    # Atualizar último login
+                    cursor.execute('''
+                        UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?
+                    ''', (user.id,))
+                    
+                    conn.commit()
+            
+            # Armazenar sessão ativa
+            self.active_sessions[user.id] = session_token
+            
+            return {
+                'success': True,
+                'message': 'Login realizado com sucesso',
+                'user': user.to_dict(),
+                'session_token': session_token
+            }
                 
-                # Verificar senha
-                if not self._verify_password(password, user_data[3]):
-                    return {'success': False, 'message': 'Senha incorreta'}
-                
-                # Criar usuário
-                user = User(*user_data)
-                
-                # Gerar token de sessão
-                session_token = self._generate_session_token()
-                expires_at = datetime.now() + timedelta(days=7)  # Sessão válida por 7 dias
-                
-                # Salvar sessão no banco
-                cursor.execute('''
-                    INSERT INTO sessions (user_id, session_token, expires_at)
-                    VALUES (?, ?, ?)
-                ''', (user.id, session_token, expires_at))
-                
-                # Atualizar último login
-                cursor.execute('''
-                    UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?
-                ''', (user.id,))
-                
-                conn.commit()
-                
-                # Armazenar sessão ativa
-                self.active_sessions[user.id] = session_token
-                
-                return {
-                    'success': True,
-                    'message': 'Login realizado com sucesso',
-                    'user': user.to_dict(),
-                    'session_token': session_token
-                }
-                
+        except PasswordHasherBusy:
+            return {'success': False, 'message': 'Servidor ocupado, tente novamente em instantes'}
         except sqlite3.Error as e:
             return {'success': False, 'message': f'Erro no banco de dados: {str(e)}'}
     
+    def _buffer_login(self, user: User, session_token: str, expires_at: datetime) -> None:
+        """
+        Guarda uma sessão nova e o último login para a próxima gravação em lote.
+        
+        Args:
+            user: Usuário que fez login
+            session_token: Token da sessão criada
+            expires_at: Expiração da sessão
+        """
+        # Mesmo formato de CURRENT_TIMESTAMP (UTC)
+        last_login = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        with self._pending_lock:
+            self._pending_sessions[session_token] = (user, expires_at)
+            self._pending_last_login[user.id] = last_login
+            full = len(self._pending_sessions) >= self.session_flush_max_pending
+        if full:
+            self._flusher_wakeup.set()
+    
+    def _pending_session_get(self, session_token: str) -> Optional[User]:
+        """
+        Busca uma sessão ainda não gravada no banco.
+        
+        Args:
+            session_token: Token de sessão
+            
+        Returns:
+            Objeto User se a sessão estiver pendente e não tiver expirado
+        """
+        with self._pending_lock:
+            entry = self._pending_sessions.get(session_token)
+        if entry is None:
+            return None
+        
+        user, expires_at = entry
+        # Mesma comparação da consulta: expires_at contra CURRENT_TIMESTAMP (UTC)
+        if expires_at <= datetime.now(timezone.utc).replace(tzinfo=None):
+            return None
+        
+        self._session_cache_put(session_token, user, str(expires_at))
+        return user
+    
+    def _apply_pending_last_login(self, user: User) -> User:
+        """
+        Aplica a um usuário lido do banco o último login ainda não gravado.
+        
+        Args:
+            user: Usuário lido do banco
+            
+        Returns:
+            O mesmo usuário
+        """
+        with self._pending_lock:
+            last_login = self._pending_last_login.get(user.id)
+        if last_login is not None:
+            user.last_login = last_login
+        return user
+    
+    def flush_pending_writes(self) -> int:
+        """
+        Grava em uma única transação as sessões e últimos logins pendentes.
+        
+        As entradas só saem do buffer depois do commit, então continuam
+        validáveis durante a gravação e são tentadas de novo se ela falhar.
+        
+        Returns:
+            Número de sessões gravadas
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                sessions = dict(self._pending_sessions)
+                logins = dict(self._pending_last_login)
+            if not sessions and not logins:
+                return 0
+            
+            try:
+                with self._pool.connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.executemany('''
+                        INSERT INTO sessions (user_id, session_token, expires_at)
+                        VALUES (?, ?, ?)
+                    ''', [(user.id, token, expires_at) for token, (user, expires_at) in sessions.items()])
+                    cursor.executemany('''
+                        UPDATE users SET last_login = ? WHERE id = ?
+                    ''', [(last_login, user_id) for user_id, last_login in logins.items()])
+            except sqlite3.Error as e:
+                print(f"Erro ao gravar sessões pendentes: {e}")
+                return 0
+            
+            with self._pending_lock:
+                for token in sessions:
+                    self._pending_sessions.pop(token, None)
+                for user_id, last_login in logins.items():
+                    # Um login mais novo do mesmo usuário continua pendente
+                    if self._pending_last_login.get(user_id) == last_login:
+                        del self._pending_last_login[user_id]
+            
+            self.flushes += 1
+            self.sessions_flushed += len(sessions)
+            return len(sessions)
+    
+    def start_write_behind(self) -> None:
+        """
+        Inicia a thread que grava os logins pendentes a cada session_flush_interval
+        segundos (ou antes, quando session_flush_max_pending é atingido).
+        """
+        if self._flusher_thread is not None and self._flusher_thread.is_alive():
+            return
+        
+        def run() -> None:
+            while not self._flusher_stop.is_set():
+                self._flusher_wakeup.wait(self.session_flush_interval)
+                self._flusher_wakeup.clear()
+                try:
+                    self.flush_pending_writes()
+                except Exception as e:
+                    print(f"Erro na gravação de sessões: {e}")
+        
+        self._flusher_stop.clear()
+        self._flusher_thread = threading.Thread(target=run, name="session-writer", daemon=True)
+        self._flusher_thread.start()
+    
+    def stop_write_behind(self) -> None:
+        """
+        Interrompe a thread de gravação e grava o que estiver pendente.
+        """
+        self._flusher_stop.set()
+        self._flusher_wakeup.set()
+        if self._flusher_thread is not None:
+            self._flusher_thread.join()
+            self._flusher_thread = None
+        self.flush_pending_writes()
+    
+    def _session_cache_get(self, session_token: str) -> Optional[User]:
+        """
+        Busca uma sessão no cache, contando acertos e falhas.
+        
+        Args:
+            session_token: Token de sessão
+            
+        Returns:
+            Objeto User se a sessão estiver em cache e não tiver expirado
+        """
+        with self._session_cache_lock:
+            entry = self._session_cache.get(session_token)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._session_cache[session_token]
+                entry = None
+            if entry is None:
+                self.session_cache_misses += 1
+                return None
+            self._session_cache.move_to_end(session_token)
+            self.session_cache_hits += 1
+            return entry[0]
+    
+    def _session_cache_put(self, session_token: str, user: User, expires_at: str) -> None:
+        """
+        Guarda uma sessão validada no cache.
+        
+        A entrada vale por session_cache_ttl segundos, mas nunca além da
+        expiração da própria sessão.
+        
+        Args:
+            session_token: Token de sessão
+            user: Usuário da sessão
+            expires_at: Expiração da sessão como gravada no banco
+        """
+        if self.session_cache_ttl <= 0 or self.session_cache_size <= 0:
+            return
+        
+        # Mesma comparação da consulta: expires_at contra CURRENT_TIMESTAMP (UTC)
+        try:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            remaining = (datetime.fromisoformat(str(expires_at)) - now).total_seconds()
+        except ValueError:
+            return
+        
+        ttl = min(self.session_cache_ttl, remaining)
+        if ttl <= 0:
+            return
+        
+        with self._session_cache_lock:
+            if self._is_revoked(session_token):
+                return
+            self._session_cache[session_token] = (user, time.monotonic() + ttl)
+            self._session_cache.move_to_end(session_token)
+            while len(self._session_cache) > self.session_cache_size:
+                self._session_cache.popitem(last=False)
+                self.session_cache_evictions += 1
+    
+    def _session_cache_invalidate(self, session_token: str) -> None:
+        """
+        Remove uma sessão do cache.
+        
+        Args:
+            session_token: Token de sessão
+        """
+        with self._session_cache_lock:
+            self._session_cache.pop(session_token, None)
+    
+    def _session_cache_revoke(self, session_token: str) -> None:
+        """
+        Remove uma sessão do cache e impede que ela volte por session_cache_ttl segundos.
+        
+        Args:
+            session_token: Token de sessão
+        """
+        if self.session_cache_ttl <= 0:
+            self._session_cache_invalidate(session_token)
+            return
+        
+        with self._session_cache_lock:
+            self._session_cache.pop(session_token, None)
+            self._revoked_sessions[session_token] = time.monotonic() + self.session_cache_ttl
+            self._revoked_sessions.move_to_end(session_token)
+    
+    def _is_revoked(self, session_token: str) -> bool:
+        """
+        Verifica se um token teve logout recente (chamador segura _session_cache_lock).
+        
+        Args:
+            session_token: Token de sessão
+            
+        Returns:
+            True se o token ainda estiver bloqueado para o cache
+        """
+        # Todos os bloqueios duram o mesmo tempo, então os vencidos estão no início
+        now = time.monotonic()
+        while self._revoked_sessions:
+            token, until = next(iter(self._revoked_sessions.items()))
+            if until > now:
+                break
+            del self._revoked_sessions[token]
+        return session_token in self._revoked_sessions
+    
+    def session_cache_stats(self) -> Dict[str, Any]:
+        """
+        Retorna os contadores do cache de sessões.
+        
+        Returns:
+            Dicionário com acertos, falhas, remoções, tamanho e taxa de acerto
+        """
+        with self._session_cache_lock:
+            lookups = self.session_cache_hits + self.session_cache_misses
+            return {
+                'hits': self.session_cache_hits,
+                'misses': self.session_cache_misses,
+                'evictions': self.session_cache_evictions,
+                'size': len(self._session_cache),
+                'capacity': self.session_cache_size,
+                'ttl': self.session_cache_ttl,
+                'hit_rate': self.session_cache_hits / lookups if lookups else 0.0
+            }
+    
     def validate_session(self, session_token: str) -> Optional[User]:
         """
         Valida um token de sessão e retorna o usuário correspondente.
         
+        Sessões validadas ficam em cache por até session_cache_ttl segundos,
+        então validações repetidas do mesmo token não consultam o banco.
+        
         Args:
             session_token: Token de sessão
             
         Returns:
             Objeto User se a sessão for válida, None caso contrário
         """
+        if not session_token:
+            return None
+        
+        user = self._session_cache_get(session_token)
+        if user is not None:
+            return user
+        
+        user = self._pending_session_get(session_token)
+        if user is not None:
+            return user
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.cursor()
                 
                 # Buscar sessão válida
                 cursor.execute('''
                     SELECT s.user_id, u.username, u.email, u.password_hash, 
-                           u.created_at, u.last_login
+                           u.created_at, u.last_login, s.expires_at
                     FROM sessions s
                     JOIN users u ON s.user_id = u.id
                     WHERE s.session_token = ? AND s.expires_at > CURRENT_TIMESTAMP
@@ -282,7 +829,9 @@ class AuthManager:
                 if not session_data:
                     return None
                 
-                return User(*session_data)
+                user = self._apply_pending_last_login(User(*session_data[:6]))
+                self._session_cache_put(session_token, user, session_data[6])
+                return user
                 
         except sqlite3.Error:
             return None
@@ -297,8 +846,18 @@ class AuthManager:
         Returns:
             True se o logout foi bem-sucedido
         """
+        # A sessão deixa de valer imediatamente, mesmo se o banco falhar. O
+        # bloqueio impede que uma validação em andamento, que leu a sessão
+        # antes do DELETE, a devolva ao cache depois do logout
+        self._session_cache_revoke(session_token)
+        
+        # Uma sessão ainda não gravada sai do buffer; se a gravação já estiver
+        # em andamento, espera o commit para que o DELETE abaixo a alcance
+        with self._flush_lock, self._pending_lock:
+            self._pending_sessions.pop(session_token, None)
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.cursor()
                 
                 # Remover sessão do banco
@@ -317,17 +876,111 @@ class AuthManager:
         except sqlite3.Error:
             return False
     
-    def cleanup_expired_sessions(self) -> None:
+    def cleanup_expired_sessions(self, batch_size: int = 500) -> int:
         """
-        Remove sessões expiradas do banco de dados.
+        Remove sessões expiradas do banco de dados, do cache e de active_sessions.
+        
+        As linhas são apagadas em lotes, cada um na sua própria transação,
+        para não bloquear logins e validações por muito tempo.
+        
+        Args:
+            batch_size: Número máximo de sessões apagadas por transação
+            
+        Returns:
+            Número de sessões removidas do banco
         """
+        with self._session_cache_lock:
+            now = time.monotonic()
+            for token, (_, expires) in list(self._session_cache.items()):
+                if expires <= now:
+                    del self._session_cache[token]
+        
+        removed = 0
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM sessions WHERE expires_at < CURRENT_TIMESTAMP')
-                conn.commit()
+            while True:
+                with self._pool.connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute('''
+                        DELETE FROM sessions WHERE id IN (
+                            SELECT id FROM sessions
+                            WHERE expires_at < CURRENT_TIMESTAMP
+                            LIMIT ?
+                        )
+                    ''', (batch_size,))
+                    deleted = cursor.rowcount
+                removed += deleted
+                if deleted < batch_size:
+                    break
+            
+            self._prune_active_sessions(batch_size)
         except sqlite3.Error:
             pass
+        
+        self.sessions_reaped += removed
+        return removed
+    
+    def _prune_active_sessions(self, batch_size: int) -> None:
+        """
+        Remove de active_sessions os tokens que não existem mais no banco.
+        
+        Args:
+            batch_size: Número máximo de tokens consultados por vez
+        """
+        with self._pending_lock:
+            pending = set(self._pending_sessions)
+        tokens = [token for token in self.active_sessions.values() if token not in pending]
+        stale = set()
+        
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(tokens), batch_size):
+                chunk = tokens[start:start + batch_size]
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(f'''
+                    SELECT session_token FROM sessions
+                    WHERE session_token IN ({placeholders}) AND expires_at > CURRENT_TIMESTAMP
+                ''', chunk)
+                valid = {row[0] for row in cursor.fetchall()}
+                stale.update(token for token in chunk if token not in valid)
+        
+        for user_id, token in list(self.active_sessions.items()):
+            if token in stale:
+                self.active_sessions.pop(user_id, None)
+    
+    def start_session_reaper(self, interval: float = 600.0, batch_size: int = 500) -> None:
+        """
+        Inicia a limpeza periódica de sessões expiradas em segundo plano.
+        
+        A primeira limpeza acontece imediatamente; as seguintes a cada
+        interval segundos.
+        
+        Args:
+            interval: Segundos entre limpezas
+            batch_size: Número máximo de sessões apagadas por transação
+        """
+        if self._reaper_thread is not None and self._reaper_thread.is_alive():
+            return
+        
+        def run() -> None:
+            while not self._reaper_stop.is_set():
+                try:
+                    self.cleanup_expired_sessions(batch_size)
+                except Exception as e:
+                    print(f"Erro na limpeza de sessões: {e}")
+                self._reaper_stop.wait(interval)
+        
+        self._reaper_stop.clear()
+        self._reaper_thread = threading.Thread(target=run, name="session-reaper", daemon=True)
+        self._reaper_thread.start()
+    
+    def stop_session_reaper(self) -> None:
+        """
+        Interrompe a limpeza periódica de sessões.
+        """
+        self._reaper_stop.set()
+        if self._reaper_thread is not None:
+            self._reaper_thread.join()
+            self._reaper_thread = None
     
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """
@@ -340,7 +993,7 @@ class AuthManager:
             Objeto User se encontrado, None caso contrário
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT id, username, email, password_hash, created_at, last_login
@@ -349,7 +1002,7 @@ class AuthManager:
                 
                 user_data = cursor.fetchone()
                 if user_data:
-                    return User(*user_data)
+                    return self._apply_pending_last_login(User(*user_data))
                 return None
                 
         except sqlite3.Error:
@@ -357,4 +1010,15 @@ class AuthManager:
 
 
 # Instância global do gerenciador de autenticação
-auth_manager = AuthManager()
\ No newline at end of file
+auth_manager = AuthManager(
+    session_cache_ttl=float(os.environ.get('SESSION_CACHE_TTL', '60')),
+    password_hasher=PasswordHasher(
+        rounds=int(os.environ.get('BCRYPT_LOG_ROUNDS', '12')),
+        max_workers=int(os.environ.get('BCRYPT_WORKERS', '4')),
+        max_pending=int(os.environ.get('BCRYPT_MAX_PENDING', '32'))
+    ),
+    session_flush_interval=float(os.environ.get('SESSION_FLUSH_INTERVAL', '1'))
+)
+
+# Grava os logins pendentes ao encerrar o processo
+atexit.register(auth_manager.stop_write_behind)
\ No newline at end of file
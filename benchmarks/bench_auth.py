@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark of AuthManager database operations.
+
+Compares one new SQLite connection per operation (as before pooling)
+with the connection pool, for session validation (with the session cache
+disabled so every call reaches the database), user lookup by ID and the
+login/logout round trip, then login throughput with sessions written on
+every login against the write-behind buffer. Passwords are hashed with the minimum bcrypt
+cost so the database work is not hidden behind hashing.
+
+Usage:
+    python benchmarks/bench_auth.py [quantidade]
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import AuthManager, ConnectionPool, PasswordHasher
+
+
+class ConexaoPorOperacao(ConnectionPool):
+    """Pool that opens a plain connection for every operation, as before pooling"""
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, check_same_thread=False)
+
+
+def preparar(caminho: str, session_flush_interval: float = 0.0) -> AuthManager:
+    """Create a database with one user and return a manager without session cache"""
+    # Minimum cost: this benchmark measures the database, not bcrypt
+    manager = AuthManager(caminho, session_cache_ttl=0, password_hasher=PasswordHasher(rounds=4),
+                          session_flush_interval=session_flush_interval)
+    manager.register_user("bench", "bench@exemplo.com", "senha123")
+    return manager
+
+
+def medir(funcao, quantidade: int) -> float:
+    """Return operations per second"""
+    inicio = time.perf_counter()
+    for _ in range(quantidade):
+        funcao()
+    return quantidade / (time.perf_counter() - inicio)
+
+
+def rodar(manager: AuthManager, quantidade: int):
+    """Run every operation and return their rates"""
+    token = manager.login_user("bench", "senha123")['session_token']
+    user_id = manager.validate_session(token).id
+
+    def login_logout():
+        manager.logout_user(manager.login_user("bench", "senha123")['session_token'])
+
+    return [
+        ("validate_session", medir(lambda: manager.validate_session(token), quantidade)),
+        ("get_user_by_id", medir(lambda: manager.get_user_by_id(user_id), quantidade)),
+        ("login + logout", medir(login_logout, quantidade // 10)),
+    ]
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        manager = preparar(os.path.join(diretorio, "users.db"))
+
+        manager._pool = ConexaoPorOperacao(manager.db_path, max_idle=0)
+        antes = rodar(manager, quantidade)
+        manager._pool = ConnectionPool(manager.db_path)
+        depois = rodar(manager, quantidade)
+        manager._pool.close_all()
+
+    print(f"  {'operação':<18} | {'por operação':>12} | {'pool':>10} | {'ganho':>6}")
+    for (nome, antigo), (_, novo) in zip(antes, depois):
+        print(f"  {nome:<18} | {antigo:>10,.0f}/s | {novo:>8,.0f}/s | {novo / antigo:>5.1f}x")
+
+    print("\nLogins (sessão e último login)")
+    for nome, intervalo in (("a cada login", 0.0), ("em lote", 0.05)):
+        with tempfile.TemporaryDirectory() as diretorio:
+            manager = preparar(os.path.join(diretorio, "users.db"), intervalo)
+            taxa = medir(lambda: manager.login_user("bench", "senha123"), quantidade)
+            manager.stop_write_behind()
+            manager._pool.close_all()
+        print(f"  {nome:<18} | {taxa:>10,.0f}/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark of character deserialization.
+
+Compares from_dict through __init__ (new UUID and default abilities built
+and then overwritten) with the registry fast path that restores complete
+stored dictionaries without running __init__. Measures both the bare
+from_dict call and a bulk load of a roster of JSON files, the way
+BancoDados.carregar_todos_personagens reads them.
+
+Usage:
+    python benchmarks/bench_carregamento.py [quantidade]
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.personagens.base import Personagem
+from package.personagens.guerreiro import Guerreiro
+from package.personagens.mago import Mago
+from package.personagens.arqueiro import Arqueiro
+
+CLASSES = (Guerreiro, Mago, Arqueiro)
+
+
+@contextmanager
+def caminho_init():
+    """Force every class through the __init__ path of from_dict"""
+    originais = {classe: classe._CAMPOS_COMPLETOS for classe in CLASSES}
+    try:
+        for classe in CLASSES:
+            # No stored dictionary has this key, so the fast path never applies
+            classe._CAMPOS_COMPLETOS = originais[classe] | {"<caminho_init>"}
+        yield
+    finally:
+        for classe, campos in originais.items():
+            classe._CAMPOS_COMPLETOS = campos
+
+
+def gerar_roster(quantidade: int):
+    """Build stored dictionaries for a mixed roster"""
+    return [CLASSES[i % len(CLASSES)](f"Herói {i}").to_dict() for i in range(quantidade)]
+
+
+def medir_from_dict(dados) -> float:
+    """Return characters per second for Personagem.from_dict"""
+    inicio = time.perf_counter()
+    for data in dados:
+        Personagem.from_dict(data)
+    return len(dados) / (time.perf_counter() - inicio)
+
+
+def medir_carga(diretorio: str) -> float:
+    """Return characters per second for reading every JSON file of a roster"""
+    arquivos = [os.path.join(diretorio, nome) for nome in os.listdir(diretorio)]
+    inicio = time.perf_counter()
+    for caminho in arquivos:
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            Personagem.from_dict(json.load(arquivo))
+    return len(arquivos) / (time.perf_counter() - inicio)
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    dados = gerar_roster(quantidade)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for data in dados:
+            with open(os.path.join(diretorio, f"{data['id']}.json"), 'w', encoding='utf-8') as arquivo:
+                json.dump(data, arquivo, ensure_ascii=False, indent=2)
+
+        print(f"{quantidade} personagens")
+        print(f"  {'caminho':<12} | {'from_dict/s':>12} | {'carga JSON/s':>12}")
+        with caminho_init():
+            antigo = (medir_from_dict(dados), medir_carga(diretorio))
+        novo = (medir_from_dict(dados), medir_carga(diretorio))
+        print(f"  {'__init__':<12} | {antigo[0]:>12,.0f} | {antigo[1]:>12,.0f}")
+        print(f"  {'registro':<12} | {novo[0]:>12,.0f} | {novo[1]:>12,.0f}")
+        print(f"  {'ganho':<12} | {novo[0] / antigo[0]:>11.2f}x | {novo[1] / antigo[1]:>11.2f}x")
+
+
+if __name__ == '__main__':
+    main()
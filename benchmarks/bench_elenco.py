@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark of bulk stat queries over the whole roster.
+
+Compares filters, top-K rankings and histograms done by walking a list of
+Personagem objects with the same queries on package.elenco.ElencoColunar,
+for a synthetic population with random stats and fight records.
+
+Usage:
+    python benchmarks/bench_elenco.py [quantidade]
+"""
+
+import os
+import sys
+import time
+import random
+import heapq
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.personagens.guerreiro import Guerreiro
+from package.personagens.mago import Mago
+from package.personagens.arqueiro import Arqueiro
+from package.elenco import ElencoColunar
+
+CLASSES = (Guerreiro, Mago, Arqueiro)
+
+
+def gerar_roster(quantidade: int, rng: random.Random):
+    """Build characters with random stats and random fight records"""
+    personagens = []
+    resultados = {}
+    for i in range(quantidade):
+        personagem = CLASSES[i % len(CLASSES)](f"Herói {i}")
+        personagem.nivel = rng.randint(1, 50)
+        personagem.experiencia = rng.randint(0, 100_000)
+        personagem.forca += rng.randint(0, 40)
+        personagem.destreza += rng.randint(0, 40)
+        personagem.inteligencia += rng.randint(0, 40)
+        combates = rng.randint(0, 200)
+        resultados[personagem.id] = (rng.randint(0, combates), combates)
+        personagens.append(personagem)
+    return personagens, resultados
+
+
+def medir(funcao, repeticoes: int = 5) -> float:
+    """Return the best time of several runs, in milliseconds"""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(42)
+    personagens, resultados = gerar_roster(quantidade, rng)
+
+    elenco = ElencoColunar()
+    inicio = time.perf_counter()
+    elenco.atualizar_varios(personagens)
+    carga = (time.perf_counter() - inicio) * 1000
+    contadores = elenco._colunas
+    for personagem_id, (vitorias, combates) in resultados.items():
+        # Seed the counters directly instead of replaying every fight
+        linha = elenco._linha_por_id[personagem_id]
+        contadores["vitorias"][linha] = vitorias
+        contadores["derrotas"][linha] = combates - vitorias
+        contadores["combates"][linha] = combates
+
+    def taxa(personagem) -> float:
+        vitorias, combates = resultados[personagem.id]
+        return vitorias / combates if combates else 0.0
+
+    consultas = [
+        ("filtro Mago nível ≥ 40",
+         lambda: [p.id for p in personagens if p.classe == "Mago" and p.nivel >= 40],
+         lambda: elenco.filtrar("Mago", nivel=(40, None))),
+        ("top 100 força",
+         lambda: heapq.nlargest(100, personagens, key=lambda p: p.forca),
+         lambda: elenco.top_k("forca", 100)),
+        ("top 100 vitória",
+         lambda: sorted(personagens, key=taxa, reverse=True)[:100],
+         lambda: elenco.top_k("taxa_vitoria", 100)),
+        ("histograma nível",
+         lambda: Counter(p.nivel for p in personagens),
+         lambda: elenco.histograma("nivel", range(1, 52))),
+    ]
+
+    print(f"{quantidade} personagens (carga do elenco: {carga:.0f} ms)")
+    print(f"  {'consulta':<24} | {'objetos':>10} | {'colunar':>10} | {'ganho':>7}")
+    for nome, objetos, colunar in consultas:
+        antigo = medir(objetos)
+        novo = medir(colunar)
+        print(f"  {nome:<24} | {antigo:>7.1f} ms | {novo:>7.2f} ms | {antigo / novo:>6.0f}x")
+
+
+if __name__ == '__main__':
+    main()
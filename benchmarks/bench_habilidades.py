@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark of ability use.
+
+Measures the cost of one usar_habilidade call for every stock ability,
+and the throughput of headless fights where both sides only use
+abilities, so ability lookup and dispatch dominate the simulation loop.
+
+Usage:
+    python benchmarks/bench_habilidades.py [quantidade]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.personagens.guerreiro import Guerreiro
+from package.personagens.mago import Mago
+from package.personagens.arqueiro import Arqueiro
+from package.combate import simular_combates
+
+
+def politica_habilidades(combate, personagem) -> str:
+    """Policy that picks uniformly among the character's abilities"""
+    return combate.rng.choice(personagem.ids_habilidades)
+
+
+def medir_uso(classe, habilidade_id: str, quantidade: int, repeticoes: int = 5) -> float:
+    """Return microseconds per usar_habilidade call for one ability"""
+    usuario = classe("A")
+    alvo = Guerreiro("B")
+    usuario.vida_maxima = alvo.vida_maxima = 10 ** 9
+    # Enough fury, mana, stamina and arrows for every call to succeed
+    for recurso in ("furia", "mana", "stamina", "municao"):
+        if hasattr(usuario, recurso):
+            setattr(usuario, recurso, 10 ** 9)
+    estado_usuario = usuario.capturar_estado()
+    estado_alvo = alvo.capturar_estado()
+
+    def rodada(usar: bool) -> float:
+        inicio = time.perf_counter()
+        for _ in range(quantidade):
+            # Reset resources so every call goes through the full ability path
+            usuario.restaurar_estado(estado_usuario)
+            alvo.restaurar_estado(estado_alvo)
+            if usar:
+                usuario.usar_habilidade(habilidade_id, alvo)
+        return time.perf_counter() - inicio
+
+    # Best of several rounds, minus the cost of the resets alone
+    decorrido = min(rodada(True) for _ in range(repeticoes)) - min(rodada(False) for _ in range(repeticoes))
+    return decorrido / quantidade * 1e6
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    classes = [Guerreiro, Mago, Arqueiro]
+
+    print("Custo por uso de habilidade")
+    for classe in classes:
+        for habilidade_id in classe("A").ids_habilidades:
+            print(f"  {classe.__name__:>9} {habilidade_id:<18} {medir_uso(classe, habilidade_id, quantidade):>7.2f} µs")
+
+    print("\nCombates só com habilidades")
+    for classe1 in classes:
+        for classe2 in classes:
+            inicio = time.perf_counter()
+            simular_combates(classe1("A"), classe2("B"), quantidade // 4, politica_habilidades, semente=1)
+            taxa = (quantidade // 4) / (time.perf_counter() - inicio)
+            print(f"  {classe1.__name__:>9} x {classe2.__name__:<10} {taxa:>10,.0f} combates/s")
+
+
+if __name__ == '__main__':
+    main()
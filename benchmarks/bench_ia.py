@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the MCTS bot player.
+
+Reports playouts per second within the per-move budget and the bot's
+win rate against the random policy for every class matchup.
+
+Usage:
+    python benchmarks/bench_ia.py [partidas] [orcamento_ms]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.personagens.guerreiro import Guerreiro
+from package.personagens.mago import Mago
+from package.personagens.arqueiro import Arqueiro
+from package.combate import Combate, politica_aleatoria
+from package.ia import JogadorMCTS
+
+
+def main() -> None:
+    partidas = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    orcamento_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    classes = [Guerreiro, Mago, Arqueiro]
+
+    print(f"{'bot x aleatório':>21} | {'vitórias bot':>12} {'base aleatória':>14} | {'playouts/s':>10}")
+    for classe_bot in classes:
+        for classe_oponente in classes:
+            bot = JogadorMCTS(orcamento_ms=orcamento_ms, semente=1)
+            vitorias_bot = vitorias_base = 0
+            simulacoes = 0
+            tempo_ms = 0.0
+
+            for partida in range(partidas):
+                # Bot plays side 1 against the random policy
+                combate = Combate(classe_bot("Bot"), classe_oponente("Oponente"), semente=partida)
+                estado = combate.capturar_estado()
+                jogadas = 0
+                while not combate.finalizado and combate.turno_atual <= 100:
+                    if combate.personagem_ativo is combate.personagem1:
+                        acao = bot.escolher_acao(combate)
+                        simulacoes += bot.ultimas_simulacoes
+                        tempo_ms += bot.ultima_duracao_ms
+                        jogadas += 1
+                    else:
+                        acao = politica_aleatoria(combate, combate.personagem_ativo)
+                    combate._executar_acao_rapida(acao)
+                vitorias_bot += combate.vencedor is combate.personagem1
+
+                # Baseline: the same fight with random play on both sides
+                combate.restaurar_estado(estado)
+                resultado = combate.simular(politica_aleatoria)
+                vitorias_base += resultado.vencedor == 1
+
+            taxa = simulacoes / (tempo_ms / 1000) if tempo_ms else 0.0
+            print(f"{classe_bot.__name__:>9} x {classe_oponente.__name__:<9} | "
+                  f"{vitorias_bot / partidas:>12.0%} {vitorias_base / partidas:>14.0%} | {taxa:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main()
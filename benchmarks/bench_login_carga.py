@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Load test of logins under eventlet.
+
+Runs a burst of concurrent logins in green threads while a heartbeat
+green thread wakes up every few milliseconds, standing in for the
+battle_action deliveries of live battles. The heartbeat's lateness shows
+how long the eventlet hub was blocked: with bcrypt called inline it
+stalls for the whole burst, with PasswordHasher(use_tpool=True) it
+keeps ticking while the hashes run in OS threads.
+
+Usage:
+    python benchmarks/bench_login_carga.py [logins] [custo_bcrypt]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eventlet
+from auth import AuthManager, PasswordHasher
+
+INTERVALO_BATIDA = 0.005
+
+
+class HashingInline(PasswordHasher):
+    """Hasher that runs bcrypt on the calling green thread, as before the worker pool"""
+
+    def _run(self, func, *args):
+        return func(*args)
+
+
+def rodar(manager: AuthManager, logins: int):
+    """Run a login burst and return (duration, worst and p99 heartbeat delay, accepted logins)"""
+    atrasos = []
+    ativo = [True]
+
+    def batida():
+        while ativo[0]:
+            inicio = time.perf_counter()
+            eventlet.sleep(INTERVALO_BATIDA)
+            atrasos.append(time.perf_counter() - inicio - INTERVALO_BATIDA)
+
+    batedor = eventlet.spawn(batida)
+    eventlet.sleep(INTERVALO_BATIDA * 4)
+
+    pool = eventlet.GreenPool(logins)
+    inicio = time.perf_counter()
+    aceitos = sum(pool.imap(lambda _: manager.login_user("carga", "senha123")['success'], range(logins)))
+    duracao = time.perf_counter() - inicio
+
+    ativo[0] = False
+    batedor.wait()
+    atrasos.sort()
+    return duracao, atrasos[-1], atrasos[int(len(atrasos) * 0.99)], aceitos
+
+
+def main() -> None:
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    custo = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        manager = AuthManager(os.path.join(diretorio, "users.db"))
+        hashers = (
+            ("bloqueante", HashingInline(rounds=custo)),
+            ("tpool", PasswordHasher(rounds=custo, max_pending=logins, use_tpool=True)),
+        )
+        manager.password_hasher = hashers[0][1]
+        manager.register_user("carga", "carga@exemplo.com", "senha123")
+
+        print(f"{logins} logins simultâneos, custo bcrypt {custo}")
+        print(f"  {'modo':<10} | {'duração':>9} | {'pior atraso':>11} | {'p99':>9} | {'aceitos':>7}")
+        for nome, hasher in hashers:
+            manager.password_hasher = hasher
+            duracao, pior, p99, aceitos = rodar(manager, logins)
+            print(f"  {nome:<10} | {duracao * 1000:>6.0f} ms | {pior * 1000:>8.1f} ms | "
+                  f"{p99 * 1000:>6.1f} ms | {aceitos:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the memory held by resident characters.
+
+Uses tracemalloc to measure the bytes allocated per character for a
+roster of each class, both for fresh characters and for characters
+loaded with from_dict (as BancoDados builds them on a cache miss).
+
+Usage:
+    python benchmarks/bench_memoria.py [quantidade]
+"""
+
+import os
+import sys
+import gc
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.personagens.base import Personagem
+from package.personagens.guerreiro import Guerreiro
+from package.personagens.mago import Mago
+from package.personagens.arqueiro import Arqueiro
+
+
+def medir(criar, quantidade: int) -> float:
+    """Return the bytes allocated per character kept alive by criar"""
+    gc.collect()
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    roster = [criar(i) for i in range(quantidade)]
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del roster
+    return total / quantidade
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    print(f"{quantidade} personagens por classe")
+    print(f"  {'classe':<10} | {'novo':>10} | {'from_dict':>10}")
+    for classe in (Guerreiro, Mago, Arqueiro):
+        # Stored dictionaries are built outside the measurement, as if read from disk
+        dados = [classe(f"Herói {i}").to_dict() for i in range(quantidade)]
+        novo = medir(lambda i: classe(f"Herói {i}"), quantidade)
+        carregado = medir(lambda i: Personagem.from_dict(dados[i]), quantidade)
+        print(f"  {classe.__name__:<10} | {novo:>8.0f} B | {carregado:>8.0f} B")
+
+
+if __name__ == '__main__':
+    main()
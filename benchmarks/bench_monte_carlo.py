@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the vectorized Monte Carlo estimator.
+
+Compares win probabilities and speed of package.monte_carlo against the
+object-based headless simulation for every class matchup.
+
+Usage:
+    python benchmarks/bench_monte_carlo.py [combates_vetorizados] [combates_objetos]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.personagens.guerreiro import Guerreiro
+from package.personagens.mago import Mago
+from package.personagens.arqueiro import Arqueiro
+from package.combate import simular_combates
+from package.monte_carlo import estimar_confronto
+
+
+def main() -> None:
+    combates_vetorizados = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    combates_objetos = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    classes = [Guerreiro, Mago, Arqueiro]
+
+    print(f"{'confronto':>21} | {'P1 vetorizado':>13} {'P1 objetos':>10} | {'turnos':>6} {'turnos':>6} | {'tempo':>7}")
+    for classe1 in classes:
+        for classe2 in classes:
+            personagem1 = classe1("A")
+            personagem2 = classe2("B")
+
+            inicio = time.perf_counter()
+            estimativa = estimar_confronto(personagem1, personagem2, combates_vetorizados, semente=42)
+            duracao = time.perf_counter() - inicio
+
+            resultados = simular_combates(personagem1, personagem2, combates_objetos, semente=42)
+            vitorias1 = sum(1 for r in resultados if r.vencedor == 1) / combates_objetos
+            turnos = sum(r.turnos for r in resultados) / combates_objetos
+
+            print(f"{classe1.__name__:>9} x {classe2.__name__:<9} | "
+                  f"{estimativa.probabilidade_vitoria1:>13.4f} {vitorias1:>10.4f} | "
+                  f"{estimativa.turnos_medios:>6.2f} {turnos:>6.2f} | {duracao:>6.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the serialization formats.
+
+Compares payload size, encode time and decode time of the binary codec
+(package.binario) against the JSON (indent=2, as BancoDados writes it),
+compact JSON and pickle paths, for one character of each class and for
+a finished combat.
+
+Usage:
+    python benchmarks/bench_serializacao.py [repeticoes]
+"""
+
+import os
+import sys
+import json
+import pickle
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.personagens.guerreiro import Guerreiro
+from package.personagens.mago import Mago
+from package.personagens.arqueiro import Arqueiro
+from package.combate import Combate, politica_aleatoria
+from package.binario import codificar_personagem, codificar_combate, decodificar
+
+
+def medir(nome: str, codificar, decodificar_payload, repeticoes: int) -> None:
+    """Print size and per-call encode/decode time of one format"""
+    payload = codificar()
+    tempo_codificar = timeit.timeit(codificar, number=repeticoes) / repeticoes
+    tempo_decodificar = timeit.timeit(lambda: decodificar_payload(payload), number=repeticoes) / repeticoes
+    print(f"  {nome:<13} | {len(payload):>7} B | {tempo_codificar * 1e6:>9.1f} µs | {tempo_decodificar * 1e6:>9.1f} µs")
+
+
+def comparar(titulo: str, objeto, codificar_binario, repeticoes: int) -> None:
+    """Compare every format for one character or combat"""
+    print(f"\n{titulo}")
+    print(f"  {'formato':<13} | {'tamanho':>9} | {'codificar':>12} | {'decodificar':>12}")
+
+    # Dictionary formats start from to_dict, as BancoDados does
+    medir("json indent", lambda: json.dumps(objeto.to_dict(), ensure_ascii=False, indent=2).encode("utf-8"),
+          json.loads, repeticoes)
+    medir("json compacto", lambda: json.dumps(objeto.to_dict(), ensure_ascii=False,
+                                              separators=(',', ':')).encode("utf-8"),
+          json.loads, repeticoes)
+    medir("binário", lambda: codificar_binario(objeto.to_dict()), decodificar, repeticoes)
+    # Pickle stores the whole object graph
+    medir("pickle", lambda: pickle.dumps(objeto), pickle.loads, repeticoes)
+
+
+def main() -> None:
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    for classe in (Guerreiro, Mago, Arqueiro):
+        comparar(f"Personagem ({classe.__name__})", classe("Herói"), codificar_personagem, repeticoes)
+
+    # Play with the logging actions so the combat carries a real log
+    combate = Combate(Guerreiro("Herói"), Guerreiro("Rival"), semente=7)
+    while not combate.finalizado and combate.turno_atual <= 100:
+        acao = politica_aleatoria(combate, combate.personagem_ativo)
+        if acao == "atacar":
+            combate.executar_ataque()
+        elif acao == "defender":
+            combate.executar_defesa()
+        else:
+            combate.usar_habilidade(acao)
+    comparar(f"Combate ({len(combate.log_combate)} entradas de log)", combate,
+             codificar_combate, max(1, repeticoes // 10))
+
+
+if __name__ == '__main__':
+    main()
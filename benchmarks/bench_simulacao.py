@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the headless combat simulation.
+
+Measures fights per second on a single core for every class matchup,
+using the attack-only and the random policies.
+
+Usage:
+    python benchmarks/bench_simulacao.py [quantidade]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.personagens.guerreiro import Guerreiro
+from package.personagens.mago import Mago
+from package.personagens.arqueiro import Arqueiro
+from package.combate import simular_combates, politica_ataque, politica_aleatoria
+
+# Documented throughput target for the attack-only policy (fights/sec per core)
+META_COMBATES_POR_SEGUNDO = 15000
+
+
+def medir(classe1, classe2, politica, quantidade: int) -> float:
+    """Return fights per second for one matchup and policy"""
+    personagem1 = classe1("A")
+    personagem2 = classe2("B")
+    inicio = time.perf_counter()
+    simular_combates(personagem1, personagem2, quantidade, politica)
+    return quantidade / (time.perf_counter() - inicio)
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    classes = [Guerreiro, Mago, Arqueiro]
+
+    for nome_politica, politica in [("ataque", politica_ataque), ("aleatoria", politica_aleatoria)]:
+        print(f"Politica: {nome_politica}")
+        for classe1 in classes:
+            for classe2 in classes:
+                taxa = medir(classe1, classe2, politica, quantidade)
+                print(f"  {classe1.__name__:>9} x {classe2.__name__:<9} {taxa:>10,.0f} combates/s")
+
+    print(f"Meta (politica de ataque): {META_COMBATES_POR_SEGUNDO:,} combates/s por núcleo")
+
+
+if __name__ == '__main__':
+    main()
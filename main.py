@@ -4,15 +4,17 @@ Medieval Fantasy Battle Simulator
 Main application entry point
 """
 
-from flask import Flask, render_template, request, redirect, url_for, jsonify, session
+from flask import Flask, render_template, request, redirect, url_for, jsonify, session, Response, stream_with_context
 import os
 import json
+import atexit
 from package.personagens.base import Personagem
 from package.personagens.guerreiro import Guerreiro
 from package.personagens.mago import Mago
 from package.personagens.arqueiro import Arqueiro
 from package.combate import Combate
 from package.banco import BancoDados
+from package.registro_combates import RegistroCombates
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import webbrowser
 
@@ -22,6 +24,14 @@ app.secret_key = os.urandom(24)
 # Initialize data storage
 banco = BancoDados()
 
+# Active combats stay in memory; changes are written in the background
+registro_combates = RegistroCombates(
+    banco,
+    intervalo_gravacao=float(os.environ.get('COMBATE_INTERVALO_GRAVACAO', 5)),
+    tempo_ocioso=float(os.environ.get('COMBATE_TEMPO_OCIOSO', 600))
+)
+atexit.register(registro_combates.encerrar)
+
 @app.route('/')
 def index():
     """Render the main page of the application"""
@@ -78,7 +88,7 @@ def battle():
         # Initialize combat
         combate = Combate(personagem1, personagem2)
         session['combate_id'] = combate.id
-        banco.salvar_combate(combate)
+        registro_combates.registrar(combate)
         
         return redirect(url_for('battle_view', battle_id=combate.id))
     
@@ -87,7 +97,7 @@ def battle():
 @app.route('/battle/<battle_id>')
 def battle_view(battle_id):
     """View and manage an ongoing battle"""
-    combate = banco.carregar_combate(battle_id)
+    combate = registro_combates.obter(battle_id)
     if not combate:
         return "Combate não encontrado", 404
     
@@ -96,37 +106,33 @@ def battle_view(battle_id):
 @app.route('/battle/<battle_id>/action', methods=['POST'])
 def battle_action(battle_id):
     """Process a battle action"""
-    combate = banco.carregar_combate(battle_id)
-    if not combate:
-        return jsonify({"error": "Combate não encontrado"}), 404
-    
     action = request.form.get('action')
     habilidade_id = request.form.get('habilidade_id', None)
     
-    if action == 'atacar':
-        resultado = combate.executar_ataque()
-    elif action == 'defender':
-        resultado = combate.executar_defesa()
-    elif action == 'habilidade' and habilidade_id:
-        resultado = combate.usar_habilidade(habilidade_id)
-    else:
+    # Reject bad input before usar(), which schedules a save on exit
+    if action not in ('atacar', 'defender', 'habilidade') or (action == 'habilidade' and not habilidade_id):
         return jsonify({"error": "Ação inválida"}), 400
     
-    # Check if battle is over
-    if combate.finalizado:
-        banco.salvar_historico_combate(combate)
-    
-    # Save battle state
-    banco.salvar_combate(combate)
-    
-    return jsonify({
-        "resultado": resultado,
-        "personagem1": combate.personagem1.to_dict(),
-        "personagem2": combate.personagem2.to_dict(),
-        "turno_atual": combate.turno_atual,
-        "finalizado": combate.finalizado,
-        "vencedor": combate.vencedor.nome if combate.finalizado and combate.vencedor else None
-    })
+    # The registry saves the battle in the background, or to history once it ends
+    with registro_combates.usar(battle_id) as combate:
+        if not combate:
+            return jsonify({"error": "Combate não encontrado"}), 404
+        
+        if action == 'atacar':
+            resultado = combate.executar_ataque()
+        elif action == 'defender':
+            resultado = combate.executar_defesa()
+        else:
+            resultado = combate.usar_habilidade(habilidade_id)
+        
+        return jsonify({
+            "resultado": resultado,
+            "personagem1": combate.personagem1.to_dict(),
+            "personagem2": combate.personagem2.to_dict(),
+            "turno_atual": combate.turno_atual,
+            "finalizado": combate.finalizado,
+            "vencedor": combate.vencedor.nome if combate.finalizado and combate.vencedor else None
+        })
 
 @app.route('/inventory/<character_id>', methods=['GET', 'POST'])
 def inventory(character_id):
@@ -153,10 +159,58 @@ def inventory(character_id):
 
 @app.route('/history')
 def battle_history():
-    """View battle history"""
-    historico = banco.carregar_historico_combates()
+    """View battle history (most recent fights, optionally for one character)"""
+    limite = request.args.get('limite', 100, type=int)
+    personagem_id = request.args.get('personagem')
+    
+    if personagem_id:
+        historico = banco.carregar_historico_personagem(personagem_id, limite)
+    else:
+        historico = banco.carregar_ultimos_combates(limite)
     return render_template('history.html', historico=historico)
 
+@app.route('/api/history')
+def api_history():
+    """
+    Query battle history as streamed JSON
+    
+    Query parameters: personagem, classe, vencedor, turnos_min, turnos_max,
+    ordem (asc|desc), cursor, limite (max 200), incluir_log (1/true).
+    Pass proximo_cursor from a response as cursor to get the next page.
+    """
+    ordem = request.args.get('ordem', 'desc')
+    if ordem not in ('asc', 'desc'):
+        return jsonify({"erro": "Ordem inválida"}), 400
+    
+    limite = max(1, min(request.args.get('limite', 50, type=int), 200))
+    consulta = banco.consultar_historico(
+        personagem_id=request.args.get('personagem'),
+        classe=request.args.get('classe'),
+        vencedor_id=request.args.get('vencedor'),
+        turnos_min=request.args.get('turnos_min', type=int),
+        turnos_max=request.args.get('turnos_max', type=int),
+        ordem=ordem,
+        cursor=request.args.get('cursor', type=int),
+        limite=limite,
+        incluir_log=request.args.get('incluir_log', '').lower() in ('1', 'true')
+    )
+    
+    def gerar():
+        yield '{"resultados":['
+        quantidade = 0
+        ultimo_cursor = None
+        for resumo in consulta:
+            if quantidade:
+                yield ','
+            yield json.dumps(resumo, ensure_ascii=False)
+            quantidade += 1
+            ultimo_cursor = resumo["cursor"]
+        # A full page means there may be more entries after it
+        proximo_cursor = ultimo_cursor if quantidade == limite else None
+        yield f'],"proximo_cursor":{json.dumps(proximo_cursor)}}}'
+    
+    return Response(stream_with_context(gerar()), mimetype='application/json')
+
 class CORSRequestHandler(SimpleHTTPRequestHandler):
     def end_headers(self):
         self.send_header('Access-Control-Allow-Origin', '*')
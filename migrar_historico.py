@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Medieval Fantasy Battle Simulator
+One-off migration of the one-file-per-fight history (data/historico/*.json
+or *.pkl) into the append-only history log (data/historico/log)
+
+Usage:
+    python migrar_historico.py
+    python migrar_historico.py --pickle
+"""
+
+import argparse
+import time
+from package.banco import BancoDados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migra o histórico antigo para o log de histórico")
+    parser.add_argument("--pickle", action="store_true", help="Ler arquivos .pkl em vez de .json")
+    args = parser.parse_args()
+
+    banco = BancoDados(usar_pickle=args.pickle)
+
+    inicio = time.perf_counter()
+    migrados = banco.migrar_historico_legado()
+    duracao = time.perf_counter() - inicio
+
+    print(f"Migrados {migrados} registros de histórico para {banco._log_historico.diretorio} em {duracao:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Medieval Fantasy Battle Simulator
+Migration from the file layout (data/personagens, data/combates,
+data/historico) to the SQLite backend (data/banco.db)
+
+Usage:
+    python migrar_sqlite.py
+    python migrar_sqlite.py --pickle --destino /tmp/banco.db
+"""
+
+import argparse
+import os
+import time
+from package.armazenamento_sqlite import migrar_arquivos_para_sqlite
+
+
+def main() -> None:
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+    parser = argparse.ArgumentParser(description="Migra os arquivos de dados para o banco SQLite")
+    parser.add_argument("--origem", default=data_dir, help="Diretório de dados de origem")
+    parser.add_argument("--destino", default=None, help="Arquivo SQLite de destino (padrão: <origem>/banco.db)")
+    parser.add_argument("--pickle", action="store_true", help="Ler arquivos .pkl em vez de .json")
+    args = parser.parse_args()
+
+    destino = args.destino or os.path.join(args.origem, "banco.db")
+
+    inicio = time.perf_counter()
+    contagem = migrar_arquivos_para_sqlite(args.origem, destino, usar_pickle=args.pickle)
+    duracao = time.perf_counter() - inicio
+
+    print(f"Migrados {contagem['personagens']} personagens, {contagem['combates']} combates "
+          f"e {contagem['historico']} registros de histórico para {destino} em {duracao:.2f}s")
+    print("Use BancoDados(usar_sqlite=True) para ler o novo banco")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,383 @@
+"""
+SQLite storage module for the Medieval Fantasy Battle Simulator.
+Stores characters, combats and combat history as JSON payloads in a
+single SQLite database, as an alternative to one file per entity.
+"""
+
+import os
+import json
+import pickle
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from package.historico_log import LogHistorico
+from package.journal_combates import JournalCombates
+
+
+class ArmazenamentoSQLite:
+    """
+    SQLite storage engine used by BancoDados when usar_sqlite is set.
+
+    Records are kept as JSON text next to indexed columns (id, owner,
+    class, ...) so lookups never scan payloads. The database runs in WAL
+    mode, and writes issued inside transacao() share a single commit.
+    """
+
+    def __init__(self, caminho: str):
+        """
+        Open (and create if needed) the database
+
+        Args:
+            caminho: Path to the SQLite database file
+        """
+        self.caminho = caminho
+        self._lock = threading.RLock()
+        self._profundidade_transacao = 0
+
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._criar_tabelas()
+
+    def _criar_tabelas(self) -> None:
+        """Create tables and indexes"""
+        with self.transacao() as conexao:
+            conexao.execute('''
+                CREATE TABLE IF NOT EXISTS personagens (
+                    id TEXT PRIMARY KEY,
+                    owner_id TEXT,
+                    classe TEXT NOT NULL,
+                    nome TEXT,
+                    dados TEXT NOT NULL
+                )
+            ''')
+            conexao.execute('CREATE INDEX IF NOT EXISTS idx_personagens_owner ON personagens (owner_id)')
+            conexao.execute('CREATE INDEX IF NOT EXISTS idx_personagens_classe ON personagens (classe)')
+
+            conexao.execute('''
+                CREATE TABLE IF NOT EXISTS combates (
+                    id TEXT PRIMARY KEY,
+                    dados TEXT NOT NULL
+                )
+            ''')
+
+            conexao.execute('''
+                CREATE TABLE IF NOT EXISTS historico (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT UNIQUE NOT NULL,
+                    personagem1_id TEXT,
+                    personagem2_id TEXT,
+                    vencedor_id TEXT,
+                    turnos INTEGER,
+                    registrado_em REAL,
+                    classe1 TEXT,
+                    classe2 TEXT,
+                    dados TEXT NOT NULL
+                )
+            ''')
+            conexao.execute('CREATE INDEX IF NOT EXISTS idx_historico_p1 ON historico (personagem1_id)')
+            conexao.execute('CREATE INDEX IF NOT EXISTS idx_historico_p2 ON historico (personagem2_id)')
+            conexao.execute('CREATE INDEX IF NOT EXISTS idx_historico_data ON historico (registrado_em)')
+
+    @contextmanager
+    def transacao(self) -> Iterator[sqlite3.Connection]:
+        """
+        Group writes into a single transaction
+
+        Nested calls join the outermost transaction, which commits once
+        on exit (or rolls back on error).
+
+        Yields:
+            The database connection
+        """
+        with self._lock:
+            self._profundidade_transacao += 1
+            try:
+                yield self._conexao
+            except Exception:
+                if self._profundidade_transacao == 1:
+                    self._conexao.rollback()
+                raise
+            else:
+                if self._profundidade_transacao == 1:
+                    self._conexao.commit()
+            finally:
+                self._profundidade_transacao -= 1
+
+    def fechar(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conexao.close()
+
+    # Characters
+
+    def salvar_personagens(self, lista_dados: List[Dict[str, Any]]) -> None:
+        """
+        Insert or replace characters in one batch
+
+        Args:
+            lista_dados: Character dictionaries (Personagem.to_dict)
+        """
+        linhas = [
+            (dados["id"],
+             str(dados["owner_id"]) if dados.get("owner_id") is not None else None,
+             dados["classe"], dados.get("nome"),
+             json.dumps(dados, ensure_ascii=False, separators=(',', ':')))
+            for dados in lista_dados
+        ]
+        with self.transacao() as conexao:
+            conexao.executemany('''
+                INSERT OR REPLACE INTO personagens (id, owner_id, classe, nome, dados)
+                VALUES (?, ?, ?, ?, ?)
+            ''', linhas)
+
+    def salvar_personagem(self, dados: Dict[str, Any]) -> None:
+        """Insert or replace one character"""
+        self.salvar_personagens([dados])
+
+    def carregar_personagem(self, personagem_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a character dictionary by ID
+
+        Returns:
+            The stored dictionary, or None if not found
+        """
+        with self._lock:
+            linha = self._conexao.execute('SELECT dados FROM personagens WHERE id = ?',
+                                          (personagem_id,)).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def carregar_todos_personagens(self) -> List[Dict[str, Any]]:
+        """Get every stored character dictionary"""
+        with self._lock:
+            linhas = self._conexao.execute('SELECT dados FROM personagens').fetchall()
+        return [json.loads(linha[0]) for linha in linhas]
+
+    def carregar_personagens_do_dono(self, owner_id: Any) -> List[Dict[str, Any]]:
+        """Get the character dictionaries owned by a user (indexed lookup)"""
+        with self._lock:
+            linhas = self._conexao.execute('SELECT dados FROM personagens WHERE owner_id = ?',
+                                           (str(owner_id),)).fetchall()
+        return [json.loads(linha[0]) for linha in linhas]
+
+    def excluir_personagem(self, personagem_id: str) -> bool:
+        """
+        Delete a character
+
+        Returns:
+            True if a character was deleted
+        """
+        with self.transacao() as conexao:
+            cursor = conexao.execute('DELETE FROM personagens WHERE id = ?', (personagem_id,))
+            return cursor.rowcount > 0
+
+    # Combats
+
+    def salvar_combate(self, dados: Dict[str, Any]) -> None:
+        """Insert or replace a combat (Combate.to_dict)"""
+        with self.transacao() as conexao:
+            conexao.execute('INSERT OR REPLACE INTO combates (id, dados) VALUES (?, ?)',
+                            (dados["id"], json.dumps(dados, ensure_ascii=False, separators=(',', ':'))))
+
+    def carregar_combate(self, combate_id: str) -> Optional[Dict[str, Any]]:
+        """Get a combat dictionary by ID, or None if not found"""
+        with self._lock:
+            linha = self._conexao.execute('SELECT dados FROM combates WHERE id = ?',
+                                          (combate_id,)).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def excluir_combate(self, combate_id: str) -> bool:
+        """Delete a combat; returns True if one was deleted"""
+        with self.transacao() as conexao:
+            cursor = conexao.execute('DELETE FROM combates WHERE id = ?', (combate_id,))
+            return cursor.rowcount > 0
+
+    # Combat history
+
+    def salvar_historico(self, resumo: Dict[str, Any]) -> None:
+        """Insert a finished combat summary (kept as is if its ID is already stored)"""
+        vencedor = resumo.get("vencedor")
+        with self.transacao() as conexao:
+            conexao.execute('''
+                INSERT OR IGNORE INTO historico
+                    (id, personagem1_id, personagem2_id, vencedor_id, turnos, registrado_em,
+                     classe1, classe2, dados)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (resumo["id"], resumo["personagem1"]["id"], resumo["personagem2"]["id"],
+                  vencedor["id"] if vencedor else None, resumo.get("turnos"),
+                  resumo.get("registrado_em"),
+                  resumo["personagem1"].get("classe"), resumo["personagem2"].get("classe"),
+                  json.dumps(resumo, ensure_ascii=False, separators=(',', ':'))))
+
+    def carregar_historico(self) -> List[Dict[str, Any]]:
+        """Get every combat summary in insertion order"""
+        with self._lock:
+            linhas = self._conexao.execute('SELECT dados FROM historico ORDER BY seq').fetchall()
+        return [json.loads(linha[0]) for linha in linhas]
+
+    def carregar_historico_recente(self, quantidade: int) -> List[Dict[str, Any]]:
+        """Get the most recent combat summaries, newest first"""
+        with self._lock:
+            linhas = self._conexao.execute('SELECT dados FROM historico ORDER BY seq DESC LIMIT ?',
+                                           (quantidade,)).fetchall()
+        return [json.loads(linha[0]) for linha in linhas]
+
+    def carregar_historico_personagem(self, personagem_id: str,
+                                      limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the summaries of a character's fights, newest first"""
+        with self._lock:
+            linhas = self._conexao.execute('''
+                SELECT dados FROM historico
+                WHERE personagem1_id = ? OR personagem2_id = ?
+                ORDER BY seq DESC LIMIT ?
+            ''', (personagem_id, personagem_id, -1 if limite is None else limite)).fetchall()
+        return [json.loads(linha[0]) for linha in linhas]
+
+    def carregar_historico_desde(self, registrado_em: float) -> List[Dict[str, Any]]:
+        """Get the summaries recorded at or after a timestamp, oldest first"""
+        with self._lock:
+            linhas = self._conexao.execute('''
+                SELECT dados FROM historico WHERE registrado_em >= ? ORDER BY seq
+            ''', (registrado_em,)).fetchall()
+        return [json.loads(linha[0]) for linha in linhas]
+
+    def consultar_historico(self, personagem_id: Optional[str] = None, classe: Optional[str] = None,
+                            vencedor_id: Optional[str] = None, turnos_min: Optional[int] = None,
+                            turnos_max: Optional[int] = None, mais_recentes_primeiro: bool = True,
+                            cursor: Optional[int] = None,
+                            limite: int = 50) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Query one page of combat summaries (see LogHistorico.consultar)
+
+        Yields:
+            (sequence number, combat summary) pairs
+        """
+        condicoes = []
+        parametros: List[Any] = []
+        if personagem_id is not None:
+            condicoes.append('(personagem1_id = ? OR personagem2_id = ?)')
+            parametros += [personagem_id, personagem_id]
+        if classe is not None:
+            condicoes.append('(classe1 = ? OR classe2 = ?)')
+            parametros += [classe, classe]
+        if vencedor_id is not None:
+            condicoes.append('vencedor_id = ?')
+            parametros.append(vencedor_id)
+        if turnos_min is not None:
+            condicoes.append('turnos >= ?')
+            parametros.append(turnos_min)
+        if turnos_max is not None:
+            condicoes.append('turnos <= ?')
+            parametros.append(turnos_max)
+        if cursor is not None:
+            condicoes.append('seq < ?' if mais_recentes_primeiro else 'seq > ?')
+            parametros.append(cursor)
+
+        sql = 'SELECT seq, dados FROM historico'
+        if condicoes:
+            sql += ' WHERE ' + ' AND '.join(condicoes)
+        sql += f" ORDER BY seq {'DESC' if mais_recentes_primeiro else 'ASC'} LIMIT ?"
+        parametros.append(limite)
+
+        with self._lock:
+            linhas = self._conexao.execute(sql, parametros).fetchall()
+        for seq, dados in linhas:
+            yield seq, json.loads(dados)
+
+
+def migrar_arquivos_para_sqlite(data_dir: str, caminho_db: str, usar_pickle: bool = False) -> Dict[str, int]:
+    """
+    Copy the one-file-per-entity layout into a SQLite database
+
+    Files are read as raw payloads (no Personagem objects are built) and
+    written in a single transaction. Existing characters and combats with
+    the same IDs are replaced and history entries already stored are kept
+    (with their sequence numbers, so cursors stay valid); the migration can
+    be re-run safely.
+
+    Journaled combats (BancoDados(usar_journal=True)) are migrated with their
+    journal replayed over the checkpoint. History comes from the legacy
+    one-file-per-fight entries, oldest first by file modification time,
+    followed by the history log in the order fights were recorded.
+
+    Args:
+        data_dir: Directory with the personagens/, combates/ and historico/ folders
+                  (including the history log in historico/log)
+        caminho_db: Path to the SQLite database to create or update
+        usar_pickle: Whether the source files are pickle (.pkl) instead of JSON
+
+    Returns:
+        Number of migrated records per kind
+    """
+    ext = ".pkl" if usar_pickle else ".json"
+
+    def ler_pasta(nome: str) -> List[Tuple[float, Any]]:
+        pasta = os.path.join(data_dir, nome)
+        registros = []
+        if not os.path.isdir(pasta):
+            return registros
+        for arquivo in os.listdir(pasta):
+            if not arquivo.endswith(ext):
+                continue
+            caminho = os.path.join(pasta, arquivo)
+            try:
+                modificado_em = os.path.getmtime(caminho)
+                if usar_pickle:
+                    with open(caminho, 'rb') as origem:
+                        registro = pickle.load(origem)
+                    # Characters and combats are pickled as objects
+                    if hasattr(registro, "to_dict"):
+                        registro = registro.to_dict()
+                else:
+                    with open(caminho, 'r', encoding='utf-8') as origem:
+                        registro = json.load(origem)
+                registros.append((modificado_em, registro))
+            except Exception as e:
+                print(f"Erro ao migrar {caminho}: {e}")
+        # Oldest first, so history gets sequence numbers in the order fights happened
+        registros.sort(key=lambda item: item[0])
+        return registros
+
+    personagens = [registro for _, registro in ler_pasta("personagens")]
+
+    combates = []
+    journal = JournalCombates(os.path.join(data_dir, "combates")) if not usar_pickle else None
+    for _, combate in ler_pasta("combates"):
+        if journal is not None and "estado" in combate:
+            # Journal checkpoint: replay the deltas saved after it
+            try:
+                registro = journal.ler(combate["id"])
+            except Exception as e:
+                print(f"Erro ao migrar journal do combate {combate['id']}: {e}")
+                continue
+            if registro is None:
+                continue
+            combate, estado = registro
+            combate["estado"] = estado
+        combates.append(combate)
+
+    historico = []
+    for modificado_em, resumo in ler_pasta("historico"):
+        # Legacy entries carry no date; use the file's modification time
+        resumo.setdefault("registrado_em", modificado_em)
+        historico.append(resumo)
+
+    # Fights recorded in the append-only history log
+    diretorio_log = os.path.join(data_dir, "historico", "log")
+    if os.path.isdir(diretorio_log):
+        log = LogHistorico(diretorio_log)
+        historico.extend(log.ler(list(log.entradas())))
+
+    armazenamento = ArmazenamentoSQLite(caminho_db)
+    try:
+        with armazenamento.transacao():
+            armazenamento.salvar_personagens(personagens)
+            for combate in combates:
+                armazenamento.salvar_combate(combate)
+            for resumo in historico:
+                armazenamento.salvar_historico(resumo)
+    finally:
+        armazenamento.fechar()
+
+    return {"personagens": len(personagens), "combates": len(combates), "historico": len(historico)}
@@ -6,13 +6,18 @@ Handles data serialization, loading, and persistence.
 import os
 import json
 import pickle
-from typing import Dict, Any, List, Optional, Union
+import time
+import threading
+from datetime import datetime
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional, Sequence, Tuple, Union
 import uuid
 from package.personagens.base import Personagem
-from package.personagens.guerreiro import Guerreiro
-from package.personagens.mago import Mago
-from package.personagens.arqueiro import Arqueiro
 from package.combate import Combate
+from package.armazenamento_sqlite import ArmazenamentoSQLite
+from package.historico_log import LogHistorico
+from package.journal_combates import JournalCombates
 
 
 class BancoDados:
@@ -20,25 +25,102 @@ class BancoDados:
     Database class for managing game data persistence.
     """
     
-    def __init__(self, usar_pickle: bool = False):
+    def __init__(self, usar_pickle: bool = False, tamanho_cache: int = 256,
+                 usar_sqlite: bool = False, usar_journal: bool = False,
+                 compactar_journal_a_cada: int = 50):
         """
         Initialize the database
         
         Args:
             usar_pickle: Whether to use pickle for serialization (True) or JSON (False)
+            tamanho_cache: Maximum number of characters kept in memory (0 disables the cache)
+            usar_sqlite: Whether to store everything in a single SQLite database
+                         (data/banco.db) instead of one file per entity
+            usar_journal: Whether to save combats as a checkpoint plus per-action
+                          deltas (JSON files only)
+            compactar_journal_a_cada: Deltas after which a combat journal is
+                                      folded into a new checkpoint
         """
+        if usar_journal and (usar_pickle or usar_sqlite):
+            raise ValueError("O journal de combates requer armazenamento em arquivos JSON")
+        
         self.usar_pickle = usar_pickle
+        self.usar_sqlite = usar_sqlite
+        self.usar_journal = usar_journal
+        
+        # Snapshot cache: the stored state of recently used characters, pickled
+        # so every load gets its own copy and fights never change the cached
+        # state; least recently used entries are evicted beyond tamanho_cache
+        self.tamanho_cache = tamanho_cache
+        self._cache_personagens: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_acertos = 0
+        self.cache_falhas = 0
+        self.cache_remocoes = 0
         
         # Ensure data directories exist
         self.data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
         self.personagens_dir = os.path.join(self.data_dir, "personagens")
         self.combates_dir = os.path.join(self.data_dir, "combates")
         self.historico_dir = os.path.join(self.data_dir, "historico")
+        self.indices_dir = os.path.join(self.data_dir, "indices")
         
         os.makedirs(self.data_dir, exist_ok=True)
         os.makedirs(self.personagens_dir, exist_ok=True)
         os.makedirs(self.combates_dir, exist_ok=True)
         os.makedirs(self.historico_dir, exist_ok=True)
+        os.makedirs(self.indices_dir, exist_ok=True)
+        
+        # Owner index: owner_id -> character IDs, plus the reverse mapping
+        self._indice_lock = threading.Lock()
+        self._personagens_por_dono: Dict[str, List[str]] = {}
+        self._dono_por_personagem: Dict[str, str] = {}
+        # Index file read so far (inode, bytes), to pick up other processes' appends
+        self._inode_indice_donos = None
+        self._posicao_indice_donos = 0
+        
+        # The SQLite backend indexes owners in the database itself
+        self._sqlite: Optional[ArmazenamentoSQLite] = None
+        self._log_historico: Optional[LogHistorico] = None
+        if usar_sqlite:
+            self._sqlite = ArmazenamentoSQLite(os.path.join(self.data_dir, "banco.db"))
+        else:
+            self._carregar_indice_donos()
+            # History goes to an append-only log; one-file-per-fight entries
+            # left in historico_dir by older versions are moved into it by
+            # migrar_historico.py, once, rather than by every process on start
+            self._log_historico = LogHistorico(os.path.join(self.historico_dir, "log"))
+            legado = len(self._arquivos_historico_legado())
+            if legado:
+                print(f"Aviso: {legado} registros de histórico no formato antigo ficam fora das "
+                      f"consultas; migre-os com python migrar_historico.py")
+        
+        self._journal: Optional[JournalCombates] = None
+        if usar_journal:
+            self._journal = JournalCombates(self.combates_dir, compactar_journal_a_cada)
+        
+        # Optional columnar roster (package.elenco.ElencoColunar) kept in sync
+        # with character writes and finished fights; see anexar_elenco()
+        self._elenco = None
+        self._elenco_lock = threading.Lock()
+        # Updates that arrive while anexar_elenco() loads its snapshot, with
+        # the combat ID for fights (None for character updates)
+        self._elenco_pendente: Optional[List[Tuple[Optional[str], Callable[[Any], None]]]] = None
+    
+    @contextmanager
+    def transacao(self) -> Iterator[None]:
+        """
+        Group several writes into one batch
+        
+        With the SQLite backend every save inside the block shares a single
+        commit; with the file backends writes happen immediately as usual.
+        """
+        if self._sqlite is None:
+            yield
+            return
+        
+        with self._sqlite.transacao():
+            yield
     
     def _obter_caminho_personagem(self, personagem_id: str) -> str:
         """
@@ -66,18 +148,243 @@ class BancoDados:
         ext = ".pkl" if self.usar_pickle else ".json"
         return os.path.join(self.combates_dir, f"{combate_id}{ext}")
     
-    def _obter_caminho_historico(self, combate_id: str) -> str:
+    def _cache_obter(self, personagem_id: str) -> Optional[Personagem]:
         """
-        Get the file path for a combat history
+        Get a new copy of a cached character, counting hits and misses
         
         Args:
-            combate_id: Combat ID
+            personagem_id: Character ID
             
         Returns:
-            File path for the combat history
+            A fresh instance with the cached state if present, None otherwise
+        """
+        with self._cache_lock:
+            snapshot = self._cache_personagens.get(personagem_id)
+            if snapshot is None:
+                self.cache_falhas += 1
+                return None
+            self._cache_personagens.move_to_end(personagem_id)
+            self.cache_acertos += 1
+        return pickle.loads(snapshot)
+    
+    def _cache_guardar(self, personagem: Personagem) -> None:
+        """
+        Cache a snapshot of a character's stored state, evicting the least recently used
+        
+        Later changes to the character do not reach the snapshot.
+        
+        Args:
+            personagem: Character as just saved or loaded
+        """
+        if self.tamanho_cache <= 0:
+            return
+        
+        snapshot = pickle.dumps(personagem, pickle.HIGHEST_PROTOCOL)
+        with self._cache_lock:
+            self._cache_personagens[personagem.id] = snapshot
+            self._cache_personagens.move_to_end(personagem.id)
+            while len(self._cache_personagens) > self.tamanho_cache:
+                self._cache_personagens.popitem(last=False)
+                self.cache_remocoes += 1
+    
+    def _cache_invalidar(self, personagem_id: str) -> None:
+        """
+        Drop a character from the snapshot cache
+        
+        Args:
+            personagem_id: Character ID
+        """
+        with self._cache_lock:
+            self._cache_personagens.pop(personagem_id, None)
+    
+    def estatisticas_cache(self) -> Dict[str, Any]:
+        """
+        Get the snapshot cache counters
+        
+        Returns:
+            Dictionary with hits, misses, evictions, size and hit rate
+        """
+        with self._cache_lock:
+            consultas = self.cache_acertos + self.cache_falhas
+            return {
+                "acertos": self.cache_acertos,
+                "falhas": self.cache_falhas,
+                "remocoes": self.cache_remocoes,
+                "tamanho": len(self._cache_personagens),
+                "capacidade": self.tamanho_cache,
+                "taxa_acerto": self.cache_acertos / consultas if consultas else 0.0
+            }
+    
+    def _obter_caminho_indice_donos(self) -> str:
+        """
+        Get the file path for the owner index
+        
+        Returns:
+            File path for the owner index
+        """
+        return os.path.join(self.indices_dir, "donos.jsonl")
+    
+    def _carregar_indice_donos(self) -> None:
+        """Load the owner index from disk, rebuilding it if it is missing"""
+        if not os.path.exists(self._obter_caminho_indice_donos()):
+            self.reconstruir_indice_donos()
+            return
+        
+        with self._indice_lock:
+            self._ler_indice_donos()
+    
+    def _ler_indice_donos(self) -> None:
+        """
+        Apply the owner index records appended since the last read
+        
+        Other processes (app.py and main.py share data/) append to the same
+        file, so this runs before every lookup and change. If the file was
+        replaced by a rebuild, it is read again from the start. Caller holds
+        the index lock.
+        """
+        caminho = self._obter_caminho_indice_donos()
+        try:
+            estado = os.stat(caminho)
+        except FileNotFoundError:
+            return
+        
+        if estado.st_ino != self._inode_indice_donos or estado.st_size < self._posicao_indice_donos:
+            self._personagens_por_dono = {}
+            self._dono_por_personagem = {}
+            self._inode_indice_donos = estado.st_ino
+            self._posicao_indice_donos = 0
+        elif estado.st_size == self._posicao_indice_donos:
+            return
+        
+        try:
+            with open(caminho, 'rb') as arquivo:
+                arquivo.seek(self._posicao_indice_donos)
+                dados = arquivo.read()
+        except Exception as e:
+            print(f"Erro ao carregar índice de donos: {e}")
+            return
+        
+        # A record another process is still writing has no final newline yet
+        fim = dados.rfind(b"\n") + 1
+        self._posicao_indice_donos += fim
+        for linha in dados[:fim].splitlines():
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+            except ValueError:
+                # Torn record left by a crash; the next record starts on its own line
+                continue
+            self._aplicar_dono(registro["id"], registro["dono"])
+    
+    def _aplicar_dono(self, personagem_id: str, dono: Optional[str]) -> None:
+        """Set a character's owner in the in-memory index (caller holds the index lock)"""
+        dono_anterior = self._dono_por_personagem.get(personagem_id)
+        if dono_anterior == dono:
+            return
+        
+        if dono_anterior is not None:
+            ids = self._personagens_por_dono.get(dono_anterior, [])
+            if personagem_id in ids:
+                ids.remove(personagem_id)
+            if not ids:
+                self._personagens_por_dono.pop(dono_anterior, None)
+            del self._dono_por_personagem[personagem_id]
+        
+        if dono is not None:
+            self._personagens_por_dono.setdefault(dono, []).append(personagem_id)
+            self._dono_por_personagem[personagem_id] = dono
+    
+    @staticmethod
+    def _registro_indice_donos(personagem_id: str, dono: Optional[str]) -> bytes:
+        """
+        Encode one owner index record
+        
+        Records start and end with a newline, so a record torn by a crash
+        never swallows the one appended after it.
+        """
+        return ("\n" + json.dumps({"id": personagem_id, "dono": dono}, ensure_ascii=False) + "\n").encode('utf-8')
+    
+    def _indexar_dono(self, personagem_id: str, owner_id: Any) -> None:
+        """
+        Update the owner index for one character
+        
+        The change is appended to the index file only when the character's
+        owner changes. Each record is a single small append, so concurrent
+        processes never overwrite each other's changes.
+        
+        Args:
+            personagem_id: Character ID
+            owner_id: New owner ID, or None to remove the character from the index
         """
+        if self._sqlite is not None:
+            return
+        
+        dono = str(owner_id) if owner_id is not None else None
+        
+        with self._indice_lock:
+            self._ler_indice_donos()
+            if self._dono_por_personagem.get(personagem_id) == dono:
+                return
+            
+            self._aplicar_dono(personagem_id, dono)
+            try:
+                with open(self._obter_caminho_indice_donos(), 'ab') as arquivo:
+                    arquivo.write(self._registro_indice_donos(personagem_id, dono))
+            except Exception as e:
+                print(f"Erro ao salvar índice de donos: {e}")
+    
+    def reconstruir_indice_donos(self) -> None:
+        """Rebuild the owner index by scanning every character file"""
+        if self._sqlite is not None:
+            return
+        
+        personagens_por_dono: Dict[str, List[str]] = {}
+        
         ext = ".pkl" if self.usar_pickle else ".json"
-        return os.path.join(self.historico_dir, f"{combate_id}{ext}")
+        for arquivo in os.listdir(self.personagens_dir):
+            if not arquivo.endswith(ext):
+                continue
+            caminho = os.path.join(self.personagens_dir, arquivo)
+            
+            try:
+                if self.usar_pickle:
+                    with open(caminho, 'rb') as arquivo_personagem:
+                        owner_id = getattr(pickle.load(arquivo_personagem), "owner_id", None)
+                else:
+                    with open(caminho, 'r', encoding='utf-8') as arquivo_personagem:
+                        owner_id = json.load(arquivo_personagem).get("owner_id")
+            except Exception as e:
+                print(f"Erro ao indexar personagem: {e}")
+                continue
+            
+            if owner_id is not None:
+                personagens_por_dono.setdefault(str(owner_id), []).append(arquivo[:-len(ext)])
+        
+        caminho = self._obter_caminho_indice_donos()
+        temporario = caminho + ".tmp"
+        with self._indice_lock:
+            try:
+                with open(temporario, 'wb') as arquivo:
+                    for dono, ids in personagens_por_dono.items():
+                        for personagem_id in ids:
+                            arquivo.write(self._registro_indice_donos(personagem_id, dono))
+                os.replace(temporario, caminho)
+            except Exception as e:
+                print(f"Erro ao salvar índice de donos: {e}")
+            
+            self._personagens_por_dono = personagens_por_dono
+            self._dono_por_personagem = {
+                personagem_id: dono
+                for dono, ids in personagens_por_dono.items()
+                for personagem_id in ids
+            }
+            try:
+                estado = os.stat(caminho)
+                self._inode_indice_donos = estado.st_ino
+                self._posicao_indice_donos = estado.st_size
+            except OSError:
+                pass
     
     def _classe_para_objeto(self, data: Dict[str, Any]) -> Personagem:
         """
@@ -89,14 +396,7 @@ class BancoDados:
         Returns:
             Character instance of appropriate class
         """
-        if data["classe"] == "Guerreiro":
-            return Guerreiro.from_dict(data)
-        elif data["classe"] == "Mago":
-            return Mago.from_dict(data)
-        elif data["classe"] == "Arqueiro":
-            return Arqueiro.from_dict(data)
-        else:
-            raise ValueError(f"Classe não suportada: {data['classe']}")
+        return Personagem.from_dict(data)
     
     def salvar_personagem(self, personagem: Personagem) -> bool:
         """
@@ -111,27 +411,84 @@ class BancoDados:
         caminho = self._obter_caminho_personagem(personagem.id)
         
         try:
-            if self.usar_pickle:
+            if self._sqlite is not None:
+                self._sqlite.salvar_personagem(personagem.to_dict())
+            elif self.usar_pickle:
                 with open(caminho, 'wb') as arquivo:
                     pickle.dump(personagem, arquivo)
             else:
                 with open(caminho, 'w', encoding='utf-8') as arquivo:
                     json.dump(personagem.to_dict(), arquivo, ensure_ascii=False, indent=2)
+            
+            # The saved state is what the next load returns
+            self._cache_guardar(personagem)
+            self._indexar_dono(personagem.id, getattr(personagem, "owner_id", None))
+            self._elenco_aplicar(lambda elenco: elenco.atualizar(personagem))
             return True
         except Exception as e:
             print(f"Erro ao salvar personagem: {e}")
+            self._cache_invalidar(personagem.id)
             return False
     
+    def salvar_personagens(self, personagens: List[Personagem]) -> bool:
+        """
+        Save several characters as one batch
+        
+        Args:
+            personagens: Characters to save
+            
+        Returns:
+            True if every character was saved, False otherwise
+        """
+        if self._sqlite is None:
+            sucesso = True
+            for personagem in personagens:
+                sucesso = self.salvar_personagem(personagem) and sucesso
+            return sucesso
+        
+        try:
+            self._sqlite.salvar_personagens([personagem.to_dict() for personagem in personagens])
+        except Exception as e:
+            print(f"Erro ao salvar personagens: {e}")
+            for personagem in personagens:
+                self._cache_invalidar(personagem.id)
+            return False
+        
+        for personagem in personagens:
+            self._cache_guardar(personagem)
+        self._elenco_aplicar(lambda elenco: elenco.atualizar_varios(personagens))
+        return True
+    
     def carregar_personagem(self, personagem_id: str) -> Optional[Personagem]:
         """
         Load a character from file
         
+        Characters are served from the snapshot cache when possible. Every
+        call returns a new instance with the stored state, so changes made
+        by a fight never reach other callers until the character is saved.
+        
         Args:
             personagem_id: ID of the character to load
             
         Returns:
             The loaded character if found, None otherwise
         """
+        personagem = self._cache_obter(personagem_id)
+        if personagem is not None:
+            return personagem
+        
+        if self._sqlite is not None:
+            try:
+                data = self._sqlite.carregar_personagem(personagem_id)
+                if data is None:
+                    return None
+                personagem = self._classe_para_objeto(data)
+                self._cache_guardar(personagem)
+                return personagem
+            except Exception as e:
+                print(f"Erro ao carregar personagem: {e}")
+                return None
+        
         caminho = self._obter_caminho_personagem(personagem_id)
         
         if not os.path.exists(caminho):
@@ -140,15 +497,30 @@ class BancoDados:
         try:
             if self.usar_pickle:
                 with open(caminho, 'rb') as arquivo:
-                    return pickle.load(arquivo)
+                    personagem = pickle.load(arquivo)
             else:
                 with open(caminho, 'r', encoding='utf-8') as arquivo:
                     data = json.load(arquivo)
-                    return self._classe_para_objeto(data)
+                    personagem = self._classe_para_objeto(data)
+            
+            self._cache_guardar(personagem)
+            return personagem
         except Exception as e:
             print(f"Erro ao carregar personagem: {e}")
             return None
     
+    def _personagens_de_dados(self, lista_dados: List[Dict[str, Any]]) -> List[Personagem]:
+        """Build characters from stored dictionaries, caching their snapshots"""
+        personagens = []
+        for data in lista_dados:
+            try:
+                personagem = self._classe_para_objeto(data)
+                self._cache_guardar(personagem)
+                personagens.append(personagem)
+            except Exception as e:
+                print(f"Erro ao carregar personagem: {e}")
+        return personagens
+    
     def carregar_todos_personagens(self) -> List[Personagem]:
         """
         Load all characters from files
@@ -156,6 +528,9 @@ class BancoDados:
         Returns:
             List of all characters
         """
+        if self._sqlite is not None:
+            return self._personagens_de_dados(self._sqlite.carregar_todos_personagens())
+        
         personagens = []
         
         ext = ".pkl" if self.usar_pickle else ".json"
@@ -168,6 +543,37 @@ class BancoDados:
         
         return personagens
     
+    def carregar_personagens_do_usuario(self, user_id: Any) -> List[Personagem]:
+        """
+        Load the characters owned by a user through the owner index
+        
+        Only the user's own character files are read, so the cost depends on
+        the size of the user's roster rather than on the total population.
+        
+        Args:
+            user_id: ID of the owning user
+            
+        Returns:
+            List of the user's characters
+        """
+        if self._sqlite is not None:
+            return self._personagens_de_dados(self._sqlite.carregar_personagens_do_dono(user_id))
+        
+        with self._indice_lock:
+            self._ler_indice_donos()
+            ids = list(self._personagens_por_dono.get(str(user_id), []))
+        
+        personagens = []
+        for personagem_id in ids:
+            personagem = self.carregar_personagem(personagem_id)
+            if personagem:
+                personagens.append(personagem)
+            else:
+                # The file is gone; keep the index consistent
+                self._indexar_dono(personagem_id, None)
+        
+        return personagens
+    
     def excluir_personagem(self, personagem_id: str) -> bool:
         """
         Delete a character file
@@ -178,6 +584,18 @@ class BancoDados:
         Returns:
             True if successful, False otherwise
         """
+        self._cache_invalidar(personagem_id)
+        
+        if self._sqlite is not None:
+            try:
+                excluido = self._sqlite.excluir_personagem(personagem_id)
+            except Exception as e:
+                print(f"Erro ao excluir personagem: {e}")
+                return False
+            if excluido:
+                self._elenco_aplicar(lambda elenco: elenco.remover(personagem_id))
+            return excluido
+        
         caminho = self._obter_caminho_personagem(personagem_id)
         
         if not os.path.exists(caminho):
@@ -185,11 +603,59 @@ class BancoDados:
         
         try:
             os.remove(caminho)
+            self._indexar_dono(personagem_id, None)
+            self._elenco_aplicar(lambda elenco: elenco.remover(personagem_id))
             return True
         except Exception as e:
             print(f"Erro ao excluir personagem: {e}")
             return False
     
+    def anexar_elenco(self, elenco) -> None:
+        """
+        Fill a columnar roster from the stored data and keep it in sync
+        
+        Every stored character and every fight of the history is loaded
+        once; afterwards character saves, deletions and finished fights
+        update the roster as they happen. Updates made while the snapshot
+        loads are queued and replayed before the roster is attached; fights
+        the snapshot already counted are not counted twice.
+        
+        Args:
+            elenco: An empty package.elenco.ElencoColunar
+        """
+        with self._elenco_lock:
+            self._elenco_pendente = []
+        
+        try:
+            elenco.atualizar_varios(self.carregar_todos_personagens())
+            historico = self.carregar_historico_combates()
+            elenco.registrar_historico(historico)
+            carregados = {resumo.get("id") for resumo in historico}
+            
+            with self._elenco_lock:
+                for combate_id, operacao in self._elenco_pendente:
+                    if combate_id is None or combate_id not in carregados:
+                        operacao(elenco)
+                self._elenco = elenco
+        finally:
+            with self._elenco_lock:
+                self._elenco_pendente = None
+    
+    def _elenco_aplicar(self, operacao: Callable[[Any], None],
+                        combate_id: Optional[str] = None) -> None:
+        """
+        Apply an update to the attached roster, or queue it during anexar_elenco()
+        
+        Args:
+            operacao: Function that receives the roster and updates it
+            combate_id: ID of the finished fight the update records, if any
+        """
+        with self._elenco_lock:
+            if self._elenco is not None:
+                operacao(self._elenco)
+            elif self._elenco_pendente is not None:
+                self._elenco_pendente.append((combate_id, operacao))
+    
     def salvar_combate(self, combate: Combate) -> bool:
         """
         Save a combat to file
@@ -203,7 +669,11 @@ class BancoDados:
         caminho = self._obter_caminho_combate(combate.id)
         
         try:
-            if self.usar_pickle:
+            if self._journal is not None:
+                self._journal.salvar(combate)
+            elif self._sqlite is not None:
+                self._sqlite.salvar_combate(combate.to_dict())
+            elif self.usar_pickle:
                 with open(caminho, 'wb') as arquivo:
                     pickle.dump(combate, arquivo)
             else:
@@ -224,6 +694,36 @@ class BancoDados:
         Returns:
             The loaded combat if found, None otherwise
         """
+        if self._journal is not None:
+            try:
+                registro = self._journal.ler(combate_id)
+                if registro is None:
+                    return None
+                data, estado = registro
+                combate = self._combate_de_dados(data)
+                if combate is not None and estado is not None:
+                    # Fighters' HP and resources as of the last saved action
+                    combate.restaurar_estado(estado)
+                return combate
+            except Exception as e:
+                print(f"Erro ao carregar combate: {e}")
+                return None
+        
+        if self._sqlite is not None:
+            try:
+                data = self._sqlite.carregar_combate(combate_id)
+                if data is None:
+                    return None
+                # Combats migrated from a journal keep their last snapshot
+                estado = data.pop("estado", None)
+                combate = self._combate_de_dados(data)
+                if combate is not None and estado is not None:
+                    combate.restaurar_estado(estado)
+                return combate
+            except Exception as e:
+                print(f"Erro ao carregar combate: {e}")
+                return None
+        
         caminho = self._obter_caminho_combate(combate_id)
         
         if not os.path.exists(caminho):
@@ -235,20 +735,31 @@ class BancoDados:
                     return pickle.load(arquivo)
             else:
                 with open(caminho, 'r', encoding='utf-8') as arquivo:
-                    data = json.load(arquivo)
-                    # Load the characters first
-                    personagem1 = self.carregar_personagem(data["personagem1"]["id"])
-                    personagem2 = self.carregar_personagem(data["personagem2"]["id"])
-                    
-                    if not personagem1 or not personagem2:
-                        return None
-                    
-                    # Create and configure the combat
-                    return Combate.from_dict(data, personagem1, personagem2)
+                    return self._combate_de_dados(json.load(arquivo))
         except Exception as e:
             print(f"Erro ao carregar combate: {e}")
             return None
     
+    def _combate_de_dados(self, data: Dict[str, Any]) -> Optional[Combate]:
+        """
+        Rebuild a combat from its dictionary
+        
+        Args:
+            data: Combat data dictionary
+            
+        Returns:
+            The combat, or None if one of its characters is missing
+        """
+        # Load the characters first
+        personagem1 = self.carregar_personagem(data["personagem1"]["id"])
+        personagem2 = self.carregar_personagem(data["personagem2"]["id"])
+        
+        if not personagem1 or not personagem2:
+            return None
+        
+        # Create and configure the combat
+        return Combate.from_dict(data, personagem1, personagem2)
+    
     def excluir_combate(self, combate_id: str) -> bool:
         """
         Delete a combat file
@@ -259,6 +770,20 @@ class BancoDados:
         Returns:
             True if successful, False otherwise
         """
+        if self._journal is not None:
+            try:
+                return self._journal.excluir(combate_id)
+            except Exception as e:
+                print(f"Erro ao excluir combate: {e}")
+                return False
+        
+        if self._sqlite is not None:
+            try:
+                return self._sqlite.excluir_combate(combate_id)
+            except Exception as e:
+                print(f"Erro ao excluir combate: {e}")
+                return False
+        
         caminho = self._obter_caminho_combate(combate_id)
         
         if not os.path.exists(caminho):
@@ -271,12 +796,15 @@ class BancoDados:
             print(f"Erro ao excluir combate: {e}")
             return False
     
-    def salvar_historico_combate(self, combate: Combate) -> bool:
+    def salvar_historico_combate(self, combate: Combate, bots: Sequence[Personagem] = ()) -> bool:
         """
         Save a combat to history
         
         Args:
             combate: Finished combat to save
+            bots: Participants controlled by the AI; they are not stored
+                  characters, so their summary has "bot": True and no ID and
+                  they stay out of the per-character history and the roster
             
         Returns:
             True if successful, False otherwise
@@ -284,41 +812,44 @@ class BancoDados:
         if not combate.finalizado:
             return False
         
-        caminho = self._obter_caminho_historico(combate.id)
+        registrado_em = time.time()
+        
+        def participante(personagem: Personagem) -> Dict[str, Any]:
+            dados = {"id": personagem.id, "nome": personagem.nome, "classe": personagem.classe}
+            if any(personagem is bot for bot in bots):
+                dados["id"] = None
+                dados["bot"] = True
+            return dados
         
         # Create a summary of the combat
         resumo = {
             "id": combate.id,
-            "data": None,  # Would be datetime.now() in real implementation
-            "personagem1": {
-                "id": combate.personagem1.id,
-                "nome": combate.personagem1.nome,
-                "classe": combate.personagem1.classe
-            },
-            "personagem2": {
-                "id": combate.personagem2.id,
-                "nome": combate.personagem2.nome,
-                "classe": combate.personagem2.classe
-            },
-            "vencedor": {
-                "id": combate.vencedor.id,
-                "nome": combate.vencedor.nome,
-                "classe": combate.vencedor.classe
-            } if combate.vencedor else None,
+            "data": datetime.fromtimestamp(registrado_em).strftime("%d/%m/%Y %H:%M"),
+            "registrado_em": registrado_em,
+            "personagem1": participante(combate.personagem1),
+            "personagem2": participante(combate.personagem2),
+            "vencedor": participante(combate.vencedor) if combate.vencedor else None,
             "turnos": combate.turno_atual,
             "log": combate.log_combate
         }
         
         try:
-            if self.usar_pickle:
-                with open(caminho, 'wb') as arquivo:
-                    pickle.dump(resumo, arquivo)
+            if self._sqlite is not None:
+                # History entry and combat removal commit together
+                with self._sqlite.transacao():
+                    self._sqlite.salvar_historico(resumo)
+                    self._sqlite.excluir_combate(combate.id)
             else:
-                with open(caminho, 'w', encoding='utf-8') as arquivo:
-                    json.dump(resumo, arquivo, ensure_ascii=False, indent=2)
+                self._log_historico.anexar(resumo)
+                
+                # After saving to history, remove from active combats
+                self.excluir_combate(combate.id)
             
-            # After saving to history, remove from active combats
-            self.excluir_combate(combate.id)
+            vencedor_id = combate.vencedor.id if combate.vencedor else None
+            self._elenco_aplicar(
+                lambda elenco: elenco.registrar_combate(combate.personagem1.id, combate.personagem2.id,
+                                                        vencedor_id),
+                combate_id=combate.id)
             return True
         except Exception as e:
             print(f"Erro ao salvar histórico de combate: {e}")
@@ -329,7 +860,181 @@ class BancoDados:
         Load all combat history
         
         Returns:
-            List of all combat history entries
+            List of all combat history entries (legacy files first, then
+            the log in the order fights were recorded)
+        """
+        if self._sqlite is not None:
+            return self._sqlite.carregar_historico()
+        
+        return self._carregar_historico_legado() + self._log_historico.ler(list(self._log_historico.entradas()))
+    
+    def carregar_ultimos_combates(self, quantidade: int) -> List[Dict[str, Any]]:
+        """
+        Load the most recent fights from history
+        
+        Args:
+            quantidade: Maximum number of fights
+            
+        Returns:
+            Combat history entries, newest first
+        """
+        if self._sqlite is not None:
+            return self._sqlite.carregar_historico_recente(quantidade)
+        return self._log_historico.ultimos(quantidade)
+    
+    def carregar_historico_personagem(self, personagem_id: str,
+                                      limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Load the fights a character took part in
+        
+        Args:
+            personagem_id: Character ID
+            limite: Maximum number of fights (None for all)
+            
+        Returns:
+            Combat history entries, newest first
+        """
+        if self._sqlite is not None:
+            return self._sqlite.carregar_historico_personagem(personagem_id, limite)
+        return self._log_historico.por_personagem(personagem_id, limite)
+    
+    def carregar_historico_desde(self, registrado_em: float) -> List[Dict[str, Any]]:
+        """
+        Load the fights recorded at or after a moment
+        
+        Args:
+            registrado_em: Timestamp in seconds since the epoch
+            
+        Returns:
+            Combat history entries, oldest first
+        """
+        if self._sqlite is not None:
+            return self._sqlite.carregar_historico_desde(registrado_em)
+        return self._log_historico.desde(registrado_em)
+    
+    def consultar_historico(self, personagem_id: Optional[str] = None, classe: Optional[str] = None,
+                            vencedor_id: Optional[str] = None, turnos_min: Optional[int] = None,
+                            turnos_max: Optional[int] = None, ordem: str = "desc",
+                            cursor: Optional[int] = None, limite: int = 50,
+                            incluir_log: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Query combat history one page at a time
+        
+        Filtering, ordering and pagination happen on the history log's
+        offset index (or the SQLite historico table), so only the records of
+        the requested page are read and decoded. Fights are ordered by the
+        position they were appended to the log, and the cursor is that
+        position (the seq column with SQLite).
+        
+        Legacy one-file-per-fight entries are only included once
+        migrar_historico.py has moved them into the log. They are appended
+        oldest first after the fights already in the log, so they get new
+        positions: cursors taken before the migration still page through the
+        older entries correctly, and the migrated fights show up as the
+        newest ones in descending order.
+        
+        Args:
+            personagem_id: Only fights this character took part in
+            classe: Only fights with a character of this class
+            vencedor_id: Only fights won by this character
+            turnos_min: Minimum number of turns
+            turnos_max: Maximum number of turns
+            ordem: "desc" for newest first, "asc" for oldest first
+            cursor: The "cursor" of the last entry of the previous page
+            limite: Maximum number of entries in the page
+            incluir_log: Whether to keep each fight's full combat log
+            
+        Yields:
+            Combat history entries, each with a "cursor" field
+        """
+        if ordem not in ("asc", "desc"):
+            raise ValueError(f"Ordem inválida: {ordem}")
+        
+        consulta = self._sqlite.consultar_historico if self._sqlite is not None else self._log_historico.consultar
+        
+        for posicao, resumo in consulta(personagem_id, classe, vencedor_id, turnos_min, turnos_max,
+                                        ordem == "desc", cursor, limite):
+            if not incluir_log:
+                resumo.pop("log", None)
+            resumo["cursor"] = posicao
+            yield resumo
+    
+    def migrar_historico_legado(self) -> int:
+        """
+        Move one-file-per-fight history entries into the history log
+        
+        Run once with migrar_historico.py. Files are appended oldest first,
+        and each file is removed only after its entry was appended. The run
+        holds the log's lock and skips fights whose ID is already in the
+        log, so it can be resumed if interrupted and concurrent runs never
+        append the same fight twice.
+        
+        Returns:
+            Number of migrated entries
+        """
+        if self._log_historico is None:
+            return 0
+        
+        migrados = 0
+        with self._log_historico.travar():
+            registrados = {entrada.id for entrada in self._log_historico.entradas()}
+            for caminho in self._arquivos_historico_legado():
+                try:
+                    if self.usar_pickle:
+                        with open(caminho, 'rb') as arquivo_hist:
+                            resumo = pickle.load(arquivo_hist)
+                    else:
+                        with open(caminho, 'r', encoding='utf-8') as arquivo_hist:
+                            resumo = json.load(arquivo_hist)
+                    # Legacy entries carry no date; use the file's modification time
+                    registrado_em = os.path.getmtime(caminho)
+                except FileNotFoundError:
+                    # Already moved by another run
+                    continue
+                except Exception as e:
+                    print(f"Erro ao migrar histórico: {e}")
+                    continue
+                
+                try:
+                    if resumo["id"] not in registrados:
+                        resumo.setdefault("registrado_em", registrado_em)
+                        self._log_historico.anexar(resumo)
+                        registrados.add(resumo["id"])
+                        migrados += 1
+                    os.remove(caminho)
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    print(f"Erro ao migrar histórico: {e}")
+        
+        return migrados
+    
+    def _arquivos_historico_legado(self) -> List[str]:
+        """
+        List the one-file-per-fight history entries
+        
+        Returns:
+            Paths of the legacy files, oldest first
+        """
+        ext = ".pkl" if self.usar_pickle else ".json"
+        caminhos = []
+        for arquivo in os.listdir(self.historico_dir):
+            if not arquivo.endswith(ext):
+                continue
+            caminho = os.path.join(self.historico_dir, arquivo)
+            try:
+                caminhos.append((os.path.getmtime(caminho), caminho))
+            except FileNotFoundError:
+                # Removed by a migration running in another process
+                continue
+        return [caminho for _, caminho in sorted(caminhos)]
+    
+    def _carregar_historico_legado(self) -> List[Dict[str, Any]]:
+        """
+        Load history entries saved as one file per fight
+        
+        Returns:
+            List of legacy combat history entries
         """
         historico = []
         
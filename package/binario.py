@@ -0,0 +1,447 @@
+"""
+Binary serialization module for the Medieval Fantasy Battle Simulator.
+Encodes Personagem.to_dict and Combate.to_dict payloads in a compact,
+versioned binary layout as an alternative to JSON and pickle.
+"""
+
+import struct
+import uuid
+from typing import Dict, Any, List
+
+
+# Every payload starts with MAGIA + version byte + kind byte
+MAGIA = b"MB"
+VERSAO_FORMATO = 1
+
+TIPO_PERSONAGEM = 1
+TIPO_COMBATE = 2
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _STR_DICIONARIO, _STR_REPETIDA, \
+    _LISTA, _DICT, _UUID, _HABILIDADE, _AUSENTE, _PERSONAGEM = range(14)
+
+# Field order of each record kind. Fields are written without their keys;
+# keys outside the schema are appended as an extra dictionary.
+CLASSES = ["Guerreiro", "Mago", "Arqueiro"]
+_CLASSE_DESCONHECIDA = 255
+
+CAMPOS_PERSONAGEM = [
+    "id", "nome", "nivel", "experiencia", "vida_maxima", "vida_atual",
+    "forca", "destreza", "inteligencia", "constituicao", "owner_id",
+    "habilidades", "inventario", "equipamentos", "estado_defesa"
+]
+CAMPOS_CLASSE = {
+    "Guerreiro": ["furia", "furia_maxima", "is_berserk",
+                  "berserk_damage_multiplier", "berserk_defense_penalty"],
+    "Mago": ["mana", "mana_maxima", "elemento_ativo", "elemental_damage_multiplier"],
+    "Arqueiro": ["stamina", "stamina_maxima", "municao", "flechas_especiais",
+                 "critical_hit_chance", "critical_damage_multiplier", "last_attack_was_critical"]
+}
+CAMPOS_COMBATE = [
+    "id", "personagem1", "personagem2", "turno_atual", "personagem_ativo",
+    "finalizado", "vencedor", "log_combate"
+]
+
+# Ability-ID dictionary: catalog ability IDs are stored as an index into
+# this list. Frozen for format version 1; changes need a new version.
+HABILIDADES_V1 = [
+    "golpe_poderoso", "provocar", "postura_defensiva",
+    "bola_de_fogo", "raio_de_gelo", "barreira_arcana", "mudar_elemento",
+    "tiro_certeiro", "chuva_de_flechas", "flecha_perfurante", "evasao"
+]
+
+# Common strings stored as a one-byte index. Frozen for format version 1.
+STRINGS_V1 = [
+    # Record keys
+    "id", "nome", "classe", "nivel", "experiencia", "vida_maxima", "vida_atual",
+    "forca", "destreza", "inteligencia", "constituicao", "owner_id", "habilidades",
+    "inventario", "equipamentos", "estado_defesa", "descricao", "custo", "tipo",
+    "multiplicador", "elemento", "efeito", "duracao", "quantidade", "valor",
+    # Equipment slots, classes and elements
+    "arma", "armadura", "acessorio", "Guerreiro", "Mago", "Arqueiro",
+    "fogo", "gelo", "raio", "arcano",
+    # Ability and item types
+    "ataque", "defesa", "utilidade", "consumivel", "habilidade",
+    # Combat log keys
+    "turno", "acao", "atacante", "defensor", "dano", "vida_restante_defensor",
+    "usuario", "resultado", "sucesso", "mensagem", "reducao_dano", "alvo",
+    "dano_base", "dano_final", "critico", "desconhecida"
+]
+
+_INDICE_STRINGS = {texto: i for i, texto in enumerate(STRINGS_V1)}
+_INDICE_HABILIDADES = {habilidade_id: i for i, habilidade_id in enumerate(HABILIDADES_V1)}
+
+# Strings shorter than this are written inline instead of being remembered
+# for back-references
+_TAMANHO_MINIMO_REPETICAO = 4
+
+_DOUBLE = struct.Struct("<d")
+_CABECALHO = struct.Struct("<2sBB")
+
+class _Codificador:
+    """Writes tagged values into a growing buffer"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self._repeticoes: Dict[str, int] = {}
+
+    def varint(self, valor: int) -> None:
+        """Write a non-negative integer in LEB128 form"""
+        buffer = self.buffer
+        while valor >= 0x80:
+            buffer.append((valor & 0x7F) | 0x80)
+            valor >>= 7
+        buffer.append(valor)
+
+    def texto(self, valor: str) -> None:
+        """Write a string, using the dictionary or a back-reference when possible"""
+        buffer = self.buffer
+        indice = _INDICE_STRINGS.get(valor)
+        if indice is not None:
+            buffer.append(_STR_DICIONARIO)
+            buffer.append(indice)
+            return
+
+        anterior = self._repeticoes.get(valor)
+        if anterior is not None:
+            buffer.append(_STR_REPETIDA)
+            self.varint(anterior)
+            return
+
+        if len(valor) == 36:
+            try:
+                uid = uuid.UUID(valor)
+            except ValueError:
+                uid = None
+            if uid is not None and str(uid) == valor:
+                buffer.append(_UUID)
+                buffer += uid.bytes
+                self._repeticoes[valor] = len(self._repeticoes)
+                return
+
+        dados = valor.encode("utf-8")
+        buffer.append(_STR)
+        self.varint(len(dados))
+        buffer += dados
+        if len(valor) >= _TAMANHO_MINIMO_REPETICAO:
+            self._repeticoes[valor] = len(self._repeticoes)
+
+    def valor(self, valor: Any) -> None:
+        """Write any JSON-compatible value"""
+        buffer = self.buffer
+        if valor is None:
+            buffer.append(_NONE)
+        elif valor is True:
+            buffer.append(_TRUE)
+        elif valor is False:
+            buffer.append(_FALSE)
+        elif isinstance(valor, int):
+            if not -(1 << 63) <= valor < (1 << 63):
+                raise ValueError(f"Inteiro fora do intervalo de 64 bits: {valor}")
+            buffer.append(_INT)
+            # Zigzag so small negative numbers stay small
+            self.varint((valor << 1) ^ (valor >> 63))
+        elif isinstance(valor, float):
+            buffer.append(_FLOAT)
+            buffer += _DOUBLE.pack(valor)
+        elif isinstance(valor, str):
+            self.texto(valor)
+        elif isinstance(valor, (list, tuple)):
+            buffer.append(_LISTA)
+            self.varint(len(valor))
+            for item in valor:
+                self.valor(item)
+        elif isinstance(valor, dict):
+            buffer.append(_DICT)
+            self.varint(len(valor))
+            for chave, item in valor.items():
+                self.texto(str(chave))
+                self.valor(item)
+        else:
+            raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+    def habilidades(self, habilidades: Any) -> None:
+        """Write an ability list, replacing catalog IDs by their dictionary index"""
+        if not isinstance(habilidades, list):
+            self.valor(habilidades)
+            return
+
+        buffer = self.buffer
+        buffer.append(_LISTA)
+        self.varint(len(habilidades))
+        for habilidade in habilidades:
+            indice = _INDICE_HABILIDADES.get(habilidade) if isinstance(habilidade, str) else None
+            if indice is not None:
+                buffer.append(_HABILIDADE)
+                self.varint(indice)
+            else:
+                self.valor(habilidade)
+
+    def registro(self, data: Dict[str, Any], campos: List[str]) -> None:
+        """Write schema fields in order, then any extra keys"""
+        for campo in campos:
+            if campo not in data:
+                self.buffer.append(_AUSENTE)
+            elif campo == "habilidades":
+                self.habilidades(data[campo])
+            else:
+                self.valor(data[campo])
+
+        extras = {chave: item for chave, item in data.items() if chave not in campos and chave != "classe"}
+        self.valor(extras)
+
+    def personagem(self, data: Dict[str, Any]) -> None:
+        """Write a character record (class code, schema fields, extras)"""
+        classe = data["classe"]
+        if classe in CAMPOS_CLASSE:
+            self.buffer.append(CLASSES.index(classe))
+        else:
+            self.buffer.append(_CLASSE_DESCONHECIDA)
+            self.texto(classe)
+        self.registro(data, CAMPOS_PERSONAGEM + CAMPOS_CLASSE.get(classe, []))
+
+
+class _Decodificador:
+    """Reads tagged values from a buffer"""
+
+    def __init__(self, dados: bytes):
+        self.dados = dados
+        self.posicao = 0
+        self._repeticoes: List[str] = []
+
+    def byte(self) -> int:
+        """Read one byte"""
+        valor = self.dados[self.posicao]
+        self.posicao += 1
+        return valor
+
+    def varint(self) -> int:
+        """Read a LEB128 integer"""
+        dados = self.dados
+        byte = dados[self.posicao]
+        self.posicao += 1
+        if byte < 0x80:
+            return byte
+
+        resultado = byte & 0x7F
+        deslocamento = 7
+        while True:
+            byte = dados[self.posicao]
+            self.posicao += 1
+            resultado |= (byte & 0x7F) << deslocamento
+            if byte < 0x80:
+                return resultado
+            deslocamento += 7
+
+    def valor(self) -> Any:
+        """Read any tagged value"""
+        tag = self.dados[self.posicao]
+        self.posicao += 1
+        if tag >= len(self._leitores):
+            raise ValueError(f"Tag binária inválida: {tag}")
+        return self._leitores[tag](self)
+
+    def _ler_int(self) -> int:
+        bruto = self.varint()
+        return (bruto >> 1) ^ -(bruto & 1)
+
+    def _ler_float(self) -> float:
+        valor = _DOUBLE.unpack_from(self.dados, self.posicao)[0]
+        self.posicao += 8
+        return valor
+
+    def _ler_str(self) -> str:
+        tamanho = self.varint()
+        inicio = self.posicao
+        self.posicao += tamanho
+        valor = str(self.dados[inicio:self.posicao], "utf-8")
+        if len(valor) >= _TAMANHO_MINIMO_REPETICAO:
+            self._repeticoes.append(valor)
+        return valor
+
+    def _ler_str_dicionario(self) -> str:
+        indice = self.dados[self.posicao]
+        self.posicao += 1
+        return STRINGS_V1[indice]
+
+    def _ler_str_repetida(self) -> str:
+        return self._repeticoes[self.varint()]
+
+    def _ler_uuid(self) -> str:
+        inicio = self.posicao
+        self.posicao += 16
+        valor = str(uuid.UUID(bytes=bytes(self.dados[inicio:self.posicao])))
+        self._repeticoes.append(valor)
+        return valor
+
+    def _ler_lista(self) -> List[Any]:
+        valor = self.valor
+        return [valor() for _ in range(self.varint())]
+
+    def _ler_dict(self) -> Dict[str, Any]:
+        valor = self.valor
+        resultado = {}
+        for _ in range(self.varint()):
+            chave = valor()
+            resultado[chave] = valor()
+        return resultado
+
+    def _ler_habilidade(self) -> str:
+        return HABILIDADES_V1[self.varint()]
+
+    def _ler_personagem_aninhado(self) -> Dict[str, Any]:
+        return self.personagem()
+
+    # Reader for each tag, indexed by the tag value
+    _leitores = [
+        lambda self: None,              # _NONE
+        lambda self: False,             # _FALSE
+        lambda self: True,              # _TRUE
+        _ler_int,                       # _INT
+        _ler_float,                     # _FLOAT
+        _ler_str,                       # _STR
+        _ler_str_dicionario,            # _STR_DICIONARIO
+        _ler_str_repetida,              # _STR_REPETIDA
+        _ler_lista,                     # _LISTA
+        _ler_dict,                      # _DICT
+        _ler_uuid,                      # _UUID
+        _ler_habilidade,                # _HABILIDADE
+        lambda self: _AUSENTE_VALOR,    # _AUSENTE
+        _ler_personagem_aninhado,       # _PERSONAGEM
+    ]
+
+    def registro(self, campos: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+        """Read schema fields in order, then the extra keys"""
+        for campo in campos:
+            valor = self.valor()
+            if valor is not _AUSENTE_VALOR:
+                data[campo] = valor
+        data.update(self.valor())
+        return data
+
+    def personagem(self) -> Dict[str, Any]:
+        """Read a character record"""
+        codigo = self.byte()
+        classe = self.valor() if codigo == _CLASSE_DESCONHECIDA else CLASSES[codigo]
+        return self.registro(CAMPOS_PERSONAGEM + CAMPOS_CLASSE.get(classe, []), {"classe": classe})
+
+
+# Marker returned for schema fields that were missing from the encoded dict
+_AUSENTE_VALOR = object()
+
+
+def _ler_cabecalho(dados: bytes) -> int:
+    """Validate the header and get the record kind"""
+    if len(dados) < _CABECALHO.size:
+        raise ValueError("Dados binários truncados")
+    magia, versao, tipo = _CABECALHO.unpack_from(dados, 0)
+    if magia != MAGIA:
+        raise ValueError("Dados binários inválidos")
+    if versao != VERSAO_FORMATO:
+        raise ValueError(f"Versão de formato não suportada: {versao}")
+    return tipo
+
+
+def _decodificar_corpo(dados: bytes, ler) -> Dict[str, Any]:
+    """Run a record reader after the header, reporting corrupt data as ValueError"""
+    decodificador = _Decodificador(memoryview(dados))
+    decodificador.posicao = _CABECALHO.size
+    try:
+        return ler(decodificador)
+    except (IndexError, KeyError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Dados binários corrompidos: {e}") from None
+
+
+def codificar_personagem(data: Dict[str, Any]) -> bytes:
+    """
+    Encode a character dictionary
+
+    Args:
+        data: Dictionary from Personagem.to_dict
+
+    Returns:
+        Binary payload
+    """
+    codificador = _Codificador()
+    codificador.buffer += _CABECALHO.pack(MAGIA, VERSAO_FORMATO, TIPO_PERSONAGEM)
+    codificador.personagem(data)
+    return bytes(codificador.buffer)
+
+
+def codificar_combate(data: Dict[str, Any]) -> bytes:
+    """
+    Encode a combat dictionary
+
+    The embedded characters use the character schema, and later repeats
+    of their IDs (active character, winner) become back-references.
+
+    Args:
+        data: Dictionary from Combate.to_dict
+
+    Returns:
+        Binary payload
+    """
+    codificador = _Codificador()
+    codificador.buffer += _CABECALHO.pack(MAGIA, VERSAO_FORMATO, TIPO_COMBATE)
+
+    for campo in CAMPOS_COMBATE:
+        if campo not in data:
+            codificador.buffer.append(_AUSENTE)
+        elif campo in ("personagem1", "personagem2") and isinstance(data[campo], dict):
+            codificador.buffer.append(_PERSONAGEM)
+            codificador.personagem(data[campo])
+        else:
+            codificador.valor(data[campo])
+    codificador.valor({chave: item for chave, item in data.items() if chave not in CAMPOS_COMBATE})
+
+    return bytes(codificador.buffer)
+
+
+def decodificar_personagem(dados: bytes) -> Dict[str, Any]:
+    """
+    Decode a character payload
+
+    Args:
+        dados: Bytes produced by codificar_personagem
+
+    Returns:
+        Character dictionary, ready for the class's from_dict
+    """
+    tipo = _ler_cabecalho(dados)
+    if tipo != TIPO_PERSONAGEM:
+        raise ValueError("Os dados não são de um personagem")
+    return _decodificar_corpo(dados, _Decodificador.personagem)
+
+
+def decodificar_combate(dados: bytes) -> Dict[str, Any]:
+    """
+    Decode a combat payload
+
+    Args:
+        dados: Bytes produced by codificar_combate
+
+    Returns:
+        Combat dictionary, ready for Combate.from_dict
+    """
+    tipo = _ler_cabecalho(dados)
+    if tipo != TIPO_COMBATE:
+        raise ValueError("Os dados não são de um combate")
+    return _decodificar_corpo(dados, lambda decodificador: decodificador.registro(CAMPOS_COMBATE, {}))
+
+
+def decodificar(dados: bytes) -> Dict[str, Any]:
+    """
+    Decode a character or combat payload, whichever it holds
+
+    Args:
+        dados: Binary payload
+
+    Returns:
+        The decoded dictionary
+    """
+    tipo = _ler_cabecalho(dados)
+    if tipo == TIPO_PERSONAGEM:
+        return decodificar_personagem(dados)
+    if tipo == TIPO_COMBATE:
+        return decodificar_combate(dados)
+    raise ValueError(f"Tipo de registro desconhecido: {tipo}")
@@ -0,0 +1,259 @@
+"""
+Exact matchup analysis module for the Medieval Fantasy Battle Simulator.
+Computes win/draw probabilities and expected fight length by dynamic
+programming over the combat state instead of sampling fights.
+"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+from package.personagens.base import Personagem
+from package.combate import MAX_TURNOS_SIMULACAO
+from package.modelo_combate import ModeloAtaque, probabilidade_primeiro
+
+
+# Default cap on the DP table; about 400 bytes per state, so ~400 MB at most
+MAX_ESTADOS = 1_000_000
+
+
+class ProbabilidadesConfronto(NamedTuple):
+    """
+    Outcome distribution of a matchup.
+
+    exato is False when the state cap was hit and the values are a
+    Monte Carlo estimate instead.
+    """
+    vitoria1: float
+    vitoria2: float
+    empate: float
+    turnos_esperados: float
+    exato: bool = True
+
+
+class LimiteEstadosExcedido(RuntimeError):
+    """
+    Raised when the DP table would grow past CalculadoraExata.max_estados.
+    """
+
+
+# (vida1, vida2, furia1, berserk1, municao1, furia2, berserk2, municao2, ativo1, turno)
+_Estado = Tuple[int, int, int, bool, int, int, bool, int, bool, int]
+
+
+class CalculadoraExata:
+    """
+    Dynamic programming engine for the attack-only policy.
+
+    The only randomness in such a fight is the initiative roll and the
+    archers' critical rolls, so every reachable state can be enumerated.
+    Results for each state are memoized, which keeps queries in the
+    millisecond range for the stock classes. The number of states grows
+    with HP and with the archers' critical branches, so the table is
+    capped at max_estados.
+    """
+
+    def __init__(self, personagem1: Personagem, personagem2: Personagem,
+                 max_turnos: int = MAX_TURNOS_SIMULACAO,
+                 max_estados: Optional[int] = MAX_ESTADOS):
+        """
+        Build the engine from the characters' current state
+
+        Args:
+            personagem1: First character
+            personagem2: Second character
+            max_turnos: Turn limit; reaching it is a draw
+            max_estados: Most states the table may hold (None for no cap)
+        """
+        if max_estados is not None and max_estados <= 0:
+            raise ValueError("O limite de estados deve ser positivo")
+        self.modelo1 = ModeloAtaque(personagem1)
+        self.modelo2 = ModeloAtaque(personagem2)
+        self.max_turnos = max_turnos
+        self.max_estados = max_estados
+        self._memo: Dict[_Estado, ProbabilidadesConfronto] = {}
+
+    @property
+    def estados_explorados(self) -> int:
+        """Number of distinct states evaluated so far"""
+        return len(self._memo)
+
+    def _ramos_ataque(self, modelo: ModeloAtaque):
+        """Get (probability, critical) pairs for one basic attack"""
+        if modelo.classe != "Arqueiro" or modelo.critico_max == 0:
+            return ((1.0, False),)
+        if modelo.critico_max >= 100:
+            return ((1.0, True),)
+        chance = modelo.chance_critico
+        return ((chance, True), (1.0 - chance, False))
+
+    def _ramos(self, estado: _Estado):
+        """
+        Get the outcomes of the active character's attack from a state
+
+        Returns:
+            List of (probability, winner, next state): winner is 1 or 2 when
+            the attack ends the fight (next state None), else None
+        """
+        vida1, vida2, furia1, berserk1, municao1, furia2, berserk2, municao2, ativo1, turno = estado
+
+        # The turn counter advances after the second character acts
+        proximo_turno = turno if ativo1 else turno + 1
+        modelo = self.modelo1 if ativo1 else self.modelo2
+
+        ramos = []
+        for probabilidade, critico in self._ramos_ataque(modelo):
+            if ativo1:
+                dano = modelo.dano(furia1, berserk1, municao1, critico)
+                n_furia1, n_berserk1, n_municao1 = modelo.apos_ataque(furia1, berserk1, municao1)
+                n_furia2, n_berserk2, n_municao2 = furia2, berserk2, municao2
+                n_vida1, n_vida2 = vida1, max(0, vida2 - dano)
+            else:
+                dano = modelo.dano(furia2, berserk2, municao2, critico)
+                n_furia2, n_berserk2, n_municao2 = modelo.apos_ataque(furia2, berserk2, municao2)
+                n_furia1, n_berserk1, n_municao1 = furia1, berserk1, municao1
+                n_vida1, n_vida2 = max(0, vida1 - dano), vida2
+
+            # Same order as Combate._verificar_fim_combate
+            if n_vida1 <= 0:
+                ramos.append((probabilidade, 2, None))
+            elif n_vida2 <= 0:
+                ramos.append((probabilidade, 1, None))
+            else:
+                ramos.append((probabilidade, None, (n_vida1, n_vida2, n_furia1, n_berserk1, n_municao1,
+                                                    n_furia2, n_berserk2, n_municao2, not ativo1, proximo_turno)))
+        return ramos
+
+    def _avaliar(self, estado: _Estado) -> ProbabilidadesConfronto:
+        """
+        Get the outcome distribution from a state (memoized)
+
+        The table is filled with an explicit stack instead of recursion: a
+        fight takes about two states per turn, so recursing would hit
+        Python's recursion limit for large max_turnos.
+
+        Raises:
+            LimiteEstadosExcedido: If the table would exceed max_estados
+        """
+        memo = self._memo
+        max_estados = self.max_estados
+        if estado in memo:
+            return memo[estado]
+
+        pendentes = {}
+        pilha = [estado]
+        while pilha:
+            atual = pilha[-1]
+            if atual in memo:
+                pilha.pop()
+                continue
+
+            turno = atual[-1]
+            if turno > self.max_turnos:
+                memo[atual] = ProbabilidadesConfronto(0.0, 0.0, 1.0, float(turno))
+                pilha.pop()
+                continue
+
+            ramos = pendentes.get(atual)
+            if ramos is None:
+                if max_estados is not None and len(memo) + len(pendentes) >= max_estados:
+                    # Free the partial table; the caller falls back or gives up
+                    memo.clear()
+                    raise LimiteEstadosExcedido(
+                        f"O cálculo exato passou de {max_estados} estados")
+                ramos = pendentes[atual] = self._ramos(atual)
+                # Evaluate the successors first; this state is combined on its next visit
+                faltando = [proximo for _, _, proximo in ramos if proximo is not None and proximo not in memo]
+                if faltando:
+                    pilha.extend(faltando)
+                    continue
+
+            # The counter is the same on every ending branch of this state
+            proximo_turno = turno if atual[8] else turno + 1
+            vitoria1 = vitoria2 = empate = turnos = 0.0
+            for probabilidade, vencedor, proximo in ramos:
+                if vencedor == 1:
+                    vitoria1 += probabilidade
+                    turnos += probabilidade * proximo_turno
+                elif vencedor == 2:
+                    vitoria2 += probabilidade
+                    turnos += probabilidade * proximo_turno
+                else:
+                    ramo = memo[proximo]
+                    vitoria1 += probabilidade * ramo.vitoria1
+                    vitoria2 += probabilidade * ramo.vitoria2
+                    empate += probabilidade * ramo.empate
+                    turnos += probabilidade * ramo.turnos_esperados
+
+            memo[atual] = ProbabilidadesConfronto(vitoria1, vitoria2, empate, turnos)
+            del pendentes[atual]
+            pilha.pop()
+
+        return memo[estado]
+
+    def calcular(self) -> ProbabilidadesConfronto:
+        """
+        Get the exact outcome distribution of the matchup
+
+        Returns:
+            Win/draw probabilities and expected final turn counter,
+            comparable with ResultadoSimulacao.turnos
+
+        Raises:
+            LimiteEstadosExcedido: If the table would exceed max_estados
+        """
+        m1, m2 = self.modelo1, self.modelo2
+        chance_primeiro = probabilidade_primeiro(m1.destreza, m2.destreza)
+
+        vitoria1 = vitoria2 = empate = turnos = 0.0
+        for ativo1, probabilidade in ((True, chance_primeiro), (False, 1.0 - chance_primeiro)):
+            if probabilidade == 0.0:
+                continue
+            ramo = self._avaliar((m1.vida, m2.vida, m1.furia, m1.berserk, m1.municao,
+                                  m2.furia, m2.berserk, m2.municao, ativo1, 1))
+            vitoria1 += probabilidade * ramo.vitoria1
+            vitoria2 += probabilidade * ramo.vitoria2
+            empate += probabilidade * ramo.empate
+            turnos += probabilidade * ramo.turnos_esperados
+
+        return ProbabilidadesConfronto(vitoria1, vitoria2, empate, turnos)
+
+
+def calcular_probabilidades(personagem1: Personagem, personagem2: Personagem,
+                            max_turnos: int = MAX_TURNOS_SIMULACAO,
+                            max_estados: Optional[int] = MAX_ESTADOS,
+                            combates_estimativa: int = 1_000_000) -> ProbabilidadesConfronto:
+    """
+    Compute the exact outcome distribution of a matchup
+
+    Uses the same rules as Combate.simular with politica_ataque,
+    starting from the characters' current state. Matchups that need more
+    than max_estados states (large HP, archers on both sides) fall back to
+    package.monte_carlo.estimar_confronto, which needs NumPy.
+
+    Args:
+        personagem1: First character
+        personagem2: Second character
+        max_turnos: Turn limit; reaching it is a draw
+        max_estados: Most DP states before falling back (None for no cap)
+        combates_estimativa: Fights simulated by the fallback
+
+    Returns:
+        Win/draw probabilities and expected turn count; exato is False
+        when they come from the fallback
+
+    Raises:
+        LimiteEstadosExcedido: If the cap is hit and NumPy is not installed
+    """
+    try:
+        return CalculadoraExata(personagem1, personagem2, max_turnos, max_estados).calcular()
+    except LimiteEstadosExcedido as limite:
+        try:
+            from package.monte_carlo import estimar_confronto
+        except ImportError:
+            raise limite
+
+    estimativa = estimar_confronto(personagem1, personagem2, combates_estimativa,
+                                   max_turnos=max_turnos)
+    return ProbabilidadesConfronto(estimativa.probabilidade_vitoria1,
+                                   estimativa.probabilidade_vitoria2,
+                                   estimativa.probabilidade_empate,
+                                   estimativa.turnos_medios,
+                                   exato=False)
@@ -3,29 +3,77 @@ Combat system module for the Medieval Fantasy Battle Simulator.
 Handles battle mechanics, turns, and action resolution.
 """
 
+import copy
 import uuid
 import random
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Union, Callable, NamedTuple, Sequence, Tuple
 from package.personagens.base import Personagem
 
 
+# Action identifiers understood by the headless simulation.
+# Any other string returned by a policy is treated as an ability ID.
+ACAO_ATACAR = "atacar"
+ACAO_DEFENDER = "defender"
+
+# Turn limit for headless fights; reaching it ends the fight in a draw
+MAX_TURNOS_SIMULACAO = 100
+
+
+class ResultadoSimulacao(NamedTuple):
+    """
+    Compact outcome of a headless fight.
+    
+    vencedor is 1 or 2 for the winning side, or 0 for a draw
+    (turn limit reached).
+    """
+    vencedor: int
+    turnos: int
+    vida_personagem1: int
+    vida_personagem2: int
+
+
+# A policy receives the combat and the active character and returns
+# ACAO_ATACAR, ACAO_DEFENDER or an ability ID
+Politica = Callable[['Combate', Personagem], str]
+
+
+def politica_ataque(combate: 'Combate', personagem: Personagem) -> str:
+    """Policy that always uses the basic attack"""
+    return ACAO_ATACAR
+
+
+def politica_aleatoria(combate: 'Combate', personagem: Personagem) -> str:
+    """Policy that picks uniformly among attack, defense and every ability"""
+    opcoes = [ACAO_ATACAR, ACAO_DEFENDER]
+    opcoes.extend(personagem.ids_habilidades)
+    return combate.rng.choice(opcoes)
+
+
 class Combate:
     """
     Class that manages combat between two characters,
     handling turns, actions, and battle resolution.
     """
     
-    def __init__(self, personagem1: Personagem, personagem2: Personagem):
+    def __init__(self, personagem1: Personagem, personagem2: Personagem,
+                 rng: Optional[random.Random] = None, semente: Optional[int] = None):
         """
         Initialize a new combat session between two characters
         
+        Every random draw of the fight (initiative, critical hits, stealth
+        detection) comes from a single per-combat generator, so a fight
+        started with the same seed and actions replays bit-for-bit.
+        
         Args:
             personagem1: First character
             personagem2: Second character
+            rng: Random generator for the fight (takes precedence over semente)
+            semente: Seed for a new generator when rng is not given
         """
         self.id = str(uuid.uuid4())
         self.personagem1 = personagem1
         self.personagem2 = personagem2
+        self.definir_rng(rng if rng is not None else random.Random(semente))
         self.turno_atual = 1
         self.personagem_ativo = self._determinar_primeiro_personagem()
         self.finalizado = False
@@ -35,6 +83,17 @@ class Combate:
         # Reset characters to battle state
         self._resetar_personagens()
     
+    def definir_rng(self, rng: random.Random) -> None:
+        """
+        Set the random generator used by the fight and both characters
+        
+        Args:
+            rng: Random generator for every roll of the fight
+        """
+        self.rng = rng
+        self.personagem1.definir_rng(rng)
+        self.personagem2.definir_rng(rng)
+    
     def _resetar_personagens(self) -> None:
         """Reset characters to their battle state"""
         # Reset defense stance
@@ -52,8 +111,8 @@ class Combate:
             The character that goes first
         """
         # Base initiative on dexterity with some randomness
-        iniciativa1 = self.personagem1.destreza + random.randint(1, 10)
-        iniciativa2 = self.personagem2.destreza + random.randint(1, 10)
+        iniciativa1 = self.personagem1.destreza + self.rng.randint(1, 10)
+        iniciativa2 = self.personagem2.destreza + self.rng.randint(1, 10)
         
         if iniciativa1 >= iniciativa2:
             return self.personagem1
@@ -203,6 +262,127 @@ class Combate:
         
         return resultado
     
+    def _executar_acao_rapida(self, acao: str) -> None:
+        """
+        Execute an action for the active character without logging it
+        or building result dictionaries (headless mode)
+        
+        Args:
+            acao: ACAO_ATACAR, ACAO_DEFENDER or an ability ID
+        """
+        ativo = self.personagem_ativo
+        alvo = self.personagem2 if ativo is self.personagem1 else self.personagem1
+        
+        if acao == ACAO_ATACAR:
+            ativo._resolver_ataque(alvo)
+            self._verificar_fim_combate()
+        elif acao == ACAO_DEFENDER:
+            ativo.set_estado_defesa(True)
+        else:
+            ativo.usar_habilidade(acao, alvo)
+            self._verificar_fim_combate()
+        
+        self._alternar_personagem_ativo()
+    
+    def simular(self, politica1: Politica = politica_ataque,
+                politica2: Optional[Politica] = None,
+                max_turnos: int = MAX_TURNOS_SIMULACAO) -> ResultadoSimulacao:
+        """
+        Play the fight to completion without logging (headless mode)
+        
+        Each policy is asked for the next action of its character until one
+        side falls or the turn limit is reached. Throughput target: at least
+        15,000 attack-only fights per second per core
+        (see benchmarks/bench_simulacao.py).
+        
+        Args:
+            politica1: Policy for the first character
+            politica2: Policy for the second character (defaults to politica1)
+            max_turnos: Turn limit; reaching it ends the fight in a draw
+            
+        Returns:
+            Compact outcome of the fight
+        """
+        if politica2 is None:
+            politica2 = politica1
+        
+        personagem1 = self.personagem1
+        while not self.finalizado and self.turno_atual <= max_turnos:
+            ativo = self.personagem_ativo
+            if ativo is personagem1:
+                acao = politica1(self, ativo)
+            else:
+                acao = politica2(self, ativo)
+            self._executar_acao_rapida(acao)
+        
+        if self.vencedor is None:
+            vencedor = 0
+        elif self.vencedor is personagem1:
+            vencedor = 1
+        else:
+            vencedor = 2
+        
+        return ResultadoSimulacao(vencedor, self.turno_atual,
+                                  personagem1.vida_atual, self.personagem2.vida_atual)
+    
+    def capturar_estado(self) -> Tuple[Any, ...]:
+        """
+        Capture the mutable state of the fight and both characters
+        
+        Intended for look-ahead search: capture, play some actions, then
+        restaurar_estado. The random generator state is not included.
+        
+        Returns:
+            Flat tuple to be passed back to restaurar_estado
+        """
+        if self.vencedor is None:
+            vencedor = 0
+        elif self.vencedor is self.personagem1:
+            vencedor = 1
+        else:
+            vencedor = 2
+        
+        return (self.turno_atual, self.personagem_ativo is self.personagem1,
+                self.finalizado, vencedor, len(self.log_combate),
+                self.personagem1.capturar_estado(), self.personagem2.capturar_estado())
+    
+    def restaurar_estado(self, estado: Sequence[Any]) -> None:
+        """
+        Restore in place a state captured by capturar_estado
+        
+        Log entries added after the capture are discarded.
+        
+        Args:
+            estado: Tuple returned by capturar_estado
+        """
+        turno, ativo1, finalizado, vencedor, tamanho_log, estado1, estado2 = estado
+        
+        self.turno_atual = turno
+        self.personagem_ativo = self.personagem1 if ativo1 else self.personagem2
+        self.finalizado = finalizado
+        if vencedor == 1:
+            self.vencedor = self.personagem1
+        elif vencedor == 2:
+            self.vencedor = self.personagem2
+        else:
+            self.vencedor = None
+        del self.log_combate[tamanho_log:]
+        
+        self.personagem1.restaurar_estado(estado1)
+        self.personagem2.restaurar_estado(estado2)
+    
+    def copiar(self) -> 'Combate':
+        """
+        Get an independent copy of the fight and both characters
+        
+        Lets a look-ahead search run on the copy (e.g. in another thread)
+        while the live fight stays readable.
+        
+        Returns:
+            New combat with copied characters, log and random generator
+        """
+        return copy.deepcopy(self)
+    
     def obter_resumo_combate(self) -> Dict[str, Any]:
         """
         Get a summary of the current combat state
@@ -254,7 +434,8 @@ class Combate:
         }
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any], personagem1: Personagem, personagem2: Personagem) -> 'Combate':
+    def from_dict(cls, data: Dict[str, Any], personagem1: Personagem, personagem2: Personagem,
+                  rng: Optional[random.Random] = None) -> 'Combate':
         """
         Create combat from dictionary
         
@@ -262,11 +443,12 @@ class Combate:
             data: Dictionary with combat data
             personagem1: First character
             personagem2: Second character
+            rng: Optional random generator for the rest of the fight
             
         Returns:
             New combat instance
         """
-        combate = cls(personagem1, personagem2)
+        combate = cls(personagem1, personagem2, rng=rng)
         
         # Set basic properties
         if "id" in data:
@@ -292,4 +474,49 @@ class Combate:
             elif data["vencedor"] == personagem2.id:
                 combate.vencedor = personagem2
         
-        return combate
\ No newline at end of file
+        return combate
+
+
+def simular_combates(personagem1: Personagem, personagem2: Personagem, quantidade: int,
+                     politica1: Politica = politica_ataque,
+                     politica2: Optional[Politica] = None,
+                     max_turnos: int = MAX_TURNOS_SIMULACAO,
+                     rng: Optional[random.Random] = None,
+                     semente: Optional[int] = None) -> List[ResultadoSimulacao]:
+    """
+    Run several headless fights between the same two characters
+    
+    Both characters are restored to their starting state before each fight,
+    so every fight starts from the same stats and resources.
+    
+    Args:
+        personagem1: First character
+        personagem2: Second character
+        quantidade: Number of fights to run
+        politica1: Policy for the first character
+        politica2: Policy for the second character (defaults to politica1)
+        max_turnos: Turn limit per fight
+        rng: Random generator shared by all fights (takes precedence over semente)
+        semente: Seed for a new generator when rng is not given
+        
+    Returns:
+        List with the outcome of each fight
+    """
+    if rng is None:
+        rng = random.Random(semente)
+    
+    estado1 = personagem1.capturar_estado()
+    estado2 = personagem2.capturar_estado()
+    resultados = []
+    
+    try:
+        for _ in range(quantidade):
+            personagem1.restaurar_estado(estado1)
+            personagem2.restaurar_estado(estado2)
+            combate = Combate(personagem1, personagem2, rng=rng)
+            resultados.append(combate.simular(politica1, politica2, max_turnos))
+    finally:
+        personagem1.restaurar_estado(estado1)
+        personagem2.restaurar_estado(estado2)
+    
+    return resultados
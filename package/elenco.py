@@ -0,0 +1,335 @@
+"""
+Columnar roster module for the Medieval Fantasy Battle Simulator.
+Keeps every character's stats in NumPy columns (struct of arrays) so
+filters, rankings and histograms run over the whole population at once.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from package.personagens.base import Personagem
+
+
+# Stat columns copied from each character, in row order
+COLUNAS_ATRIBUTOS = (
+    "nivel", "experiencia", "forca", "destreza",
+    "inteligencia", "constituicao", "vida_maxima",
+)
+
+# Fight counters, updated from the combat history
+COLUNAS_RESULTADOS = ("vitorias", "derrotas", "combates")
+
+# Derived column: vitorias / combates (0 for characters that never fought)
+COLUNA_TAXA_VITORIA = "taxa_vitoria"
+
+
+class ElencoColunar:
+    """
+    Struct-of-arrays store of character stats.
+
+    One row per character; rows are packed at the start of the columns and
+    a removed row is filled with the last one, so queries only ever look
+    at ``[:len(self)]``. Classes are stored as small integer codes.
+    """
+
+    def __init__(self, capacidade_inicial: int = 1024):
+        """
+        Initialize an empty roster
+
+        Args:
+            capacidade_inicial: Rows allocated up front (columns double when full)
+        """
+        self._lock = threading.Lock()
+        self._capacidade = max(1, capacidade_inicial)
+        self._tamanho = 0
+        self._colunas: Dict[str, np.ndarray] = {
+            nome: np.zeros(self._capacidade, dtype=np.int64)
+            for nome in COLUNAS_ATRIBUTOS + COLUNAS_RESULTADOS
+        }
+        self._classe = np.zeros(self._capacidade, dtype=np.int16)
+        self._ids: List[str] = []
+        self._linha_por_id: Dict[str, int] = {}
+        self._nomes_classes: List[str] = []
+        self._codigo_por_classe: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __contains__(self, personagem_id: str) -> bool:
+        return personagem_id in self._linha_por_id
+
+    def _codigo_classe(self, classe: str) -> int:
+        """Return the code of a class name, assigning a new one if needed"""
+        codigo = self._codigo_por_classe.get(classe)
+        if codigo is None:
+            codigo = len(self._nomes_classes)
+            self._nomes_classes.append(classe)
+            self._codigo_por_classe[classe] = codigo
+        return codigo
+
+    def _crescer(self) -> None:
+        """Double the capacity of every column"""
+        self._capacidade *= 2
+        for nome, coluna in self._colunas.items():
+            nova = np.zeros(self._capacidade, dtype=coluna.dtype)
+            nova[:self._tamanho] = coluna[:self._tamanho]
+            self._colunas[nome] = nova
+        classe = np.zeros(self._capacidade, dtype=self._classe.dtype)
+        classe[:self._tamanho] = self._classe[:self._tamanho]
+        self._classe = classe
+
+    def _atualizar_linha(self, personagem: Personagem) -> None:
+        """Insert or overwrite the row of one character (lock held)"""
+        linha = self._linha_por_id.get(personagem.id)
+        if linha is None:
+            if self._tamanho == self._capacidade:
+                self._crescer()
+            linha = self._tamanho
+            self._tamanho += 1
+            self._ids.append(personagem.id)
+            self._linha_por_id[personagem.id] = linha
+            for nome in COLUNAS_RESULTADOS:
+                self._colunas[nome][linha] = 0
+
+        for nome in COLUNAS_ATRIBUTOS:
+            self._colunas[nome][linha] = getattr(personagem, nome)
+        self._classe[linha] = self._codigo_classe(personagem.classe)
+
+    def atualizar(self, personagem: Personagem) -> None:
+        """
+        Insert or update a character's row
+
+        Fight counters of an existing row are kept.
+
+        Args:
+            personagem: Character whose stats are copied
+        """
+        with self._lock:
+            self._atualizar_linha(personagem)
+
+    def atualizar_varios(self, personagens: Iterable[Personagem]) -> None:
+        """
+        Insert or update several characters under one lock
+
+        Args:
+            personagens: Characters whose stats are copied
+        """
+        with self._lock:
+            for personagem in personagens:
+                self._atualizar_linha(personagem)
+
+    def remover(self, personagem_id: str) -> bool:
+        """
+        Remove a character's row
+
+        Args:
+            personagem_id: ID of the character to remove
+
+        Returns:
+            True if the character was in the roster, False otherwise
+        """
+        with self._lock:
+            linha = self._linha_por_id.pop(personagem_id, None)
+            if linha is None:
+                return False
+
+            ultima = self._tamanho - 1
+            if linha != ultima:
+                # Move the last row into the gap to keep the columns packed
+                for coluna in self._colunas.values():
+                    coluna[linha] = coluna[ultima]
+                self._classe[linha] = self._classe[ultima]
+                id_movido = self._ids[ultima]
+                self._ids[linha] = id_movido
+                self._linha_por_id[id_movido] = linha
+            self._ids.pop()
+            self._tamanho = ultima
+            return True
+
+    def registrar_combate(self, personagem1_id: str, personagem2_id: str,
+                          vencedor_id: Optional[str]) -> None:
+        """
+        Count a finished fight for both participants
+
+        Participants missing from the roster are ignored.
+
+        Args:
+            personagem1_id: ID of the first character
+            personagem2_id: ID of the second character
+            vencedor_id: ID of the winner, or None for a draw
+        """
+        with self._lock:
+            for personagem_id in (personagem1_id, personagem2_id):
+                linha = self._linha_por_id.get(personagem_id)
+                if linha is None:
+                    continue
+                self._colunas["combates"][linha] += 1
+                if vencedor_id is None:
+                    continue
+                resultado = "vitorias" if personagem_id == vencedor_id else "derrotas"
+                self._colunas[resultado][linha] += 1
+
+    def registrar_historico(self, historico: Iterable[Dict[str, Any]]) -> None:
+        """
+        Count every fight of a combat history
+
+        Args:
+            historico: Combat summaries as saved by BancoDados.salvar_historico_combate
+        """
+        for resumo in historico:
+            vencedor = resumo.get("vencedor")
+            self.registrar_combate(resumo["personagem1"]["id"], resumo["personagem2"]["id"],
+                                   vencedor["id"] if vencedor else None)
+
+    def _valores(self, coluna: str) -> np.ndarray:
+        """Return the live values of a column, including the derived win rate (lock held)"""
+        if coluna == COLUNA_TAXA_VITORIA:
+            combates = self._colunas["combates"][:self._tamanho]
+            vitorias = self._colunas["vitorias"][:self._tamanho]
+            return np.divide(vitorias, combates, out=np.zeros(self._tamanho),
+                             where=combates > 0)
+        if coluna not in self._colunas:
+            raise ValueError(f"Coluna inválida: {coluna}")
+        return self._colunas[coluna][:self._tamanho]
+
+    def _mascara(self, classe: Optional[str],
+                 faixas: Dict[str, Tuple[Optional[float], Optional[float]]]) -> np.ndarray:
+        """Build the boolean row mask for a class and column ranges (lock held)"""
+        mascara = np.ones(self._tamanho, dtype=bool)
+        if classe is not None:
+            codigo = self._codigo_por_classe.get(classe)
+            if codigo is None:
+                return np.zeros(self._tamanho, dtype=bool)
+            mascara &= self._classe[:self._tamanho] == codigo
+        for coluna, (minimo, maximo) in faixas.items():
+            valores = self._valores(coluna)
+            if minimo is not None:
+                mascara &= valores >= minimo
+            if maximo is not None:
+                mascara &= valores <= maximo
+        return mascara
+
+    def coluna(self, nome: str) -> np.ndarray:
+        """
+        Get a copy of one column for every character, in row order
+
+        Args:
+            nome: Stat column, fight counter or "taxa_vitoria"
+
+        Returns:
+            Array with one value per character (see ids())
+        """
+        with self._lock:
+            return self._valores(nome).copy()
+
+    def ids(self) -> List[str]:
+        """Get the character IDs in row order"""
+        with self._lock:
+            return list(self._ids)
+
+    def filtrar(self, classe: Optional[str] = None,
+                **faixas: Tuple[Optional[float], Optional[float]]) -> List[str]:
+        """
+        Find the characters matching a class and inclusive column ranges
+
+        Example: ``filtrar("Mago", nivel=(10, None), forca=(None, 12))``
+
+        Args:
+            classe: Only characters of this class
+            **faixas: (minimum, maximum) per column; None leaves a side open
+
+        Returns:
+            IDs of the matching characters
+        """
+        with self._lock:
+            linhas = np.flatnonzero(self._mascara(classe, faixas))
+            return [self._ids[linha] for linha in linhas]
+
+    def contar(self, classe: Optional[str] = None,
+               **faixas: Tuple[Optional[float], Optional[float]]) -> int:
+        """
+        Count the characters matching a class and inclusive column ranges
+
+        Args:
+            classe: Only characters of this class
+            **faixas: (minimum, maximum) per column; None leaves a side open
+
+        Returns:
+            Number of matching characters
+        """
+        with self._lock:
+            return int(np.count_nonzero(self._mascara(classe, faixas)))
+
+    def top_k(self, coluna: str, k: int = 10, classe: Optional[str] = None,
+              crescente: bool = False, **faixas: Tuple[Optional[float], Optional[float]]
+              ) -> List[Tuple[str, float]]:
+        """
+        Rank the characters by one column
+
+        Only the k best rows are sorted (argpartition), so the cost is
+        linear in the population.
+
+        Args:
+            coluna: Column to rank by, e.g. "nivel", "forca" or "taxa_vitoria"
+            k: Number of characters to return
+            classe: Only characters of this class
+            crescente: Rank from the lowest value instead of the highest
+            **faixas: (minimum, maximum) per column to filter before ranking
+
+        Returns:
+            (character ID, value) pairs, best first
+        """
+        if k <= 0:
+            return []
+
+        with self._lock:
+            valores = self._valores(coluna)
+            linhas = np.flatnonzero(self._mascara(classe, faixas)) if classe or faixas else None
+            if linhas is not None:
+                valores = valores[linhas]
+
+            chave = valores if crescente else -valores
+            if k < len(chave):
+                melhores = np.argpartition(chave, k - 1)[:k]
+            else:
+                melhores = np.arange(len(chave))
+            # Stable sort so ties keep row order
+            melhores = melhores[np.argsort(chave[melhores], kind="stable")]
+
+            if linhas is not None:
+                return [(self._ids[linhas[i]], valores[i].item()) for i in melhores]
+            return [(self._ids[i], valores[i].item()) for i in melhores]
+
+    def histograma(self, coluna: str, intervalos: Any = 10, classe: Optional[str] = None,
+                   **faixas: Tuple[Optional[float], Optional[float]]
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogram of one column
+
+        Args:
+            coluna: Column to count
+            intervalos: Number of bins or the bin edges, as in numpy.histogram
+            classe: Only characters of this class
+            **faixas: (minimum, maximum) per column to filter before counting
+
+        Returns:
+            (counts, bin edges)
+        """
+        with self._lock:
+            valores = self._valores(coluna)
+            if classe or faixas:
+                valores = valores[self._mascara(classe, faixas)]
+            return np.histogram(valores, bins=intervalos)
+
+    def contagem_por_classe(self) -> Dict[str, int]:
+        """
+        Count the characters of each class
+
+        Returns:
+            Dictionary of class name to number of characters
+        """
+        with self._lock:
+            contagens = np.bincount(self._classe[:self._tamanho],
+                                    minlength=len(self._nomes_classes))
+            return {nome: int(contagens[codigo])
+                    for codigo, nome in enumerate(self._nomes_classes)}
@@ -3,7 +3,9 @@ Abilities module for the Medieval Fantasy Battle Simulator.
 Defines ability types, effects, and implementations.
 """
 
-from typing import Dict, Any, List, Optional, Callable
+import warnings
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Callable, Sequence, Tuple
 import uuid
 
 
@@ -258,10 +260,17 @@ class HabilidadeUtilidade(Habilidade):
 class GerenciadorHabilidades:
     """
     Manager for creating and tracking abilities.
+
+    Deprecated: the characters use CATALOGO_HABILIDADES. Abilities created
+    here get random UUIDs and keep only the fields of their Habilidade
+    class, so they cannot stand for the stock definitions, which are
+    referenced by stable IDs and carry class-specific fields.
     """
     
     def __init__(self):
         """Initialize a new ability manager"""
+        warnings.warn("GerenciadorHabilidades está obsoleto; use CATALOGO_HABILIDADES",
+                      DeprecationWarning, stacklevel=2)
         self.habilidades = {}
         self.efeitos_map = {}
     
@@ -377,4 +386,222 @@ class GerenciadorHabilidades:
                 else:
                     habilidade = Habilidade.from_dict(habilidade_data)
                 
-                self.habilidades[id] = habilidade
\ No newline at end of file
+                self.habilidades[id] = habilidade
+
+
+# Stock abilities of each character class, in the order the class lists them
+_HABILIDADES_POR_CLASSE = {
+    "Guerreiro": [
+        {
+            "id": "golpe_poderoso",
+            "nome": "Golpe Poderoso",
+            "descricao": "Um golpe devastador que causa dano extra",
+            "custo": 30,  # Fury cost
+            "tipo": "ataque",
+            "multiplicador": 1.5
+        },
+        {
+            "id": "provocar",
+            "nome": "Provocar",
+            "descricao": "Provoca o inimigo, ganhando furia",
+            "custo": 0,
+            "tipo": "utilidade",
+            "bonus_furia": 40
+        },
+        {
+            "id": "postura_defensiva",
+            "nome": "Postura Defensiva",
+            "descricao": "Aumenta a defesa por um turno",
+            "custo": 20,
+            "tipo": "defesa",
+            "bonus_defesa": 0.2  # 20% extra defense
+        }
+    ],
+    "Mago": [
+        {
+            "id": "bola_de_fogo",
+            "nome": "Bola de Fogo",
+            "descricao": "Conjura uma bola de fogo que causa dano ao alvo",
+            "custo": 25,  # Mana cost
+            "tipo": "ataque",
+            "elemento": "fogo",
+            "multiplicador": 2.0
+        },
+        {
+            "id": "raio_de_gelo",
+            "nome": "Raio de Gelo",
+            "descricao": "Conjura um raio de gelo que causa dano e reduz a velocidade do alvo",
+            "custo": 30,
+            "tipo": "ataque",
+            "elemento": "gelo",
+            "multiplicador": 1.6,
+            "efeito": "lentidao"
+        },
+        {
+            "id": "barreira_arcana",
+            "nome": "Barreira Arcana",
+            "descricao": "Cria uma barreira mágica que absorve dano",
+            "custo": 35,
+            "tipo": "defesa",
+            "duracao": 2,  # Turns
+            "absorve_dano": 40
+        },
+        {
+            "id": "mudar_elemento",
+            "nome": "Mudar Elemento",
+            "descricao": "Muda o elemento ativo do mago",
+            "custo": 10,
+            "tipo": "utilidade",
+            "elementos_disponiveis": ["fogo", "gelo", "raio", "arcano"]
+        }
+    ],
+    "Arqueiro": [
+        {
+            "id": "tiro_certeiro",
+            "nome": "Tiro Certeiro",
+            "descricao": "Um tiro preciso que causa dano extra",
+            "custo": 25,  # Stamina cost
+            "tipo": "ataque",
+            "multiplicador": 1.8,
+            "bonus_critico": 15  # +15% crit chance
+        },
+        {
+            "id": "chuva_de_flechas",
+            "nome": "Chuva de Flechas",
+            "descricao": "Dispara múltiplas flechas que causam dano em área",
+            "custo": 40,
+            "tipo": "ataque",
+            "multiplicador": 1.2,
+            "num_flechas": 3,
+            "custo_municao": 3
+        },
+        {
+            "id": "flecha_perfurante",
+            "nome": "Flecha Perfurante",
+            "descricao": "Uma flecha que ignora parte da defesa do alvo",
+            "custo": 30,
+            "tipo": "ataque",
+            "multiplicador": 1.5,
+            "penetracao_armadura": 0.3,  # Ignores 30% of armor
+            "custo_municao": 1
+        },
+        {
+            "id": "evasao",
+            "nome": "Evasão",
+            "descricao": "Aumenta a chance de esquivar de ataques",
+            "custo": 20,
+            "tipo": "defesa",
+            "bonus_evasao": 0.3,  # +30% evasion
+            "duracao": 2  # turns
+        }
+    ]
+}
+
+
+def _congelar(valor: Any) -> Any:
+    """Make a definition value read-only (lists become tuples)"""
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(item) for item in valor)
+    if isinstance(valor, dict):
+        return MappingProxyType({chave: _congelar(item) for chave, item in valor.items()})
+    return valor
+
+
+class CatalogoHabilidades:
+    """
+    Read-only catalog of the stock character abilities.
+
+    Every character of a class shares the same definitions: characters keep
+    only the IDs of their abilities plus the fields they override, and
+    resolve the full definition here when an ability is used or shown.
+    Abilities that are not in the catalog are kept whole as overrides.
+    """
+
+    def __init__(self, habilidades_por_classe: Dict[str, Sequence[Dict[str, Any]]]):
+        """
+        Build the catalog
+
+        Args:
+            habilidades_por_classe: Class name -> list of ability definitions
+        """
+        self._definicoes: Dict[str, Mapping[str, Any]] = {}
+        self._ids_por_classe: Dict[str, Tuple[str, ...]] = {}
+        for classe, habilidades in habilidades_por_classe.items():
+            for habilidade in habilidades:
+                self._definicoes[habilidade["id"]] = _congelar(habilidade)
+            self._ids_por_classe[classe] = tuple(habilidade["id"] for habilidade in habilidades)
+
+    def __contains__(self, habilidade_id: str) -> bool:
+        """Check if an ability ID is in the catalog"""
+        return habilidade_id in self._definicoes
+
+    def obter(self, habilidade_id: str) -> Optional[Mapping[str, Any]]:
+        """
+        Get the stock definition of an ability
+
+        Args:
+            habilidade_id: ID of the ability
+
+        Returns:
+            Read-only definition, or None if the ID is not in the catalog
+        """
+        return self._definicoes.get(habilidade_id)
+
+    def ids_da_classe(self, classe: str) -> Tuple[str, ...]:
+        """
+        Get the stock ability IDs of a character class
+
+        Args:
+            classe: Class name
+
+        Returns:
+            Tuple of ability IDs (empty for unknown classes)
+        """
+        return self._ids_por_classe.get(classe, ())
+
+    def resolver(self, habilidade_id: str, ajustes: Optional[Dict[str, Any]] = None) -> Optional[Mapping[str, Any]]:
+        """
+        Get the definition of an ability with a character's overrides applied
+
+        Args:
+            habilidade_id: ID of the ability
+            ajustes: Fields overridden by the character, or the whole
+                     definition for abilities outside the catalog
+
+        Returns:
+            The resolved definition, or None if the ability is unknown
+        """
+        definicao = self._definicoes.get(habilidade_id)
+        if not ajustes:
+            return definicao
+        if definicao is None:
+            return ajustes
+        resolvida = dict(definicao)
+        resolvida.update(ajustes)
+        return resolvida
+
+    def separar(self, habilidade: Mapping[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Split a full ability definition into its ID and overrides
+
+        Args:
+            habilidade: Ability definition, e.g. from an older character file
+
+        Returns:
+            (ability ID, fields that differ from the catalog or None);
+            abilities outside the catalog are returned whole as overrides
+        """
+        habilidade_id = habilidade["id"]
+        definicao = self._definicoes.get(habilidade_id)
+        if definicao is None:
+            return habilidade_id, dict(habilidade)
+        ajustes = {chave: valor for chave, valor in habilidade.items()
+                   if definicao.get(chave, _AUSENTE) != _congelar(valor)}
+        return habilidade_id, ajustes or None
+
+
+# Marker for fields missing from a stock definition
+_AUSENTE = object()
+
+# Shared catalog used by the character classes
+CATALOGO_HABILIDADES = CatalogoHabilidades(_HABILIDADES_POR_CLASSE)
@@ -0,0 +1,468 @@
+"""
+Battle history log module for the Medieval Fantasy Battle Simulator.
+Appends finished fights to rotating JSON Lines segments and keeps a
+sidecar offset index so recent fights, fights by character and fights
+since a date are read by seeking instead of scanning every record.
+"""
+
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class EntradaIndice(NamedTuple):
+    """
+    Location and metadata of one record in the history log.
+    """
+    segmento: int
+    posicao: int
+    tamanho: int
+    id: str
+    registrado_em: float
+    personagem1_id: str
+    personagem2_id: str
+    classe1: str
+    classe2: str
+    vencedor_id: Optional[str]
+    turnos: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the entry to the compact form stored in the index file"""
+        return {
+            "seg": self.segmento, "pos": self.posicao, "tam": self.tamanho,
+            "id": self.id, "ts": self.registrado_em,
+            "p1": self.personagem1_id, "p2": self.personagem2_id,
+            "c1": self.classe1, "c2": self.classe2,
+            "venc": self.vencedor_id, "turnos": self.turnos
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EntradaIndice':
+        """Create an entry from its index file form"""
+        return cls(data["seg"], data["pos"], data["tam"], data["id"], data["ts"],
+                   data["p1"], data["p2"], data["c1"], data["c2"], data["venc"], data["turnos"])
+
+
+class LogHistorico:
+    """
+    Append-only, segment-rotated store for combat summaries.
+
+    Records are written as one JSON line each to segmento-NNNNNN.jsonl;
+    once a segment exceeds tamanho_segmento a new one is started. Every
+    append also writes a line to indice.jsonl with the record's segment,
+    byte offset and length plus the fields queries filter on, and the
+    whole index is kept in memory. Records written after the last index
+    line (e.g. after a crash) are re-indexed from the segment on open.
+
+    Several processes may share the log (app.py and main.py use the same
+    data directory): appends hold an exclusive lock on a lock file, and
+    every query and append first indexes the lines other processes added
+    to indice.jsonl since the last read. Without fcntl (Windows) only
+    threads of one process are serialized.
+    """
+
+    ARQUIVO_INDICE = "indice.jsonl"
+    ARQUIVO_TRAVA = "trava"
+
+    def __init__(self, diretorio: str, tamanho_segmento: int = 8 * 1024 * 1024):
+        """
+        Open (and create if needed) the history log
+
+        Args:
+            diretorio: Directory holding the segments and the index
+            tamanho_segmento: Segment size in bytes that triggers rotation
+        """
+        self.diretorio = diretorio
+        self.tamanho_segmento = tamanho_segmento
+        self._lock = threading.RLock()
+        self._profundidade_trava = 0
+
+        self._entradas: List[EntradaIndice] = []
+        self._datas: List[float] = []
+        self._por_personagem: Dict[str, List[int]] = {}
+        self._segmento_atual = 1
+        # Index file read so far (inode, bytes), to pick up other processes' appends
+        self._inode_indice = None
+        self._posicao_indice = 0
+
+        os.makedirs(diretorio, exist_ok=True)
+        self._carregar_indice()
+
+    def _caminho_segmento(self, segmento: int) -> str:
+        """Get the file path for a segment"""
+        return os.path.join(self.diretorio, f"segmento-{segmento:06d}.jsonl")
+
+    def _caminho_indice(self) -> str:
+        """Get the file path for the offset index"""
+        return os.path.join(self.diretorio, self.ARQUIVO_INDICE)
+
+    @contextmanager
+    def travar(self) -> Iterator[None]:
+        """
+        Hold the log's exclusive lock, shared by every process using it
+
+        Nested calls (e.g. appends inside the block) join the outer lock.
+        """
+        with self._lock:
+            self._profundidade_trava += 1
+            try:
+                if self._profundidade_trava > 1 or fcntl is None:
+                    yield
+                    return
+                with open(os.path.join(self.diretorio, self.ARQUIVO_TRAVA), 'a') as trava:
+                    fcntl.flock(trava, fcntl.LOCK_EX)
+                    try:
+                        yield
+                    finally:
+                        fcntl.flock(trava, fcntl.LOCK_UN)
+            finally:
+                self._profundidade_trava -= 1
+
+    def _sincronizar(self) -> None:
+        """
+        Index the lines other processes appended to indice.jsonl
+
+        If the index file was replaced, it is read again from the start.
+        Caller holds the thread lock.
+        """
+        caminho = self._caminho_indice()
+        try:
+            estado = os.stat(caminho)
+        except FileNotFoundError:
+            return
+
+        if estado.st_ino != self._inode_indice or estado.st_size < self._posicao_indice:
+            self._entradas = []
+            self._datas = []
+            self._por_personagem = {}
+            self._inode_indice = estado.st_ino
+            self._posicao_indice = 0
+        elif estado.st_size == self._posicao_indice:
+            return
+
+        with open(caminho, 'rb') as arquivo:
+            arquivo.seek(self._posicao_indice)
+            dados = arquivo.read()
+
+        # A line another process is still writing has no final newline yet
+        fim = dados.rfind(b"\n") + 1
+        self._posicao_indice += fim
+        for linha in dados[:fim].splitlines():
+            try:
+                self._registrar_entrada(EntradaIndice.from_dict(json.loads(linha)))
+            except (ValueError, KeyError) as e:
+                print(f"Erro ao ler índice do histórico: {e}")
+
+    def _registrar_entrada(self, entrada: EntradaIndice) -> None:
+        """Add an entry to the in-memory index"""
+        if entrada.segmento > self._segmento_atual:
+            self._segmento_atual = entrada.segmento
+        posicao = len(self._entradas)
+        self._entradas.append(entrada)
+        self._datas.append(entrada.registrado_em)
+        self._por_personagem.setdefault(entrada.personagem1_id, []).append(posicao)
+        if entrada.personagem2_id != entrada.personagem1_id:
+            self._por_personagem.setdefault(entrada.personagem2_id, []).append(posicao)
+
+    @staticmethod
+    def _entrada_para_resumo(resumo: Dict[str, Any], segmento: int, posicao: int,
+                             tamanho: int, registrado_em: float) -> EntradaIndice:
+        """Build the index entry describing a summary"""
+        vencedor = resumo.get("vencedor")
+        return EntradaIndice(
+            segmento, posicao, tamanho, resumo["id"], registrado_em,
+            resumo["personagem1"]["id"], resumo["personagem2"]["id"],
+            resumo["personagem1"]["classe"], resumo["personagem2"]["classe"],
+            vencedor["id"] if vencedor else None, resumo.get("turnos", 0)
+        )
+
+    def _carregar_indice(self) -> None:
+        """Load the index file and re-index any unindexed tail of the last segment"""
+        # Under the log lock no other process is mid-append, so a torn line
+        # or an unindexed record can only be left over from a crash
+        with self.travar():
+            self._carregar_indice_travado()
+
+    def _carregar_indice_travado(self) -> None:
+        """Body of _carregar_indice (caller holds the log lock)"""
+        caminho = self._caminho_indice()
+        if os.path.exists(caminho):
+            valido = 0
+            with open(caminho, 'rb') as arquivo:
+                for linha in arquivo:
+                    try:
+                        if not linha.endswith(b"\n"):
+                            raise ValueError("linha incompleta")
+                        self._registrar_entrada(EntradaIndice.from_dict(json.loads(linha)))
+                    except (ValueError, KeyError):
+                        # Torn last line from an interrupted append
+                        break
+                    valido += len(linha)
+            if valido < os.path.getsize(caminho):
+                # Drop the torn fragment so the next index line starts clean;
+                # its record is re-indexed from the segment below
+                with open(caminho, 'r+b') as truncar:
+                    truncar.truncate(valido)
+
+        segmentos = sorted(
+            int(nome[len("segmento-"):-len(".jsonl")])
+            for nome in os.listdir(self.diretorio)
+            if nome.startswith("segmento-") and nome.endswith(".jsonl")
+        )
+        if segmentos:
+            self._segmento_atual = max(self._segmento_atual, segmentos[-1])
+
+        # Records appended after the last indexed one
+        if self._entradas:
+            ultima = self._entradas[-1]
+            inicio = (ultima.segmento, ultima.posicao + ultima.tamanho)
+        else:
+            inicio = (segmentos[0], 0) if segmentos else None
+
+        if inicio is not None:
+            faltantes = self._ler_cauda(*inicio, segmentos)
+            if faltantes:
+                with open(caminho, 'a', encoding='utf-8') as arquivo:
+                    for entrada in faltantes:
+                        self._registrar_entrada(entrada)
+                        arquivo.write(json.dumps(entrada.to_dict(), ensure_ascii=False) + "\n")
+
+        if os.path.exists(caminho):
+            estado = os.stat(caminho)
+            self._inode_indice = estado.st_ino
+            self._posicao_indice = estado.st_size
+
+    def _ler_cauda(self, segmento: int, posicao: int, segmentos: List[int]) -> List[EntradaIndice]:
+        """Scan segments from a byte position for complete, unindexed records"""
+        entradas = []
+        for numero in segmentos:
+            if numero < segmento:
+                continue
+            inicio = posicao if numero == segmento else 0
+            caminho = self._caminho_segmento(numero)
+            with open(caminho, 'rb') as arquivo:
+                arquivo.seek(inicio)
+                for linha in arquivo:
+                    if not linha.endswith(b"\n"):
+                        # Incomplete record: drop it so the next append starts clean
+                        arquivo.close()
+                        with open(caminho, 'r+b') as truncar:
+                            truncar.truncate(inicio)
+                        break
+                    try:
+                        resumo = json.loads(linha)
+                        registrado_em = resumo.get("registrado_em") or os.path.getmtime(caminho)
+                        entradas.append(self._entrada_para_resumo(resumo, numero, inicio,
+                                                                  len(linha), registrado_em))
+                    except (ValueError, KeyError, TypeError) as e:
+                        print(f"Erro ao reindexar histórico: {e}")
+                    inicio += len(linha)
+        return entradas
+
+    def __len__(self) -> int:
+        """Number of records in the log"""
+        with self._lock:
+            self._sincronizar()
+            return len(self._entradas)
+
+    def anexar(self, resumo: Dict[str, Any]) -> EntradaIndice:
+        """
+        Append a combat summary to the log
+
+        The summary gets a "registrado_em" timestamp (seconds since the
+        epoch) if it has none; timestamps never go backwards, so the index
+        stays sorted for date queries.
+
+        Args:
+            resumo: Combat summary (see BancoDados.salvar_historico_combate)
+
+        Returns:
+            Index entry of the new record
+        """
+        with self.travar():
+            self._sincronizar()
+            registrado_em = resumo.get("registrado_em") or time.time()
+            if self._datas and registrado_em < self._datas[-1]:
+                registrado_em = self._datas[-1]
+            resumo["registrado_em"] = registrado_em
+
+            linha = (json.dumps(resumo, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+
+            caminho = self._caminho_segmento(self._segmento_atual)
+            posicao = os.path.getsize(caminho) if os.path.exists(caminho) else 0
+            if posicao and posicao + len(linha) > self.tamanho_segmento:
+                self._segmento_atual += 1
+                caminho = self._caminho_segmento(self._segmento_atual)
+                posicao = 0
+
+            with open(caminho, 'ab') as arquivo:
+                arquivo.write(linha)
+
+            entrada = self._entrada_para_resumo(resumo, self._segmento_atual, posicao,
+                                                len(linha), registrado_em)
+            with open(self._caminho_indice(), 'ab') as arquivo:
+                arquivo.write((json.dumps(entrada.to_dict(), ensure_ascii=False) + "\n").encode('utf-8'))
+                arquivo.flush()
+                # No other process appends while the log lock is held
+                estado = os.fstat(arquivo.fileno())
+
+            self._registrar_entrada(entrada)
+            self._inode_indice = estado.st_ino
+            self._posicao_indice = estado.st_size
+            return entrada
+
+    def ler(self, entradas: List[EntradaIndice]) -> List[Dict[str, Any]]:
+        """
+        Read the records for a list of index entries
+
+        Each segment is opened once and records are read by seeking
+        straight to their offsets.
+
+        Args:
+            entradas: Entries to read, in the order the records are wanted
+
+        Returns:
+            The combat summaries in the same order
+        """
+        resultado: List[Optional[Dict[str, Any]]] = [None] * len(entradas)
+        por_segmento: Dict[int, List[int]] = {}
+        for i, entrada in enumerate(entradas):
+            por_segmento.setdefault(entrada.segmento, []).append(i)
+
+        for segmento, posicoes in por_segmento.items():
+            with open(self._caminho_segmento(segmento), 'rb') as arquivo:
+                for i in sorted(posicoes, key=lambda i: entradas[i].posicao):
+                    arquivo.seek(entradas[i].posicao)
+                    resultado[i] = json.loads(arquivo.read(entradas[i].tamanho))
+
+        return resultado
+
+    def entradas(self, mais_recentes_primeiro: bool = False) -> Iterator[EntradaIndice]:
+        """Iterate over all index entries in append order (or newest first)"""
+        with self._lock:
+            self._sincronizar()
+            entradas = list(self._entradas)
+        return reversed(entradas) if mais_recentes_primeiro else iter(entradas)
+
+    def ultimos(self, quantidade: int) -> List[Dict[str, Any]]:
+        """
+        Get the most recent fights
+
+        Args:
+            quantidade: Maximum number of fights
+
+        Returns:
+            Combat summaries, newest first
+        """
+        with self._lock:
+            self._sincronizar()
+            entradas = self._entradas[-quantidade:] if quantidade > 0 else []
+        return self.ler(entradas[::-1])
+
+    def por_personagem(self, personagem_id: str, limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the fights a character took part in
+
+        Args:
+            personagem_id: Character ID
+            limite: Maximum number of fights (None for all)
+
+        Returns:
+            Combat summaries, newest first
+        """
+        with self._lock:
+            self._sincronizar()
+            posicoes = self._por_personagem.get(personagem_id, [])
+            if limite is not None:
+                posicoes = posicoes[-limite:] if limite > 0 else []
+            entradas = [self._entradas[i] for i in reversed(posicoes)]
+        return self.ler(entradas)
+
+    def desde(self, registrado_em: float) -> List[Dict[str, Any]]:
+        """
+        Get the fights recorded at or after a moment
+
+        Args:
+            registrado_em: Timestamp in seconds since the epoch
+
+        Returns:
+            Combat summaries, oldest first
+        """
+        with self._lock:
+            self._sincronizar()
+            inicio = bisect.bisect_left(self._datas, registrado_em)
+            entradas = self._entradas[inicio:]
+        return self.ler(entradas)
+
+    def consultar(self, personagem_id: Optional[str] = None, classe: Optional[str] = None,
+                  vencedor_id: Optional[str] = None, turnos_min: Optional[int] = None,
+                  turnos_max: Optional[int] = None, mais_recentes_primeiro: bool = True,
+                  cursor: Optional[int] = None, limite: int = 50) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Query one page of fights, filtering on the in-memory index
+
+        Filters are checked against index entries, so only the records of
+        the returned page are read from the segments. With a character
+        filter only that character's fights are visited.
+
+        Args:
+            personagem_id: Only fights this character took part in
+            classe: Only fights with a character of this class
+            vencedor_id: Only fights won by this character
+            turnos_min: Minimum number of turns
+            turnos_max: Maximum number of turns
+            mais_recentes_primeiro: Newest first (True) or oldest first (False)
+            cursor: Position returned with the last record of the previous page
+            limite: Maximum number of fights in the page
+
+        Yields:
+            (position, combat summary) pairs; the position of the last
+            pair is the cursor for the next page
+        """
+        with self._lock:
+            self._sincronizar()
+            entradas = self._entradas
+            # Both sequences are append-only, so a length snapshot is enough
+            candidatos: Sequence[int]
+            if personagem_id is not None:
+                candidatos = self._por_personagem.get(personagem_id, [])
+            else:
+                candidatos = range(len(self._entradas))
+            total = len(candidatos)
+
+        if mais_recentes_primeiro:
+            inicio = total - 1 if cursor is None else bisect.bisect_left(candidatos, cursor, 0, total) - 1
+            passos = range(inicio, -1, -1)
+        else:
+            inicio = 0 if cursor is None else bisect.bisect_right(candidatos, cursor, 0, total)
+            passos = range(inicio, total)
+
+        pagina: List[Tuple[int, EntradaIndice]] = []
+        if limite > 0:
+            for k in passos:
+                posicao = candidatos[k]
+                entrada = entradas[posicao]
+                if classe is not None and classe != entrada.classe1 and classe != entrada.classe2:
+                    continue
+                if vencedor_id is not None and entrada.vencedor_id != vencedor_id:
+                    continue
+                if turnos_min is not None and entrada.turnos < turnos_min:
+                    continue
+                if turnos_max is not None and entrada.turnos > turnos_max:
+                    continue
+                pagina.append((posicao, entrada))
+                if len(pagina) >= limite:
+                    break
+
+        registros = self.ler([entrada for _, entrada in pagina])
+        for (posicao, _), resumo in zip(pagina, registros):
+            yield posicao, resumo
@@ -0,0 +1,176 @@
+"""
+AI opponent module for the Medieval Fantasy Battle Simulator.
+Chooses combat actions with Monte Carlo Tree Search over Combate,
+within a fixed time budget per move.
+"""
+
+import math
+import random
+import time
+from typing import Dict, List, Optional
+from package.personagens.base import Personagem
+from package.combate import Combate, ACAO_ATACAR, ACAO_DEFENDER, Politica, politica_aleatoria
+
+
+def acoes_disponiveis(personagem: Personagem) -> List[str]:
+    """
+    Get every action a character can choose in a fight
+
+    Args:
+        personagem: The acting character
+
+    Returns:
+        Attack, defense and the ID of each of the character's abilities
+    """
+    return [ACAO_ATACAR, ACAO_DEFENDER] + list(personagem.ids_habilidades)
+
+
+class _No:
+    """Node of the search tree, identified by the actions that lead to it"""
+
+    def __init__(self, acoes: List[str]):
+        self.acoes_nao_testadas = list(acoes)
+        self.filhos: Dict[str, '_No'] = {}
+        self.visitas = 0
+        self.valor = 0.0  # Sum of rewards from the bot's point of view
+
+    def selecionar(self, vez_do_bot: bool, exploracao: float) -> str:
+        """Pick the child action with the best UCT score for the side to move"""
+        log_visitas = math.log(self.visitas)
+        melhor_acao = None
+        melhor_pontuacao = -math.inf
+
+        for acao, filho in self.filhos.items():
+            media = filho.valor / filho.visitas
+            if not vez_do_bot:
+                media = 1.0 - media
+            pontuacao = media + exploracao * math.sqrt(log_visitas / filho.visitas)
+            if pontuacao > melhor_pontuacao:
+                melhor_acao = acao
+                melhor_pontuacao = pontuacao
+
+        return melhor_acao
+
+
+class JogadorMCTS:
+    """
+    Bot player that picks its next action with Monte Carlo Tree Search.
+
+    The search is open-loop: tree nodes are action sequences and every
+    iteration replays them from the current position, so random events
+    such as crit rolls are sampled rather than branched on.
+    The fight is restored in place with Combate.capturar_estado/
+    restaurar_estado, and the search draws from its own generator so the
+    real fight's random stream is left untouched.
+
+    Instances are callable with the Politica signature, so they can be
+    plugged straight into Combate.simular.
+    """
+
+    def __init__(self, orcamento_ms: float = 20.0, exploracao: float = 1.4,
+                 max_acoes_rollout: int = 60, politica_rollout: Politica = politica_aleatoria,
+                 semente: Optional[int] = None):
+        """
+        Initialize the bot
+
+        Args:
+            orcamento_ms: Thinking time per move in milliseconds
+            exploracao: UCT exploration constant
+            max_acoes_rollout: Actions played per rollout before evaluating by HP
+            politica_rollout: Policy used by both sides during rollouts
+            semente: Seed for the search's random generator
+        """
+        self.orcamento_ms = orcamento_ms
+        self.exploracao = exploracao
+        self.max_acoes_rollout = max_acoes_rollout
+        self.politica_rollout = politica_rollout
+        self.rng = random.Random(semente)
+
+        # Statistics of the last decision
+        self.ultimas_simulacoes = 0
+        self.ultima_duracao_ms = 0.0
+
+    def __call__(self, combate: Combate, personagem: Personagem) -> str:
+        """Policy adapter: choose the action for the active character"""
+        return self.escolher_acao(combate)
+
+    def _avaliar(self, combate: Combate, bot: Personagem) -> float:
+        """Reward of the current position from the bot's point of view"""
+        if combate.finalizado:
+            return 1.0 if combate.vencedor is bot else 0.0
+
+        oponente = combate.personagem2 if bot is combate.personagem1 else combate.personagem1
+        vida_bot = bot.vida_atual / bot.vida_maxima if bot.vida_maxima else 0.0
+        vida_oponente = oponente.vida_atual / oponente.vida_maxima if oponente.vida_maxima else 0.0
+        return 0.5 + 0.5 * (vida_bot - vida_oponente)
+
+    def escolher_acao(self, combate: Combate) -> str:
+        """
+        Choose the next action for the active character
+
+        Args:
+            combate: Ongoing fight; it is left exactly as it was found
+
+        Returns:
+            ACAO_ATACAR, ACAO_DEFENDER or an ability ID
+        """
+        if combate.finalizado:
+            # Nothing to search; the combat rejects any action once finished
+            return ACAO_ATACAR
+
+        bot = combate.personagem_ativo
+        oponente = combate.personagem2 if bot is combate.personagem1 else combate.personagem1
+        acoes = {bot: acoes_disponiveis(bot), oponente: acoes_disponiveis(oponente)}
+
+        estado_raiz = combate.capturar_estado()
+        rng_original = combate.rng
+        combate.definir_rng(self.rng)
+
+        raiz = _No(acoes[bot])
+        prazo = time.perf_counter() + self.orcamento_ms / 1000
+        inicio = time.perf_counter()
+        simulacoes = 0
+
+        try:
+            while simulacoes == 0 or time.perf_counter() < prazo:
+                combate.restaurar_estado(estado_raiz)
+                no = raiz
+                caminho = [raiz]
+
+                # Selection and expansion
+                while not combate.finalizado:
+                    ativo = combate.personagem_ativo
+                    if no.acoes_nao_testadas:
+                        acao = no.acoes_nao_testadas.pop(self.rng.randrange(len(no.acoes_nao_testadas)))
+                        combate._executar_acao_rapida(acao)
+                        filho = _No(acoes[combate.personagem_ativo])
+                        no.filhos[acao] = filho
+                        caminho.append(filho)
+                        break
+                    acao = no.selecionar(ativo is bot, self.exploracao)
+                    combate._executar_acao_rapida(acao)
+                    no = no.filhos[acao]
+                    caminho.append(no)
+
+                # Rollout
+                for _ in range(self.max_acoes_rollout):
+                    if combate.finalizado:
+                        break
+                    ativo = combate.personagem_ativo
+                    combate._executar_acao_rapida(self.politica_rollout(combate, ativo))
+
+                # Backpropagation
+                recompensa = self._avaliar(combate, bot)
+                for no in caminho:
+                    no.visitas += 1
+                    no.valor += recompensa
+
+                simulacoes += 1
+        finally:
+            combate.restaurar_estado(estado_raiz)
+            combate.definir_rng(rng_original)
+
+        self.ultimas_simulacoes = simulacoes
+        self.ultima_duracao_ms = (time.perf_counter() - inicio) * 1000
+
+        return max(raiz.filhos.items(), key=lambda item: item[1].visitas)[0]
@@ -0,0 +1,177 @@
+"""
+Combat journal module for the Medieval Fantasy Battle Simulator.
+Persists an ongoing combat as a checkpoint plus an append-only journal
+of per-action deltas, so each save writes only what the action changed.
+"""
+
+import os
+import json
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+from package.combate import Combate
+
+
+class JournalCombates:
+    """
+    Checkpoint + journal storage for ongoing combats.
+
+    The first save of a combat writes a checkpoint (<id>.json, the usual
+    Combate.to_dict plus the capturar_estado snapshot). Later saves append
+    one JSON line to <id>.journal.jsonl holding the new log entries and a
+    fresh snapshot, so a save costs O(1) regardless of the log length.
+    After compactar_a_cada deltas the journal is folded into a new
+    checkpoint.
+
+    Each delta records the log length it starts from ("base"), so replay
+    skips entries already contained in the checkpoint; a crash between
+    writing a checkpoint and removing the old journal is harmless.
+    """
+
+    def __init__(self, diretorio: str, compactar_a_cada: int = 50):
+        """
+        Initialize the journal
+
+        Args:
+            diretorio: Directory holding checkpoints and journals
+            compactar_a_cada: Number of deltas that triggers compaction
+        """
+        self.diretorio = diretorio
+        self.compactar_a_cada = compactar_a_cada
+        self._lock = threading.Lock()
+
+        # combat ID -> (log entries already persisted, deltas since checkpoint)
+        self._progresso: Dict[str, Tuple[int, int]] = {}
+
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho_checkpoint(self, combate_id: str) -> str:
+        """Get the file path for a combat checkpoint"""
+        return os.path.join(self.diretorio, f"{combate_id}.json")
+
+    def _caminho_journal(self, combate_id: str) -> str:
+        """Get the file path for a combat journal"""
+        return os.path.join(self.diretorio, f"{combate_id}.journal.jsonl")
+
+    def _gravar_checkpoint(self, combate: Combate) -> None:
+        """Write a full checkpoint and drop the journal it supersedes"""
+        data = combate.to_dict()
+        data["estado"] = combate.capturar_estado()
+
+        caminho = self._caminho_checkpoint(combate.id)
+        temporario = caminho + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(data, arquivo, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temporario, caminho)
+
+        journal = self._caminho_journal(combate.id)
+        if os.path.exists(journal):
+            os.remove(journal)
+
+    def salvar(self, combate: Combate) -> None:
+        """
+        Persist the changes of a combat since its last save
+
+        Args:
+            combate: Combat to save
+        """
+        with self._lock:
+            progresso = self._progresso.get(combate.id)
+
+            # Unknown combat (first save or after a restart), journal due for
+            # compaction, or a log that shrank: start from a fresh checkpoint
+            if (progresso is None or progresso[1] >= self.compactar_a_cada
+                    or len(combate.log_combate) < progresso[0]):
+                self._gravar_checkpoint(combate)
+                self._progresso[combate.id] = (len(combate.log_combate), 0)
+                return
+
+            persistidos, deltas = progresso
+            delta = {
+                "base": persistidos,
+                "log": combate.log_combate[persistidos:],
+                "estado": combate.capturar_estado()
+            }
+            with open(self._caminho_journal(combate.id), 'a', encoding='utf-8') as arquivo:
+                arquivo.write(json.dumps(delta, ensure_ascii=False, separators=(',', ':')) + "\n")
+
+            self._progresso[combate.id] = (len(combate.log_combate), deltas + 1)
+
+    def compactar(self, combate: Combate) -> None:
+        """
+        Fold the journal of a combat into a new checkpoint
+
+        Args:
+            combate: Combat to compact
+        """
+        with self._lock:
+            self._gravar_checkpoint(combate)
+            self._progresso[combate.id] = (len(combate.log_combate), 0)
+
+    def ler(self, combate_id: str) -> Optional[Tuple[Dict[str, Any], Optional[List[Any]]]]:
+        """
+        Replay the journal of a combat over its checkpoint
+
+        Args:
+            combate_id: Combat ID
+
+        Returns:
+            (combat dictionary with the full log, latest capturar_estado
+            snapshot or None), or None if the combat does not exist
+        """
+        caminho = self._caminho_checkpoint(combate_id)
+        if not os.path.exists(caminho):
+            return None
+
+        with self._lock:
+            with open(caminho, 'r', encoding='utf-8') as arquivo:
+                data = json.load(arquivo)
+
+            log = data.setdefault("log_combate", [])
+            estado = data.pop("estado", None)
+            deltas = 0
+
+            journal = self._caminho_journal(combate_id)
+            if os.path.exists(journal):
+                valido = 0
+                with open(journal, 'rb') as arquivo:
+                    for linha in arquivo:
+                        try:
+                            delta = json.loads(linha)
+                        except ValueError:
+                            # Torn last line from an interrupted append
+                            break
+                        if delta["base"] > len(log):
+                            print(f"Journal de combate inconsistente: {combate_id}")
+                            break
+                        valido += len(linha)
+                        if delta["base"] + len(delta["log"]) < len(log):
+                            # Already contained in the checkpoint
+                            continue
+                        log.extend(delta["log"][len(log) - delta["base"]:])
+                        estado = delta["estado"]
+                        deltas += 1
+
+                # Drop anything after the last good delta so new appends start clean
+                if valido < os.path.getsize(journal):
+                    with open(journal, 'r+b') as arquivo:
+                        arquivo.truncate(valido)
+
+            self._progresso[combate_id] = (len(log), deltas)
+
+        return data, estado
+
+    def excluir(self, combate_id: str) -> bool:
+        """
+        Delete the checkpoint and journal of a combat
+
+        Returns:
+            True if the combat existed
+        """
+        with self._lock:
+            self._progresso.pop(combate_id, None)
+            existia = False
+            for caminho in (self._caminho_checkpoint(combate_id), self._caminho_journal(combate_id)):
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+                    existia = True
+            return existia
@@ -0,0 +1,134 @@
+"""
+Combat model module for the Medieval Fantasy Battle Simulator.
+Reduces a character to the numbers that drive its basic attack,
+for engines that simulate or analyse fights without Personagem objects.
+"""
+
+from typing import Tuple
+from package.personagens.base import Personagem
+
+
+# Fury gained per basic attack and the threshold that triggers berserk
+# (see Guerreiro.calcular_dano_ataque and Guerreiro.ganhar_furia)
+GANHO_FURIA_ATAQUE = 10
+LIMIAR_BERSERK = 80
+
+
+def probabilidade_primeiro(destreza1: int, destreza2: int) -> float:
+    """
+    Get the exact probability that the first character acts first
+
+    Mirrors Combate._determinar_primeiro_personagem: each side rolls 1d10
+    on top of its dexterity and ties go to the first character.
+
+    Args:
+        destreza1: Dexterity of the first character
+        destreza2: Dexterity of the second character
+
+    Returns:
+        Probability in [0, 1]
+    """
+    favoraveis = sum(1 for a in range(1, 11) for b in range(1, 11)
+                     if destreza1 + a >= destreza2 + b)
+    return favoraveis / 100
+
+
+class ModeloAtaque:
+    """
+    Snapshot of the numbers behind a character's basic attack.
+
+    Damage values are precomputed for every case the attack-only policy
+    can reach, so engines only need to track HP and the one resource
+    that changes (fury for warriors, ammunition for archers).
+    """
+
+    def __init__(self, personagem: Personagem):
+        """
+        Build the model from a character's current state
+
+        Args:
+            personagem: Character to model
+        """
+        self.classe = personagem.classe
+        self.vida = personagem.vida_atual
+        self.destreza = personagem.destreza
+
+        arma = personagem.equipamentos["arma"]
+        bonus_arma = arma.get("dano", 0) if arma else 0
+
+        # Defaults for classes without the resource
+        self.furia = 0
+        self.furia_maxima = 0
+        self.berserk = False
+        self.municao = 0
+        self.critico_max = 0  # Highest 1d100 roll that is a critical hit
+
+        if self.classe == "Guerreiro":
+            self.dano_normal = int(personagem.forca * 1.5) + bonus_arma
+            self.dano_furia = int(self.dano_normal * personagem.berserk_damage_multiplier)
+            self.furia = personagem.furia
+            self.furia_maxima = personagem.furia_maxima
+            self.berserk = personagem.is_berserk
+        elif self.classe == "Mago":
+            dano = int(personagem.inteligencia * 1.2) + bonus_arma
+            self.dano_normal = int(dano * personagem.elemental_damage_multiplier)
+            self.dano_furia = self.dano_normal
+        elif self.classe == "Arqueiro":
+            self.dano_normal = int(personagem.destreza * 1.3) + bonus_arma
+            self.dano_critico = int(self.dano_normal * personagem.critical_damage_multiplier)
+            # Without arrows the archer deals half damage
+            self.dano_normal_sem_flecha = int(self.dano_normal * 0.5)
+            self.dano_critico_sem_flecha = int(self.dano_critico * 0.5)
+            self.dano_furia = self.dano_normal
+            self.municao = personagem.municao
+            self.critico_max = max(0, min(100, int(personagem.critical_hit_chance)))
+        else:
+            raise ValueError(f"Classe não suportada: {self.classe}")
+
+    @property
+    def chance_critico(self) -> float:
+        """Probability that a basic attack is a critical hit"""
+        return self.critico_max / 100
+
+    def dano(self, furia: int, berserk: bool, municao: int, critico: bool) -> int:
+        """
+        Get the damage of a basic attack on an undefended target
+
+        Args:
+            furia: Current fury (warriors)
+            berserk: Whether the warrior is berserk
+            municao: Current arrows (archers)
+            critico: Whether the attack is a critical hit (archers)
+
+        Returns:
+            Damage dealt, never below 1
+        """
+        if self.classe == "Arqueiro":
+            if municao > 0:
+                dano = self.dano_critico if critico else self.dano_normal
+            else:
+                dano = self.dano_critico_sem_flecha if critico else self.dano_normal_sem_flecha
+        elif berserk:
+            dano = self.dano_furia
+        else:
+            dano = self.dano_normal
+        return max(1, dano)
+
+    def apos_ataque(self, furia: int, berserk: bool, municao: int) -> Tuple[int, bool, int]:
+        """
+        Get the resource state after a basic attack
+
+        Args:
+            furia: Current fury (warriors)
+            berserk: Whether the warrior is berserk
+            municao: Current arrows (archers)
+
+        Returns:
+            (fury, berserk, arrows) after the attack
+        """
+        if self.classe == "Guerreiro":
+            furia = min(self.furia_maxima, furia + GANHO_FURIA_ATAQUE)
+            berserk = berserk or furia >= LIMIAR_BERSERK
+        elif self.classe == "Arqueiro" and municao > 0:
+            municao -= 1
+        return furia, berserk, municao
@@ -0,0 +1,166 @@
+"""
+Vectorized Monte Carlo module for the Medieval Fantasy Battle Simulator.
+Simulates a batch of fights at once with NumPy arrays to estimate
+matchup win probabilities.
+"""
+
+from typing import NamedTuple, Optional
+import numpy as np
+from package.personagens.base import Personagem
+from package.combate import MAX_TURNOS_SIMULACAO
+from package.modelo_combate import ModeloAtaque, GANHO_FURIA_ATAQUE, LIMIAR_BERSERK
+
+
+class EstimativaConfronto(NamedTuple):
+    """
+    Aggregated outcome of a batch of simulated fights.
+    """
+    combates: int
+    vitorias1: int
+    vitorias2: int
+    empates: int
+    turnos_medios: float
+
+    @property
+    def probabilidade_vitoria1(self) -> float:
+        """Estimated probability that the first character wins"""
+        return self.vitorias1 / self.combates if self.combates else 0.0
+
+    @property
+    def probabilidade_vitoria2(self) -> float:
+        """Estimated probability that the second character wins"""
+        return self.vitorias2 / self.combates if self.combates else 0.0
+
+    @property
+    def probabilidade_empate(self) -> float:
+        """Estimated probability of a draw (turn limit reached)"""
+        return self.empates / self.combates if self.combates else 0.0
+
+
+class _EstadoLado:
+    """Per-fight arrays for one side of the batch"""
+
+    def __init__(self, modelo: ModeloAtaque, n: int):
+        self.modelo = modelo
+        self.vida = np.full(n, modelo.vida, dtype=np.int64)
+        self.furia = np.full(n, modelo.furia, dtype=np.int64)
+        self.berserk = np.full(n, modelo.berserk, dtype=bool)
+        self.municao = np.full(n, modelo.municao, dtype=np.int64)
+
+    def atacar(self, mascara: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Resolve a basic attack for the fights selected by the mask
+
+        Resources are only updated where the mask is set; the returned
+        damage array is meaningful only there as well.
+        """
+        modelo = self.modelo
+        n = mascara.shape[0]
+
+        if modelo.classe == "Guerreiro":
+            # Damage uses the berserk state before the fury gain
+            dano = np.where(self.berserk, modelo.dano_furia, modelo.dano_normal)
+            np.copyto(self.furia, np.minimum(self.furia + GANHO_FURIA_ATAQUE, modelo.furia_maxima),
+                      where=mascara)
+            self.berserk |= mascara & (self.furia >= LIMIAR_BERSERK)
+        elif modelo.classe == "Arqueiro":
+            # Same 1d100 roll as PrecisionMixin.roll_critical_hit, drawn in bulk
+            critico = rng.integers(1, 101, size=n) <= modelo.critico_max
+            com_flecha = self.municao > 0
+            dano = np.where(com_flecha,
+                            np.where(critico, modelo.dano_critico, modelo.dano_normal),
+                            np.where(critico, modelo.dano_critico_sem_flecha, modelo.dano_normal_sem_flecha))
+            np.subtract(self.municao, 1, out=self.municao, where=mascara & com_flecha)
+        else:
+            dano = np.full(n, modelo.dano_normal, dtype=np.int64)
+
+        return np.maximum(dano, 1)
+
+
+def _simular_lote(modelo1: ModeloAtaque, modelo2: ModeloAtaque, n: int,
+                  rng: np.random.Generator, max_turnos: int) -> EstimativaConfronto:
+    """Simulate n attack-only fights in lockstep"""
+    lado1 = _EstadoLado(modelo1, n)
+    lado2 = _EstadoLado(modelo2, n)
+
+    # Initiative as in Combate._determinar_primeiro_personagem (ties go to side 1)
+    ativo1 = (modelo1.destreza + rng.integers(1, 11, size=n)) >= (modelo2.destreza + rng.integers(1, 11, size=n))
+    turno = np.ones(n, dtype=np.int64)
+    vencedor = np.zeros(n, dtype=np.int8)
+    em_andamento = np.ones(n, dtype=bool)
+
+    while True:
+        em_andamento &= turno <= max_turnos
+        if not em_andamento.any():
+            break
+
+        mascara1 = em_andamento & ativo1
+        mascara2 = em_andamento & ~ativo1
+
+        if mascara1.any():
+            dano = lado1.atacar(mascara1, rng)
+            np.copyto(lado2.vida, np.maximum(lado2.vida - dano, 0), where=mascara1)
+        if mascara2.any():
+            dano = lado2.atacar(mascara2, rng)
+            np.copyto(lado1.vida, np.maximum(lado1.vida - dano, 0), where=mascara2)
+
+        # Same order as Combate._verificar_fim_combate
+        derrota1 = em_andamento & (lado1.vida <= 0)
+        derrota2 = em_andamento & (lado2.vida <= 0) & ~derrota1
+        vencedor[derrota1] = 2
+        vencedor[derrota2] = 1
+
+        # The turn counter advances after the second character acts,
+        # including the finishing blow (Combate._alternar_personagem_ativo)
+        np.add(turno, 1, out=turno, where=mascara2)
+        ativo1 = np.where(em_andamento, ~ativo1, ativo1)
+        em_andamento &= ~(derrota1 | derrota2)
+
+    vitorias1 = int(np.count_nonzero(vencedor == 1))
+    vitorias2 = int(np.count_nonzero(vencedor == 2))
+    return EstimativaConfronto(n, vitorias1, vitorias2, n - vitorias1 - vitorias2, float(turno.mean()))
+
+
+def estimar_confronto(personagem1: Personagem, personagem2: Personagem,
+                      combates: int = 1_000_000, semente: Optional[int] = None,
+                      max_turnos: int = MAX_TURNOS_SIMULACAO,
+                      tamanho_lote: int = 250_000) -> EstimativaConfronto:
+    """
+    Estimate matchup probabilities by simulating many fights at once
+
+    Follows the same rules as Combate.simular with politica_ataque, starting
+    every fight from the characters' current state: HP, fury, berserk state
+    and arrows are held as arrays, and initiative and critical rolls are
+    drawn in bulk. Mana and stamina are not used by the basic attack, so
+    they do not take part in the simulation.
+
+    Args:
+        personagem1: First character
+        personagem2: Second character
+        combates: Number of fights to simulate
+        semente: Seed for the NumPy generator
+        max_turnos: Turn limit per fight; reaching it is a draw
+        tamanho_lote: Fights simulated per batch (bounds memory use)
+
+    Returns:
+        Aggregated outcome of all simulated fights
+    """
+    modelo1 = ModeloAtaque(personagem1)
+    modelo2 = ModeloAtaque(personagem2)
+    rng = np.random.default_rng(semente)
+
+    vitorias1 = vitorias2 = empates = 0
+    soma_turnos = 0.0
+    restantes = combates
+
+    while restantes > 0:
+        n = min(tamanho_lote, restantes)
+        lote = _simular_lote(modelo1, modelo2, n, rng, max_turnos)
+        vitorias1 += lote.vitorias1
+        vitorias2 += lote.vitorias2
+        empates += lote.empates
+        soma_turnos += lote.turnos_medios * n
+        restantes -= n
+
+    return EstimativaConfronto(combates, vitorias1, vitorias2, empates,
+                               soma_turnos / combates if combates else 0.0)
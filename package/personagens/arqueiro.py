@@ -3,8 +3,9 @@ Archer character class for the Medieval Fantasy Battle Simulator.
 Specializes in ranged combat with high dexterity and critical strikes.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Mapping, Optional, List, Sequence, Tuple
 from package.personagens.base import Personagem
+from package.habilidades import CATALOGO_HABILIDADES
 from package.personagens.mixins import PrecisionMixin
 
 
@@ -14,6 +15,25 @@ class Arqueiro(Personagem, PrecisionMixin):
     Features high dexterity, critical strikes, and precision attacks.
     """
     
+    __slots__ = ("stamina", "stamina_maxima", "municao", "flechas_especiais",
+                 # PrecisionMixin
+                 "critical_hit_chance", "critical_damage_multiplier", "last_attack_was_critical")
+    
+    _HABILIDADES_PADRAO = CATALOGO_HABILIDADES.ids_da_classe("Arqueiro")
+    
+    # Ability handlers: ID -> (method, parameters read from the definition)
+    _TRATADORES_HABILIDADES = {
+        "tiro_certeiro": ("_usar_tiro_certeiro", ("multiplicador", "bonus_critico")),
+        "chuva_de_flechas": ("_usar_chuva_de_flechas", ("multiplicador", "num_flechas")),
+        "flecha_perfurante": ("_usar_flecha_perfurante", ("multiplicador", "penetracao_armadura")),
+        "evasao": ("_usar_evasao", ("bonus_evasao", "duracao"))
+    }
+    
+    _CAMPOS_COMPLETOS = Personagem._CAMPOS_COMPLETOS | frozenset({
+        "stamina", "stamina_maxima", "municao", "flechas_especiais",
+        "critical_hit_chance", "critical_damage_multiplier"
+    })
+    
     def __init__(self, nome: str):
         """
         Initialize a new Archer character
@@ -38,48 +58,6 @@ class Arqueiro(Personagem, PrecisionMixin):
         
         # Initialize precision system from mixin
         self.initialize_precision()
-        
-        # Add archer-specific abilities
-        self._habilidades = [
-            {
-                "id": "tiro_certeiro",
-                "nome": "Tiro Certeiro",
-                "descricao": "Um tiro preciso que causa dano extra",
-                "custo": 25,  # Stamina cost
-                "tipo": "ataque",
-                "multiplicador": 1.8,
-                "bonus_critico": 15  # +15% crit chance
-            },
-            {
-                "id": "chuva_de_flechas",
-                "nome": "Chuva de Flechas",
-                "descricao": "Dispara múltiplas flechas que causam dano em área",
-                "custo": 40,
-                "tipo": "ataque",
-                "multiplicador": 1.2,
-                "num_flechas": 3,
-                "custo_municao": 3
-            },
-            {
-                "id": "flecha_perfurante",
-                "nome": "Flecha Perfurante",
-                "descricao": "Uma flecha que ignora parte da defesa do alvo",
-                "custo": 30,
-                "tipo": "ataque",
-                "multiplicador": 1.5,
-                "penetracao_armadura": 0.3,  # Ignores 30% of armor
-                "custo_municao": 1
-            },
-            {
-                "id": "evasao",
-                "nome": "Evasão",
-                "descricao": "Aumenta a chance de esquivar de ataques",
-                "custo": 20,
-                "tipo": "defesa",
-                "bonus_evasao": 0.3,  # +30% evasion
-                "duracao": 2  # turns
-            }
-        ]
     
     def calcular_dano_ataque(self) -> int:
         """
@@ -204,10 +182,11 @@ class Arqueiro(Personagem, PrecisionMixin):
         Returns:
             Dictionary with ability usage results
         """
-        # Find the ability
-        habilidade = next((h for h in self._habilidades if h["id"] == habilidade_id), None)
-        if not habilidade:
+        # Find the ability and its handler
+        entrada = self._obter_tratador_habilidade(habilidade_id)
+        if entrada is None:
             return {"sucesso": False, "mensagem": "Habilidade não encontrada"}
+        tratador, habilidade = entrada
         
         # Check if we have enough stamina
         if not self.gastar_stamina(habilidade["custo"]):
@@ -228,72 +207,90 @@ class Arqueiro(Personagem, PrecisionMixin):
             "usuario": self.nome,
         }
         
-        # Handle ability effects based on type
-        if habilidade["id"] == "tiro_certeiro" and alvo:
-            # Temporarily increase crit chance
-            old_crit_chance = self.critical_hit_chance
-            self.critical_hit_chance += habilidade["bonus_critico"]
-            
-            # Calculate damage
-            dano_base = self.calcular_dano_ataque()
-            dano_final = int(dano_base * habilidade["multiplicador"])
-            
-            # Apply damage to target
-            alvo.vida_atual = max(0, alvo.vida_atual - dano_final)
-            
-            # Reset crit chance
-            self.critical_hit_chance = old_crit_chance
-            
-            resultado.update({
-                "alvo": alvo.nome,
-                "dano": dano_final,
-                "vida_restante_alvo": alvo.vida_atual,
-                "critico": self.last_attack_was_critical
-            })
-            
-        elif habilidade["id"] == "chuva_de_flechas" and alvo:
-            # Multiple attack simulation
-            dano_total = 0
-            for i in range(habilidade["num_flechas"]):
-                dano_flecha = int(self.calcular_dano_ataque() * habilidade["multiplicador"])
-                dano_total += dano_flecha
-            
-            # Apply damage to target
-            alvo.vida_atual = max(0, alvo.vida_atual - dano_total)
-            
-            resultado.update({
-                "alvo": alvo.nome,
-                "num_flechas": habilidade["num_flechas"],
-                "dano_total": dano_total,
-                "vida_restante_alvo": alvo.vida_atual
-            })
-            
-        elif habilidade["id"] == "flecha_perfurante" and alvo:
-            # Calculate damage with armor penetration
-            dano_base = self.calcular_dano_ataque()
-            dano_final = int(dano_base * habilidade["multiplicador"])
-            
-            # Note: In real combat system, this would bypass a percentage of target's armor
-            
-            # Apply damage to target
-            alvo.vida_atual = max(0, alvo.vida_atual - dano_final)
-            
-            resultado.update({
-                "alvo": alvo.nome,
-                "dano": dano_final,
-                "penetracao_armadura": f"{int(habilidade['penetracao_armadura']*100)}%",
-                "vida_restante_alvo": alvo.vida_atual
-            })
-            
-        elif habilidade["id"] == "evasao":
-            # Apply evasion bonus (would be handled by combat system)
-            resultado.update({
-                "bonus_evasao": f"{int(habilidade['bonus_evasao']*100)}%",
-                "duracao": habilidade["duracao"]
-            })
+        # Apply the ability effects
+        tratador(self, habilidade, alvo, resultado)
         
         return resultado
     
+    def _usar_tiro_certeiro(self, habilidade: Mapping[str, Any], alvo: Optional[Personagem],
+                            resultado: Dict[str, Any]) -> None:
+        """Precise shot: extra damage with a higher critical chance"""
+        if not alvo:
+            return
+        
+        # Temporarily increase crit chance
+        old_crit_chance = self.critical_hit_chance
+        self.critical_hit_chance += habilidade["bonus_critico"]
+        
+        # Calculate damage
+        dano_base = self.calcular_dano_ataque()
+        dano_final = int(dano_base * habilidade["multiplicador"])
+        
+        # Apply damage to target
+        alvo.vida_atual = max(0, alvo.vida_atual - dano_final)
+        
+        # Reset crit chance
+        self.critical_hit_chance = old_crit_chance
+        
+        resultado.update({
+            "alvo": alvo.nome,
+            "dano": dano_final,
+            "vida_restante_alvo": alvo.vida_atual,
+            "critico": self.last_attack_was_critical
+        })
+    
+    def _usar_chuva_de_flechas(self, habilidade: Mapping[str, Any], alvo: Optional[Personagem],
+                               resultado: Dict[str, Any]) -> None:
+        """Arrow rain: several arrows in one action"""
+        if not alvo:
+            return
+        
+        # Multiple attack simulation
+        dano_total = 0
+        for i in range(habilidade["num_flechas"]):
+            dano_flecha = int(self.calcular_dano_ataque() * habilidade["multiplicador"])
+            dano_total += dano_flecha
+        
+        # Apply damage to target
+        alvo.vida_atual = max(0, alvo.vida_atual - dano_total)
+        
+        resultado.update({
+            "alvo": alvo.nome,
+            "num_flechas": habilidade["num_flechas"],
+            "dano_total": dano_total,
+            "vida_restante_alvo": alvo.vida_atual
+        })
+    
+    def _usar_flecha_perfurante(self, habilidade: Mapping[str, Any], alvo: Optional[Personagem],
+                                resultado: Dict[str, Any]) -> None:
+        """Piercing arrow: damage that ignores part of the target's armor"""
+        if not alvo:
+            return
+        
+        # Calculate damage with armor penetration
+        dano_base = self.calcular_dano_ataque()
+        dano_final = int(dano_base * habilidade["multiplicador"])
+        
+        # Note: In real combat system, this would bypass a percentage of target's armor
+        
+        # Apply damage to target
+        alvo.vida_atual = max(0, alvo.vida_atual - dano_final)
+        
+        resultado.update({
+            "alvo": alvo.nome,
+            "dano": dano_final,
+            "penetracao_armadura": f"{int(habilidade['penetracao_armadura']*100)}%",
+            "vida_restante_alvo": alvo.vida_atual
+        })
+    
+    def _usar_evasao(self, habilidade: Mapping[str, Any], alvo: Optional[Personagem],
+                     resultado: Dict[str, Any]) -> None:
+        """Evasion bonus (would be handled by combat system)"""
+        resultado.update({
+            "bonus_evasao": f"{int(habilidade['bonus_evasao']*100)}%",
+            "duracao": habilidade["duracao"]
+        })
+    
     def _aplicar_bonus_nivel(self) -> None:
         """Apply bonuses when leveling up (archer specialization)"""
         super()._aplicar_bonus_nivel()
@@ -304,6 +301,19 @@ class Arqueiro(Personagem, PrecisionMixin):
         self.stamina = self.stamina_maxima  # Restore stamina on level up
         self.municao += 5  # Get some arrows on level up
     
+    def capturar_estado(self) -> Tuple[Any, ...]:
+        """Capture combat state, including stamina, arrows and crit state"""
+        return super().capturar_estado() + (self.stamina, self.municao,
+                                            self.critical_hit_chance, self.last_attack_was_critical)
+    
+    def restaurar_estado(self, estado: Sequence[Any]) -> None:
+        """Restore combat state, including stamina, arrows and crit state"""
+        super().restaurar_estado(estado)
+        self.stamina = estado[2]
+        self.municao = estado[3]
+        self.critical_hit_chance = estado[4]
+        self.last_attack_was_critical = estado[5]
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert archer to dictionary for serialization
@@ -324,22 +334,41 @@ class Arqueiro(Personagem, PrecisionMixin):
         })
         return data
     
+    @classmethod
+    def _restaurar(cls, data: Dict[str, Any]) -> 'Arqueiro':
+        """Build an archer from a complete stored dictionary without __init__"""
+        arqueiro = cls._criar_sem_inicializar(data)
+        arqueiro.stamina = data["stamina"]
+        arqueiro.stamina_maxima = data["stamina_maxima"]
+        arqueiro.municao = data["municao"]
+        arqueiro.flechas_especiais = data["flechas_especiais"]
+        arqueiro.initialize_precision()
+        arqueiro.critical_hit_chance = data["critical_hit_chance"]
+        arqueiro.critical_damage_multiplier = data["critical_damage_multiplier"]
+        return arqueiro
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Arqueiro':
         """
         Create archer from dictionary
         
+        Complete stored dictionaries are restored without running
+        __init__; partial ones start from a fresh archer.
+        
         Args:
             data: Dictionary with archer data
             
         Returns:
             New archer instance
         """
+        if data.keys() >= cls._CAMPOS_COMPLETOS:
+            return cls._restaurar(data)
+        
         arqueiro = cls(data["nome"])
         
         # Set basic properties
         for attr in ["id", "nivel", "experiencia", "vida_maxima", "vida_atual",
-                    "forca", "destreza", "inteligencia", "constituicao"]:
+                    "forca", "destreza", "inteligencia", "constituicao", "owner_id"]:
             if attr in data:
                 setattr(arqueiro, attr, data[attr])
         
@@ -361,7 +390,7 @@ class Arqueiro(Personagem, PrecisionMixin):
         
         # Set collections
         if "habilidades" in data:
-            arqueiro._habilidades = data["habilidades"]
+            arqueiro._carregar_habilidades(data["habilidades"], data.get("habilidades_ajustes"))
         if "inventario" in data:
             arqueiro._inventario = data["inventario"]
         if "equipamentos" in data:
@@ -4,8 +4,12 @@ Defines the abstract Personagem (Character) base class
 """
 
 from abc import ABC, abstractmethod
+import importlib
+import random
+import types
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, FrozenSet, Mapping, Optional, Sequence, Tuple, Type
+from package.habilidades import CATALOGO_HABILIDADES
 
 
 class Personagem(ABC):
@@ -14,6 +18,104 @@ class Personagem(ABC):
     Implements base attributes and methods common to all characters.
     """
     
+    # Fixed attribute layout: no per-instance __dict__ for large rosters.
+    # Subclasses declare their own attributes and those of their mixins.
+    __slots__ = (
+        "id", "nome", "nivel", "experiencia", "vida_maxima", "vida_atual",
+        "forca", "destreza", "inteligencia", "constituicao", "owner_id",
+        "_habilidades", "_habilidades_ajustes", "_inventario", "_equipamentos",
+        "__estado_defesa",
+        # Random source for combat rolls: the global random module by default,
+        # replaced by the combat the character takes part in
+        "_rng"
+    )
+    
+    # Stock ability IDs of the class, from the shared ability catalog
+    _HABILIDADES_PADRAO: Tuple[str, ...] = ()
+    
+    # Ability ID -> (handler method, parameters it reads from the definition).
+    # Compiled once per class into _despacho_habilidades by __init_subclass__.
+    _TRATADORES_HABILIDADES: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+    
+    # Handler method for abilities outside the table above, by ability type
+    _TRATADORES_POR_TIPO: Dict[str, str] = {
+        "ataque": "_usar_habilidade_ataque",
+        "defesa": "_usar_habilidade_defesa",
+        "utilidade": "_usar_habilidade_utilidade"
+    }
+    
+    # Concrete character classes by class name (see __init_subclass__)
+    _registro_classes: Dict[str, Type['Personagem']] = {}
+    
+    # Modules of the built-in classes, imported by obter_classe on a miss
+    _MODULOS_CLASSES = ("package.personagens.guerreiro", "package.personagens.mago",
+                        "package.personagens.arqueiro")
+    
+    # Keys every stored character has; from_dict builds complete payloads
+    # without running __init__ and sends partial ones through it
+    _CAMPOS_COMPLETOS: FrozenSet[str] = frozenset({
+        "id", "nome", "nivel", "experiencia", "vida_maxima", "vida_atual",
+        "forca", "destreza", "inteligencia", "constituicao",
+        "habilidades", "inventario", "equipamentos"
+    })
+    
+    def __init_subclass__(cls, **kwargs):
+        """Register each character class under its name, as stored in to_dict"""
+        super().__init_subclass__(**kwargs)
+        Personagem._registro_classes[cls.__name__] = cls
+        # Every slot of the class, used by __getstate__/__setstate__
+        cls._atributos = tuple(
+            nome for classe in reversed(cls.__mro__)
+            for nome, valor in vars(classe).items()
+            if isinstance(valor, types.MemberDescriptorType)
+        )
+        cls._despacho_habilidades = cls._compilar_despacho()
+        cls._despacho_por_tipo = {tipo: getattr(cls, metodo)
+                                  for tipo, metodo in cls._TRATADORES_POR_TIPO.items()}
+    
+    @classmethod
+    def _compilar_despacho(cls) -> Dict[str, Tuple[Callable[..., None], Mapping[str, Any]]]:
+        """
+        Build the ability dispatch table of the class
+        
+        Each catalog ability with a handler maps to (handler, definition);
+        the definition is checked here for every parameter the handler reads.
+        
+        Returns:
+            Ability ID -> (unbound handler, catalog definition)
+        """
+        despacho = {}
+        for habilidade_id, (metodo, parametros) in cls._TRATADORES_HABILIDADES.items():
+            definicao = CATALOGO_HABILIDADES.obter(habilidade_id)
+            if definicao is None:
+                raise ValueError(f"Habilidade fora do catálogo: {habilidade_id}")
+            faltando = [parametro for parametro in ("nome", "custo") + parametros
+                        if parametro not in definicao]
+            if faltando:
+                raise ValueError(f"Habilidade {habilidade_id} sem os parâmetros: {', '.join(faltando)}")
+            despacho[habilidade_id] = (getattr(cls, metodo), definicao)
+        return despacho
+    
+    @staticmethod
+    def obter_classe(nome: str) -> Type['Personagem']:
+        """
+        Get a registered character class by name
+        
+        Args:
+            nome: Class name, as stored in "classe"
+            
+        Returns:
+            The character class
+        """
+        classe = Personagem._registro_classes.get(nome)
+        if classe is None:
+            for modulo in Personagem._MODULOS_CLASSES:
+                importlib.import_module(modulo)
+            classe = Personagem._registro_classes.get(nome)
+        if classe is None:
+            raise ValueError(f"Classe não suportada: {nome}")
+        return classe
+    
     def __init__(self, nome: str):
         """
         Initialize a new character with base attributes
@@ -31,9 +133,13 @@ class Personagem(ABC):
         self.destreza = 10
         self.inteligencia = 10
         self.constituicao = 10
+        self.owner_id = None  # ID of the user that owns the character
         
         # Protected attributes - accessible to subclasses
-        self._habilidades = []
+        # Abilities are catalog IDs (the class's shared tuple until changed)
+        # plus the fields this character overrides, by ability ID
+        self._habilidades = self._HABILIDADES_PADRAO
+        self._habilidades_ajustes = None
         self._inventario = []
         self._equipamentos = {
             "arma": None,
@@ -42,17 +148,22 @@ class Personagem(ABC):
         }
         
         # Private attributes - internal use only
-        self.__classe = self.__class__.__name__
         self.__estado_defesa = False
+        self._rng = random
     
     @property
     def classe(self) -> str:
         """Get the character's class name"""
-        return self.__classe
+        return type(self).__name__
+    
+    @property
+    def habilidades(self) -> List[Mapping[str, Any]]:
+        """Get the character's abilities list (read-only definitions)"""
+        return [self.obter_habilidade(habilidade_id) for habilidade_id in self._habilidades]
     
     @property
-    def habilidades(self) -> List[Dict[str, Any]]:
-        """Get the character's abilities list"""
+    def ids_habilidades(self) -> Tuple[str, ...]:
+        """Get the IDs of the character's abilities"""
         return self._habilidades
     
     @property
@@ -74,9 +185,110 @@ class Personagem(ABC):
         """Set the defense state"""
         self.__estado_defesa = estado
     
+    def definir_rng(self, rng: random.Random) -> None:
+        """Set the random generator used by this character's rolls"""
+        self._rng = rng
+    
+    def obter_habilidade(self, habilidade_id: str) -> Optional[Mapping[str, Any]]:
+        """
+        Get one of the character's abilities with its overrides applied
+        
+        Args:
+            habilidade_id: ID of the ability
+            
+        Returns:
+            The ability definition, or None if the character doesn't have it
+        """
+        if habilidade_id not in self._habilidades:
+            return None
+        ajustes = self._habilidades_ajustes
+        return CATALOGO_HABILIDADES.resolver(habilidade_id, ajustes.get(habilidade_id) if ajustes else None)
+    
+    def _obter_tratador_habilidade(self, habilidade_id: str
+                                   ) -> Optional[Tuple[Callable[..., None], Mapping[str, Any]]]:
+        """
+        Find the handler and definition of one of the character's abilities
+        
+        Stock abilities without overrides come straight from the class's
+        dispatch table; anything else is resolved and dispatched by ID or,
+        failing that, by ability type.
+        
+        Args:
+            habilidade_id: ID of the ability
+            
+        Returns:
+            (unbound handler, ability definition), or None if the character
+            doesn't have the ability
+        """
+        entrada = self._despacho_habilidades.get(habilidade_id)
+        ajustes = self._habilidades_ajustes
+        if (entrada is not None and (ajustes is None or habilidade_id not in ajustes)
+                and (self._habilidades is self._HABILIDADES_PADRAO or habilidade_id in self._habilidades)):
+            return entrada
+        
+        habilidade = self.obter_habilidade(habilidade_id)
+        if habilidade is None:
+            return None
+        if entrada is not None:
+            return entrada[0], habilidade
+        tratador = self._despacho_por_tipo.get(habilidade.get("tipo"), Personagem._usar_habilidade_utilidade)
+        return tratador, habilidade
+    
+    def _usar_habilidade_ataque(self, habilidade: Mapping[str, Any], alvo: Optional['Personagem'],
+                                resultado: Dict[str, Any]) -> None:
+        """Generic attack ability: attack damage times the ability multiplier"""
+        if not isinstance(alvo, Personagem):
+            return
+        dano_final = int(self.calcular_dano_ataque() * habilidade.get("multiplicador", 1.0))
+        alvo.vida_atual = max(0, alvo.vida_atual - dano_final)
+        resultado.update({
+            "alvo": alvo.nome,
+            "dano": dano_final,
+            "vida_restante_alvo": alvo.vida_atual
+        })
+    
+    def _usar_habilidade_defesa(self, habilidade: Mapping[str, Any], alvo: Optional['Personagem'],
+                                resultado: Dict[str, Any]) -> None:
+        """Generic defense ability: defense stance until the next hit"""
+        self.set_estado_defesa(True)
+        resultado["duracao"] = habilidade.get("duracao", 1)
+    
+    def _usar_habilidade_utilidade(self, habilidade: Mapping[str, Any], alvo: Optional['Personagem'],
+                                   resultado: Dict[str, Any]) -> None:
+        """Generic utility ability: no effect besides its cost"""
+    
     def adicionar_habilidade(self, habilidade: Dict[str, Any]) -> None:
         """Add a new ability to the character"""
-        self._habilidades.append(habilidade)
+        habilidade_id, ajustes = CATALOGO_HABILIDADES.separar(habilidade)
+        if habilidade_id not in self._habilidades:
+            self._habilidades = self._habilidades + (habilidade_id,)
+        if ajustes:
+            self._habilidades_ajustes = dict(self._habilidades_ajustes or {}, **{habilidade_id: ajustes})
+    
+    def _carregar_habilidades(self, habilidades: Sequence[Any],
+                              ajustes: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """
+        Set the abilities from stored data
+        
+        Args:
+            habilidades: Ability IDs, or full definitions from older files
+            ajustes: Stored overrides by ability ID
+        """
+        ajustes = dict(ajustes) if ajustes else {}
+        ids = []
+        for habilidade in habilidades:
+            if isinstance(habilidade, str):
+                ids.append(habilidade)
+                continue
+            habilidade_id, ajuste = CATALOGO_HABILIDADES.separar(habilidade)
+            ids.append(habilidade_id)
+            if ajuste:
+                ajustes[habilidade_id] = ajuste
+        
+        ids = tuple(ids)
+        # Share the class tuple instead of keeping an equal copy per character
+        self._habilidades = self._HABILIDADES_PADRAO if ids == self._HABILIDADES_PADRAO else ids
+        self._habilidades_ajustes = ajustes or None
     
     def adicionar_item(self, item: Dict[str, Any]) -> None:
         """Add an item to the character's inventory"""
@@ -139,6 +351,27 @@ class Personagem(ABC):
         Returns:
             Dictionary with attack results
         """
+        dano_base, dano_final = self._resolver_ataque(alvo)
+        
+        return {
+            "tipo": "ataque",
+            "atacante": self.nome,
+            "alvo": alvo.nome,
+            "dano_base": dano_base,
+            "dano_final": dano_final,
+            "vida_restante_alvo": alvo.vida_atual
+        }
+    
+    def _resolver_ataque(self, alvo: 'Personagem') -> Tuple[int, int]:
+        """
+        Apply a basic attack to the target without building a result
+        
+        Args:
+            alvo: The target character to attack
+            
+        Returns:
+            Tuple with the base damage and the final damage dealt
+        """
         dano_base = self.calcular_dano_ataque()
         
         # Check if target is defending
@@ -152,14 +385,7 @@ class Personagem(ABC):
         dano_final = max(1, dano_final)  # Minimum 1 damage
         alvo.vida_atual = max(0, alvo.vida_atual - dano_final)
         
-        return {
-            "tipo": "ataque",
-            "atacante": self.nome,
-            "alvo": alvo.nome,
-            "dano_base": dano_base,
-            "dano_final": dano_final,
-            "vida_restante_alvo": alvo.vida_atual
-        }
+        return dano_base, dano_final
     
     def defender(self, dano_recebido: int) -> int:
         """
@@ -241,6 +467,59 @@ class Personagem(ABC):
         self.inteligencia += 2
         self.constituicao += 2
     
+    def capturar_estado(self) -> Tuple[Any, ...]:
+        """
+        Capture only the state that changes during a fight
+        
+        Much cheaper than to_dict/from_dict: no dictionaries, no new
+        character objects. Subclasses append their own combat resources.
+        
+        Returns:
+            Flat tuple to be passed back to restaurar_estado
+        """
+        return (self.vida_atual, self.__estado_defesa)
+    
+    def restaurar_estado(self, estado: Sequence[Any]) -> None:
+        """
+        Restore in place a state captured by capturar_estado
+        
+        Args:
+            estado: Tuple returned by capturar_estado
+        """
+        self.vida_atual = estado[0]
+        self.__estado_defesa = estado[1]
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle state: every set slot, without the shared random module"""
+        estado = {}
+        for nome in self._atributos:
+            try:
+                valor = getattr(self, nome)
+            except AttributeError:
+                continue
+            if valor is not random:
+                estado[nome] = valor
+        return estado
+    
+    def __setstate__(self, estado: Dict[str, Any]) -> None:
+        """
+        Restore pickled state
+        
+        Also accepts the __dict__ of characters pickled before the class
+        had slots; entries that are no longer attributes are ignored, and
+        the full ability definitions of those pickles become catalog IDs.
+        """
+        self._rng = random
+        self.owner_id = None
+        self._habilidades_ajustes = None
+        atributos = self._atributos
+        for nome, valor in estado.items():
+            if nome in atributos:
+                setattr(self, nome, valor)
+        # Older pickles keep a list of ability dicts and no overrides
+        if isinstance(self._habilidades, list):
+            self._carregar_habilidades(self._habilidades, self._habilidades_ajustes)
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert character to dictionary for serialization
@@ -248,7 +527,7 @@ class Personagem(ABC):
         Returns:
             Dictionary representation of the character
         """
-        return {
+        data = {
             "id": self.id,
             "nome": self.nome,
             "classe": self.classe,
@@ -260,17 +539,57 @@ class Personagem(ABC):
             "destreza": self.destreza,
             "inteligencia": self.inteligencia,
             "constituicao": self.constituicao,
-            "habilidades": self._habilidades,
+            "owner_id": self.owner_id,
+            "habilidades": list(self._habilidades),
             "inventario": self._inventario,
             "equipamentos": self._equipamentos,
             "estado_defesa": self.estado_defesa
         }
+        # Only abilities that differ from the catalog are stored in full
+        if self._habilidades_ajustes:
+            data["habilidades_ajustes"] = self._habilidades_ajustes
+        return data
+    
+    @classmethod
+    def _criar_sem_inicializar(cls, data: Dict[str, Any]) -> 'Personagem':
+        """
+        Build a character straight from a complete stored dictionary
+        
+        Skips __init__ (new UUID, default abilities) and sets the base
+        attributes from the data; subclasses set their own afterwards.
+        
+        Args:
+            data: Dictionary with every key in _CAMPOS_COMPLETOS
+            
+        Returns:
+            New character instance
+        """
+        personagem = cls.__new__(cls)
+        personagem.id = data["id"]
+        personagem.nome = data["nome"]
+        personagem.nivel = data["nivel"]
+        personagem.experiencia = data["experiencia"]
+        personagem.vida_maxima = data["vida_maxima"]
+        personagem.vida_atual = data["vida_atual"]
+        personagem.forca = data["forca"]
+        personagem.destreza = data["destreza"]
+        personagem.inteligencia = data["inteligencia"]
+        personagem.constituicao = data["constituicao"]
+        personagem.owner_id = data.get("owner_id")
+        personagem._carregar_habilidades(data["habilidades"], data.get("habilidades_ajustes"))
+        personagem._inventario = data["inventario"]
+        personagem._equipamentos = data["equipamentos"]
+        personagem.__estado_defesa = False
+        personagem._rng = random
+        return personagem
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Personagem':
         """
-        Create character from dictionary (abstract factory method)
-        Must be implemented by subclasses
+        Create character from dictionary
+        
+        Called on Personagem itself, dispatches to the registered class
+        named by data["classe"]; subclasses implement their own version.
         
         Args:
             data: Dictionary with character data
@@ -278,4 +597,6 @@ class Personagem(ABC):
         Returns:
             New character instance
         """
+        if cls is Personagem:
+            return Personagem.obter_classe(data["classe"]).from_dict(data)
         raise NotImplementedError("Must be implemented by subclasses")
\ No newline at end of file
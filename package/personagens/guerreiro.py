@@ -3,8 +3,9 @@ Warrior character class for the Medieval Fantasy Battle Simulator.
 Specializes in physical combat with high strength and defense.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Mapping, Optional, List, Sequence, Tuple
 from package.personagens.base import Personagem
+from package.habilidades import CATALOGO_HABILIDADES
 from package.personagens.mixins import BerserkMixin
 
 
@@ -14,6 +15,21 @@ class Guerreiro(Personagem, BerserkMixin):
     Features high strength, constitution, and melee attack power.
     """
     
+    __slots__ = ("furia", "furia_maxima",
+                 # BerserkMixin
+                 "is_berserk", "berserk_damage_multiplier", "berserk_defense_penalty")
+    
+    _HABILIDADES_PADRAO = CATALOGO_HABILIDADES.ids_da_classe("Guerreiro")
+    
+    # Ability handlers: ID -> (method, parameters read from the definition)
+    _TRATADORES_HABILIDADES = {
+        "golpe_poderoso": ("_usar_golpe_poderoso", ("multiplicador",)),
+        "provocar": ("_usar_provocar", ("bonus_furia",)),
+        "postura_defensiva": ("_usar_postura_defensiva", ("bonus_defesa",))
+    }
+    
+    _CAMPOS_COMPLETOS = Personagem._CAMPOS_COMPLETOS | frozenset({"furia", "furia_maxima", "is_berserk"})
+    
     def __init__(self, nome: str):
         """
         Initialize a new Warrior character
@@ -34,34 +50,6 @@ class Guerreiro(Personagem, BerserkMixin):
         self.furia = 0         # Rage resource for special abilities
         self.furia_maxima = 100
         
-        # Add warrior-specific abilities
-        self._habilidades = [
-            {
-                "id": "golpe_poderoso",
-                "nome": "Golpe Poderoso",
-                "descricao": "Um golpe devastador que causa dano extra",
-                "custo": 30,  # Fury cost
-                "tipo": "ataque",
-                "multiplicador": 1.5
-            },
-            {
-                "id": "provocar",
-                "nome": "Provocar",
-                "descricao": "Provoca o inimigo, ganhando furia",
-                "custo": 0,
-                "tipo": "utilidade",
-                "bonus_furia": 40
-            },
-            {
-                "id": "postura_defensiva",
-                "nome": "Postura Defensiva",
-                "descricao": "Aumenta a defesa por um turno",
-                "custo": 20,
-                "tipo": "defesa",
-                "bonus_defesa": 0.2  # 20% extra defense
-            }
-        ]
-        
         # Initialize berserk state from mixin
         self.initialize_berserk()
     
@@ -155,10 +143,11 @@ class Guerreiro(Personagem, BerserkMixin):
         Returns:
             Dictionary with ability usage results
         """
-        # Find the ability
-        habilidade = next((h for h in self._habilidades if h["id"] == habilidade_id), None)
-        if not habilidade:
+        # Find the ability and its handler
+        entrada = self._obter_tratador_habilidade(habilidade_id)
+        if entrada is None:
             return {"sucesso": False, "mensagem": "Habilidade não encontrada"}
+        tratador, habilidade = entrada
         
         # Check if we have enough fury
         if not self.gastar_furia(habilidade["custo"]):
@@ -171,42 +160,51 @@ class Guerreiro(Personagem, BerserkMixin):
             "usuario": self.nome,
         }
         
-        # Handle ability effects based on type
-        if habilidade["id"] == "golpe_poderoso" and alvo:
-            # Calculate damage
-            dano_base = self.calcular_dano_ataque()
-            dano_final = int(dano_base * habilidade["multiplicador"])
-            
-            # Apply damage to target
-            alvo.vida_atual = max(0, alvo.vida_atual - dano_final)
-            
-            resultado.update({
-                "alvo": alvo.nome,
-                "dano": dano_final,
-                "vida_restante_alvo": alvo.vida_atual
-            })
-            
-        elif habilidade["id"] == "provocar":
-            # Gain fury
-            fury_gained = habilidade["bonus_furia"]
-            self.ganhar_furia(fury_gained)
-            
-            resultado.update({
-                "bonus_furia": fury_gained,
-                "furia_atual": self.furia
-            })
-            
-        elif habilidade["id"] == "postura_defensiva":
-            # Set defense stance with bonus
-            self.set_estado_defesa(True)
-            
-            resultado.update({
-                "bonus_defesa": f"{int(habilidade['bonus_defesa']*100)}%",
-                "duracao": "1 turno"
-            })
+        # Apply the ability effects
+        tratador(self, habilidade, alvo, resultado)
         
         return resultado
     
+    def _usar_golpe_poderoso(self, habilidade: Mapping[str, Any], alvo: Optional[Personagem],
+                             resultado: Dict[str, Any]) -> None:
+        """Powerful strike: attack damage times the ability multiplier"""
+        if not alvo:
+            return
+        
+        # Calculate damage
+        dano_base = self.calcular_dano_ataque()
+        dano_final = int(dano_base * habilidade["multiplicador"])
+        
+        # Apply damage to target
+        alvo.vida_atual = max(0, alvo.vida_atual - dano_final)
+        
+        resultado.update({
+            "alvo": alvo.nome,
+            "dano": dano_final,
+            "vida_restante_alvo": alvo.vida_atual
+        })
+    
+    def _usar_provocar(self, habilidade: Mapping[str, Any], alvo: Optional[Personagem],
+                       resultado: Dict[str, Any]) -> None:
+        """Taunt: gain fury"""
+        fury_gained = habilidade["bonus_furia"]
+        self.ganhar_furia(fury_gained)
+        
+        resultado.update({
+            "bonus_furia": fury_gained,
+            "furia_atual": self.furia
+        })
+    
+    def _usar_postura_defensiva(self, habilidade: Mapping[str, Any], alvo: Optional[Personagem],
+                                resultado: Dict[str, Any]) -> None:
+        """Defensive stance: defend against the next hit"""
+        self.set_estado_defesa(True)
+        
+        resultado.update({
+            "bonus_defesa": f"{int(habilidade['bonus_defesa']*100)}%",
+            "duracao": "1 turno"
+        })
+    
     def _aplicar_bonus_nivel(self) -> None:
         """Apply bonuses when leveling up (warrior specialization)"""
         super()._aplicar_bonus_nivel()
@@ -215,6 +213,16 @@ class Guerreiro(Personagem, BerserkMixin):
         self.constituicao += 1
         self.furia_maxima += 5
     
+    def capturar_estado(self) -> Tuple[Any, ...]:
+        """Capture combat state, including fury and berserk state"""
+        return super().capturar_estado() + (self.furia, self.is_berserk)
+    
+    def restaurar_estado(self, estado: Sequence[Any]) -> None:
+        """Restore combat state, including fury and berserk state"""
+        super().restaurar_estado(estado)
+        self.furia = estado[2]
+        self.is_berserk = estado[3]
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert warrior to dictionary for serialization
@@ -233,22 +241,39 @@ class Guerreiro(Personagem, BerserkMixin):
         })
         return data
     
+    @classmethod
+    def _restaurar(cls, data: Dict[str, Any]) -> 'Guerreiro':
+        """Build a warrior from a complete stored dictionary without __init__"""
+        guerreiro = cls._criar_sem_inicializar(data)
+        guerreiro.furia = data["furia"]
+        guerreiro.furia_maxima = data["furia_maxima"]
+        guerreiro.initialize_berserk()
+        if data["is_berserk"]:
+            guerreiro.is_berserk = True
+        return guerreiro
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Guerreiro':
         """
         Create warrior from dictionary
         
+        Complete stored dictionaries are restored without running
+        __init__; partial ones start from a fresh warrior.
+        
         Args:
             data: Dictionary with warrior data
             
         Returns:
             New warrior instance
         """
+        if data.keys() >= cls._CAMPOS_COMPLETOS:
+            return cls._restaurar(data)
+        
         guerreiro = cls(data["nome"])
         
         # Set basic properties
         for attr in ["id", "nivel", "experiencia", "vida_maxima", "vida_atual",
-                    "forca", "destreza", "inteligencia", "constituicao"]:
+                    "forca", "destreza", "inteligencia", "constituicao", "owner_id"]:
             if attr in data:
                 setattr(guerreiro, attr, data[attr])
         
@@ -260,7 +285,7 @@ class Guerreiro(Personagem, BerserkMixin):
         
         # Set collections
         if "habilidades" in data:
-            guerreiro._habilidades = data["habilidades"]
+            guerreiro._carregar_habilidades(data["habilidades"], data.get("habilidades_ajustes"))
         if "inventario" in data:
             guerreiro._inventario = data["inventario"]
         if "equipamentos" in data:
@@ -3,8 +3,9 @@ Mage character class for the Medieval Fantasy Battle Simulator.
 Specializes in magical combat with high intelligence and spell variety.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Mapping, Optional, List, Sequence, Tuple
 from package.personagens.base import Personagem
+from package.habilidades import CATALOGO_HABILIDADES
 from package.personagens.mixins import ElementalMixin
 
 
@@ -14,6 +15,22 @@ class Mago(Personagem, ElementalMixin):
     Features high intelligence, spell variety, and elemental mastery.
     """
     
+    __slots__ = ("mana", "mana_maxima",
+                 # ElementalMixin
+                 "elemento_ativo", "elemental_damage_multiplier")
+    
+    _HABILIDADES_PADRAO = CATALOGO_HABILIDADES.ids_da_classe("Mago")
+    
+    # Ability handlers: ID -> (method, parameters read from the definition)
+    _TRATADORES_HABILIDADES = {
+        "bola_de_fogo": ("_usar_magia_ataque", ("multiplicador",)),
+        "raio_de_gelo": ("_usar_magia_ataque", ("multiplicador",)),
+        "barreira_arcana": ("_usar_barreira_arcana", ("absorve_dano", "duracao")),
+        "mudar_elemento": ("_usar_mudar_elemento", ("elementos_disponiveis",))
+    }
+    
+    _CAMPOS_COMPLETOS = Personagem._CAMPOS_COMPLETOS | frozenset({"mana", "mana_maxima", "elemento_ativo"})
+    
     def __init__(self, nome: str):
         """
         Initialize a new Mage character
@@ -37,46 +54,6 @@ class Mago(Personagem, ElementalMixin):
         
         # Initialize elemental magic from mixin
         self.initialize_elemental("fogo")
-        
-        # Add mage-specific abilities
-        self._habilidades = [
-            {
-                "id": "bola_de_fogo",
-                "nome": "Bola de Fogo",
-                "descricao": "Conjura uma bola de fogo que causa dano ao alvo",
-                "custo": 25,  # Mana cost
-                "tipo": "ataque",
-                "elemento": "fogo",
-                "multiplicador": 2.0
-            },
-            {
-                "id": "raio_de_gelo",
-                "nome": "Raio de Gelo",
-                "descricao": "Conjura um raio de gelo que causa dano e reduz a velocidade do alvo",
-                "custo": 30,
-                "tipo": "ataque",
-                "elemento": "gelo",
-                "multiplicador": 1.6,
-                "efeito": "lentidao"
-            },
-            {
-                "id": "barreira_arcana",
-                "nome": "Barreira Arcana",
-                "descricao": "Cria uma barreira mágica que absorve dano",
-                "custo": 35,
-                "tipo": "defesa",
-                "duracao": 2,  # Turns
-                "absorve_dano": 40
-            },
-            {
-                "id": "mudar_elemento",
-                "nome": "Mudar Elemento",
-                "descricao": "Muda o elemento ativo do mago",
-                "custo": 10,
-                "tipo": "utilidade",
-                "elementos_disponiveis": ["fogo", "gelo", "raio", "arcano"]
-            }
-        ]
     
     def calcular_dano_ataque(self) -> int:
         """
@@ -180,10 +157,11 @@ class Mago(Personagem, ElementalMixin):
         Returns:
             Dictionary with ability usage results
         """
-        # Find the ability
-        habilidade = next((h for h in self._habilidades if h["id"] == habilidade_id), None)
-        if not habilidade:
+        # Find the ability and its handler
+        entrada = self._obter_tratador_habilidade(habilidade_id)
+        if entrada is None:
             return {"sucesso": False, "mensagem": "Habilidade não encontrada"}
+        tratador, habilidade = entrada
         
         # Check if we have enough mana
         if not self.gastar_mana(habilidade["custo"]):
@@ -196,56 +174,65 @@ class Mago(Personagem, ElementalMixin):
             "usuario": self.nome,
         }
         
-        # Handle ability effects based on type
-        if habilidade["id"] in ["bola_de_fogo", "raio_de_gelo"] and alvo:
-            # Set element temporarily if different from active
-            old_element = self.elemento_ativo
-            if "elemento" in habilidade and habilidade["elemento"] != self.elemento_ativo:
-                self.mudar_elemento(habilidade["elemento"])
-            
-            # Calculate damage
-            dano_base = self.calcular_dano_ataque()
-            dano_final = int(dano_base * habilidade["multiplicador"])
-            
-            # Apply damage to target
-            alvo.vida_atual = max(0, alvo.vida_atual - dano_final)
-            
-            # Apply additional effects
-            efeitos = []
-            if "efeito" in habilidade:
-                if habilidade["efeito"] == "lentidao":
-                    # Apply slow effect (would be handled by combat system)
-                    efeitos.append("lentidao")
-            
-            # Restore original element if changed
-            if "elemento" in habilidade and habilidade["elemento"] != old_element:
-                self.mudar_elemento(old_element)
-            
-            resultado.update({
-                "alvo": alvo.nome,
-                "dano": dano_final,
-                "vida_restante_alvo": alvo.vida_atual,
-                "efeitos": efeitos
-            })
-            
-        elif habilidade["id"] == "barreira_arcana":
-            # Apply arcane barrier (would be handled by combat system)
-            resultado.update({
-                "barreira": habilidade["absorve_dano"],
-                "duracao": habilidade["duracao"]
-            })
-            
-        elif habilidade["id"] == "mudar_elemento":
-            # Change active element based on user choice
-            novo_elemento = "fogo"  # Default, would be chosen by user
-            if alvo and isinstance(alvo, str) and alvo in habilidade["elementos_disponiveis"]:
-                novo_elemento = alvo
-            
-            mudanca = self.mudar_elemento(novo_elemento)
-            resultado.update(mudanca)
+        # Apply the ability effects
+        tratador(self, habilidade, alvo, resultado)
         
         return resultado
     
+    def _usar_magia_ataque(self, habilidade: Mapping[str, Any], alvo: Optional[Personagem],
+                           resultado: Dict[str, Any]) -> None:
+        """Attack spell: damage with the spell's element and extra effects"""
+        if not alvo:
+            return
+        
+        # Set element temporarily if different from active
+        old_element = self.elemento_ativo
+        if "elemento" in habilidade and habilidade["elemento"] != self.elemento_ativo:
+            self.mudar_elemento(habilidade["elemento"])
+        
+        # Calculate damage
+        dano_base = self.calcular_dano_ataque()
+        dano_final = int(dano_base * habilidade["multiplicador"])
+        
+        # Apply damage to target
+        alvo.vida_atual = max(0, alvo.vida_atual - dano_final)
+        
+        # Apply additional effects
+        efeitos = []
+        if "efeito" in habilidade:
+            if habilidade["efeito"] == "lentidao":
+                # Apply slow effect (would be handled by combat system)
+                efeitos.append("lentidao")
+        
+        # Restore original element if changed
+        if "elemento" in habilidade and habilidade["elemento"] != old_element:
+            self.mudar_elemento(old_element)
+        
+        resultado.update({
+            "alvo": alvo.nome,
+            "dano": dano_final,
+            "vida_restante_alvo": alvo.vida_atual,
+            "efeitos": efeitos
+        })
+    
+    def _usar_barreira_arcana(self, habilidade: Mapping[str, Any], alvo: Optional[Personagem],
+                              resultado: Dict[str, Any]) -> None:
+        """Arcane barrier (would be handled by combat system)"""
+        resultado.update({
+            "barreira": habilidade["absorve_dano"],
+            "duracao": habilidade["duracao"]
+        })
+    
+    def _usar_mudar_elemento(self, habilidade: Mapping[str, Any], alvo: Optional[Personagem],
+                             resultado: Dict[str, Any]) -> None:
+        """Change active element based on user choice"""
+        novo_elemento = "fogo"  # Default, would be chosen by user
+        if alvo and isinstance(alvo, str) and alvo in habilidade["elementos_disponiveis"]:
+            novo_elemento = alvo
+        
+        mudanca = self.mudar_elemento(novo_elemento)
+        resultado.update(mudanca)
+    
     def _aplicar_bonus_nivel(self) -> None:
         """Apply bonuses when leveling up (mage specialization)"""
         super()._aplicar_bonus_nivel()
@@ -254,6 +241,17 @@ class Mago(Personagem, ElementalMixin):
         self.mana_maxima += 15
         self.mana = self.mana_maxima  # Restore mana on level up
     
+    def capturar_estado(self) -> Tuple[Any, ...]:
+        """Capture combat state, including mana and active element"""
+        return super().capturar_estado() + (self.mana, self.elemento_ativo, self.elemental_damage_multiplier)
+    
+    def restaurar_estado(self, estado: Sequence[Any]) -> None:
+        """Restore combat state, including mana and active element"""
+        super().restaurar_estado(estado)
+        self.mana = estado[2]
+        self.elemento_ativo = estado[3]
+        self.elemental_damage_multiplier = estado[4]
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert mage to dictionary for serialization
@@ -271,22 +269,38 @@ class Mago(Personagem, ElementalMixin):
         })
         return data
     
+    @classmethod
+    def _restaurar(cls, data: Dict[str, Any]) -> 'Mago':
+        """Build a mage from a complete stored dictionary without __init__"""
+        mago = cls._criar_sem_inicializar(data)
+        mago.mana = data["mana"]
+        mago.mana_maxima = data["mana_maxima"]
+        mago.initialize_elemental("fogo")
+        mago.change_element(data["elemento_ativo"])
+        return mago
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Mago':
         """
         Create mage from dictionary
         
+        Complete stored dictionaries are restored without running
+        __init__; partial ones start from a fresh mage.
+        
         Args:
             data: Dictionary with mage data
             
         Returns:
             New mage instance
         """
+        if data.keys() >= cls._CAMPOS_COMPLETOS:
+            return cls._restaurar(data)
+        
         mago = cls(data["nome"])
         
         # Set basic properties
         for attr in ["id", "nivel", "experiencia", "vida_maxima", "vida_atual",
-                    "forca", "destreza", "inteligencia", "constituicao"]:
+                    "forca", "destreza", "inteligencia", "constituicao", "owner_id"]:
             if attr in data:
                 setattr(mago, attr, data[attr])
         
@@ -302,7 +316,7 @@ class Mago(Personagem, ElementalMixin):
         
         # Set collections
         if "habilidades" in data:
-            mago._habilidades = data["habilidades"]
+            mago._carregar_habilidades(data["habilidades"], data.get("habilidades_ajustes"))
         if "inventario" in data:
             mago._inventario = data["inventario"]
         if "equipamentos" in data:
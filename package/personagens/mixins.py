@@ -3,7 +3,6 @@ Mixin classes for adding special abilities to characters
 in the Medieval Fantasy Battle Simulator.
 """
 
-import random
 from typing import Dict, Any, Optional
 
 
@@ -13,6 +12,9 @@ class PrecisionMixin:
     with a chance of critical hits.
     """
     
+    # Attributes live in the slots of the class using the mixin
+    __slots__ = ()
+    
     def initialize_precision(self) -> None:
         """Initialize precision attributes"""
         self.critical_hit_chance = 10.0  # Base 10% crit chance
@@ -26,7 +28,7 @@ class PrecisionMixin:
         Returns:
             True if critical hit, False otherwise
         """
-        roll = random.randint(1, 100)
+        roll = self._rng.randint(1, 100)
         self.last_attack_was_critical = roll <= self.critical_hit_chance
         return self.last_attack_was_critical
     
@@ -63,6 +65,9 @@ class BerserkMixin:
     trading defense for offense.
     """
     
+    # Attributes live in the slots of the class using the mixin
+    __slots__ = ()
+    
     def initialize_berserk(self) -> None:
         """Initialize berserk attributes"""
         self.is_berserk = False
@@ -114,6 +119,17 @@ class ElementalMixin:
     with different effects based on the active element.
     """
     
+    # Attributes live in the slots of the class using the mixin
+    __slots__ = ()
+    
+    # Damage bonus of each element, shared by every character
+    elementos_bonus = {
+        "fogo": 1.2,    # Fire: 20% more damage
+        "gelo": 1.1,    # Ice: 10% more damage, has slow effect
+        "raio": 1.15,   # Lightning: 15% more damage, has stun chance
+        "arcano": 1.25  # Arcane: 25% more damage, no special effect
+    }
+    
     def initialize_elemental(self, elemento_inicial: str) -> None:
         """
         Initialize elemental attributes
@@ -123,12 +139,6 @@ class ElementalMixin:
         """
         self.elemento_ativo = elemento_inicial
         self.elemental_damage_multiplier = 1.0
-        self.elementos_bonus = {
-            "fogo": 1.2,    # Fire: 20% more damage
-            "gelo": 1.1,    # Ice: 10% more damage, has slow effect
-            "raio": 1.15,   # Lightning: 15% more damage, has stun chance
-            "arcano": 1.25  # Arcane: 25% more damage, no special effect
-        }
     
     def change_element(self, novo_elemento: str) -> bool:
         """
@@ -181,6 +191,9 @@ class StealthMixin:
     gaining bonuses to their next attack or action.
     """
     
+    # Attributes live in the slots of the class using the mixin
+    __slots__ = ()
+    
     def initialize_stealth(self) -> None:
         """Initialize stealth attributes"""
         self.is_stealthed = False
@@ -242,5 +255,5 @@ class StealthMixin:
         if not self.is_stealthed:
             return False
         
-        roll = random.randint(1, 100)
+        roll = self._rng.randint(1, 100)
         return roll <= self.stealth_detection_chance
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""
+Live combat registry module for the Medieval Fantasy Battle Simulator.
+Keeps active combats in memory between requests and persists them in
+the background instead of reloading and rewriting them on every action.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+from package.combate import Combate
+from package.banco import BancoDados
+
+
+class _CombateAtivo:
+    """Registry entry: a live combat and its bookkeeping"""
+
+    def __init__(self, combate: Combate):
+        self.combate = combate
+        self.lock = threading.Lock()
+        self.ultimo_acesso = time.monotonic()
+        self.alterado = False
+
+
+class RegistroCombates:
+    """
+    In-memory registry of active combats, keyed by ID.
+
+    Combats are loaded from BancoDados once and then served from memory.
+    Actions mark a combat as changed; a background thread writes changed
+    combats every intervalo_gravacao seconds (write-behind) and drops
+    combats idle for longer than tempo_ocioso, saving them first.
+    Finished combats go straight to history and leave the registry.
+    """
+
+    def __init__(self, banco: BancoDados, intervalo_gravacao: float = 5.0,
+                 tempo_ocioso: float = 600.0, iniciar_thread: bool = True):
+        """
+        Initialize the registry
+
+        Args:
+            banco: Database used to load and persist combats
+            intervalo_gravacao: Seconds between background writes of changed
+                                combats (0 writes after every action)
+            tempo_ocioso: Seconds without actions before a combat is evicted
+            iniciar_thread: Whether to start the background writer
+        """
+        self.banco = banco
+        self.intervalo_gravacao = intervalo_gravacao
+        self.tempo_ocioso = tempo_ocioso
+
+        self._combates: Dict[str, _CombateAtivo] = {}
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self.gravacoes = 0
+        self.remocoes_ociosos = 0
+
+        if iniciar_thread:
+            self.iniciar()
+
+    def iniciar(self) -> None:
+        """Start the background writer thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="registro-combates", daemon=True)
+        self._thread.start()
+
+    def encerrar(self) -> None:
+        """Stop the background writer and save every changed combat"""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.gravar_pendentes()
+
+    def _executar(self) -> None:
+        """Background loop: periodic writes and idle eviction"""
+        # Wake up often enough for both the write interval and idle checks
+        espera = min(self.intervalo_gravacao or 1.0, max(self.tempo_ocioso, 0.1))
+        while not self._parar.wait(espera):
+            try:
+                self.gravar_pendentes()
+                self.remover_ociosos()
+            except Exception as e:
+                print(f"Erro no registro de combates: {e}")
+
+    def __len__(self) -> int:
+        """Number of combats held in memory"""
+        return len(self._combates)
+
+    def registrar(self, combate: Combate) -> None:
+        """
+        Add a new combat to the registry and persist it right away
+
+        Args:
+            combate: Newly created combat
+        """
+        with self._lock:
+            self._combates[combate.id] = _CombateAtivo(combate)
+        self.banco.salvar_combate(combate)
+
+    def _obter_entrada(self, combate_id: str) -> Optional[_CombateAtivo]:
+        """Get a registry entry, loading the combat from the database on a miss"""
+        with self._lock:
+            entrada = self._combates.get(combate_id)
+        if entrada is not None:
+            return entrada
+
+        combate = self.banco.carregar_combate(combate_id)
+        if combate is None:
+            return None
+
+        with self._lock:
+            # Another request may have loaded it in the meantime
+            return self._combates.setdefault(combate_id, _CombateAtivo(combate))
+
+    def obter(self, combate_id: str) -> Optional[Combate]:
+        """
+        Get an active combat for reading
+
+        Args:
+            combate_id: Combat ID
+
+        Returns:
+            The live combat, or None if it does not exist
+        """
+        entrada = self._obter_entrada(combate_id)
+        if entrada is None:
+            return None
+        entrada.ultimo_acesso = time.monotonic()
+        return entrada.combate
+
+    @contextmanager
+    def usar(self, combate_id: str) -> Iterator[Optional[Combate]]:
+        """
+        Lock an active combat while an action is applied to it
+
+        On exit the combat is marked as changed; a finished combat is saved
+        to history and removed from the registry.
+
+        Args:
+            combate_id: Combat ID
+
+        Yields:
+            The live combat, or None if it does not exist
+        """
+        while True:
+            entrada = self._obter_entrada(combate_id)
+            if entrada is None:
+                yield None
+                return
+
+            entrada.lock.acquire()
+            # The entry may have been evicted while we waited for its lock
+            if self._combates.get(combate_id) is entrada:
+                break
+            entrada.lock.release()
+
+        try:
+            entrada.ultimo_acesso = time.monotonic()
+            yield entrada.combate
+
+            if entrada.combate.finalizado:
+                with self._lock:
+                    self._combates.pop(combate_id, None)
+                self.banco.salvar_historico_combate(entrada.combate)
+                entrada.alterado = False
+                return
+
+            entrada.alterado = True
+            if self.intervalo_gravacao <= 0:
+                self._gravar(entrada)
+        finally:
+            entrada.lock.release()
+
+    def _gravar(self, entrada: _CombateAtivo) -> None:
+        """Persist a changed combat (caller holds the entry lock)"""
+        if not entrada.alterado:
+            return
+        if self.banco.salvar_combate(entrada.combate):
+            entrada.alterado = False
+            self.gravacoes += 1
+
+    def gravar_pendentes(self) -> int:
+        """
+        Persist every changed combat
+
+        Returns:
+            Number of combats written
+        """
+        with self._lock:
+            entradas = list(self._combates.values())
+
+        gravados = 0
+        for entrada in entradas:
+            if not entrada.alterado:
+                continue
+            with entrada.lock:
+                if entrada.alterado:
+                    self._gravar(entrada)
+                    gravados += 1
+        return gravados
+
+    def remover_ociosos(self) -> List[str]:
+        """
+        Evict combats without actions for longer than tempo_ocioso
+
+        Changed combats are saved before they leave memory; combats in the
+        middle of an action are skipped.
+
+        Returns:
+            IDs of the evicted combats
+        """
+        limite = time.monotonic() - self.tempo_ocioso
+        with self._lock:
+            candidatos = [(combate_id, entrada) for combate_id, entrada in self._combates.items()
+                          if entrada.ultimo_acesso < limite]
+
+        removidos = []
+        for combate_id, entrada in candidatos:
+            if not entrada.lock.acquire(blocking=False):
+                continue
+            try:
+                self._gravar(entrada)
+                if entrada.alterado:
+                    # Write failed; keep it in memory and retry later
+                    continue
+                with self._lock:
+                    if self._combates.get(combate_id) is entrada:
+                        del self._combates[combate_id]
+                        removidos.append(combate_id)
+            finally:
+                entrada.lock.release()
+
+        self.remocoes_ociosos += len(removidos)
+        return removidos
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """
+        Get the registry counters
+
+        Returns:
+            Dictionary with active and pending combats, writes and evictions
+        """
+        with self._lock:
+            entradas = list(self._combates.values())
+        return {
+            "ativos": len(entradas),
+            "pendentes": sum(1 for entrada in entradas if entrada.alterado),
+            "gravacoes": self.gravacoes,
+            "remocoes_ociosos": self.remocoes_ociosos
+        }
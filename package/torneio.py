@@ -0,0 +1,183 @@
+"""
+Tournament module for the Medieval Fantasy Battle Simulator.
+Runs round-robin matchups across a character roster in parallel
+and merges the outcomes into a win-rate matrix.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from package.personagens.base import Personagem
+from package.combate import simular_combates, MAX_TURNOS_SIMULACAO
+
+
+# Roster shared by every task of a worker process (set by the pool initializer)
+_roster_worker: List[Personagem] = []
+
+
+def _inicializar_worker(personagens: List[Personagem]) -> None:
+    """Receive the roster once per worker process instead of once per task"""
+    global _roster_worker
+    _roster_worker = personagens
+
+
+def _executar_lote(tarefa: Tuple[int, int, int, int, int]) -> Tuple[int, int, int, int, int]:
+    """
+    Run one chunk of fights for an ordered matchup inside a worker
+
+    Args:
+        tarefa: (index of first character, index of second character,
+                 number of fights, RNG seed, turn limit)
+
+    Returns:
+        (index 1, index 2, wins of 1, wins of 2, draws)
+    """
+    indice1, indice2, quantidade, semente, max_turnos = tarefa
+
+    # Each chunk gets its own seeded stream, so results do not depend
+    # on how chunks are distributed across workers
+    resultados = simular_combates(_roster_worker[indice1], _roster_worker[indice2],
+                                  quantidade, max_turnos=max_turnos, semente=semente)
+
+    vitorias1 = vitorias2 = 0
+    for resultado in resultados:
+        if resultado.vencedor == 1:
+            vitorias1 += 1
+        elif resultado.vencedor == 2:
+            vitorias2 += 1
+
+    return indice1, indice2, vitorias1, vitorias2, quantidade - vitorias1 - vitorias2
+
+
+class ResultadoTorneio:
+    """
+    Merged outcome of a round-robin tournament.
+
+    vitorias[i][j] counts the fights character i won against character j,
+    combates[i][j] the fights played between them (in both side orders).
+    """
+
+    def __init__(self, personagens: List[Personagem]):
+        """
+        Initialize empty matrices for a roster
+
+        Args:
+            personagens: Characters taking part in the tournament
+        """
+        n = len(personagens)
+        self.ids = [p.id for p in personagens]
+        self.nomes = [p.nome for p in personagens]
+        self.classes = [p.classe for p in personagens]
+        self.vitorias = [[0] * n for _ in range(n)]
+        self.empates = [[0] * n for _ in range(n)]
+        self.combates = [[0] * n for _ in range(n)]
+
+    def registrar(self, indice1: int, indice2: int, vitorias1: int, vitorias2: int, empates: int) -> None:
+        """Merge the counts of one chunk into the matrices"""
+        total = vitorias1 + vitorias2 + empates
+        self.vitorias[indice1][indice2] += vitorias1
+        self.vitorias[indice2][indice1] += vitorias2
+        self.empates[indice1][indice2] += empates
+        self.empates[indice2][indice1] += empates
+        self.combates[indice1][indice2] += total
+        self.combates[indice2][indice1] += total
+
+    def taxa_vitoria(self, indice1: int, indice2: int) -> Optional[float]:
+        """
+        Get the win rate of one character against another
+
+        Returns:
+            Fraction of fights won, or None if they never met
+        """
+        total = self.combates[indice1][indice2]
+        if not total:
+            return None
+        return self.vitorias[indice1][indice2] / total
+
+    def matriz_taxas(self) -> List[List[Optional[float]]]:
+        """Get the full win-rate matrix"""
+        n = len(self.ids)
+        return [[self.taxa_vitoria(i, j) for j in range(n)] for i in range(n)]
+
+    def taxa_vitoria_geral(self, indice: int) -> Optional[float]:
+        """Get the win rate of a character against the whole roster"""
+        total = sum(self.combates[indice])
+        if not total:
+            return None
+        return sum(self.vitorias[indice]) / total
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert tournament result to dictionary for serialization
+
+        Returns:
+            Dictionary representation of the tournament result
+        """
+        return {
+            "ids": self.ids,
+            "nomes": self.nomes,
+            "classes": self.classes,
+            "vitorias": self.vitorias,
+            "empates": self.empates,
+            "combates": self.combates,
+            "taxas": self.matriz_taxas()
+        }
+
+
+def _gerar_tarefas(num_personagens: int, combates_por_confronto: int, tamanho_lote: int,
+                   semente: Optional[int], max_turnos: int) -> List[Tuple[int, int, int, int, int]]:
+    """Split every ordered matchup into seeded chunks"""
+    gerador_sementes = random.Random(semente)
+    tarefas = []
+
+    for indice1 in range(num_personagens):
+        for indice2 in range(num_personagens):
+            if indice1 == indice2:
+                continue
+            restantes = combates_por_confronto
+            while restantes > 0:
+                quantidade = min(tamanho_lote, restantes)
+                tarefas.append((indice1, indice2, quantidade, gerador_sementes.getrandbits(64), max_turnos))
+                restantes -= quantidade
+
+    return tarefas
+
+
+def executar_torneio(personagens: List[Personagem], combates_por_confronto: int = 100,
+                     max_workers: Optional[int] = None, tamanho_lote: int = 500,
+                     semente: Optional[int] = None,
+                     max_turnos: int = MAX_TURNOS_SIMULACAO) -> ResultadoTorneio:
+    """
+    Run a round-robin tournament across a process pool
+
+    Every ordered pair of distinct characters fights combates_por_confronto
+    times with the attack-only policy, so each pair meets in both side
+    orders. Fights are split into chunks of tamanho_lote and spread across
+    the worker processes; with a fixed seed the result is the same for any
+    number of workers.
+
+    Args:
+        personagens: Characters taking part in the tournament
+        combates_por_confronto: Fights per ordered matchup
+        max_workers: Number of worker processes (defaults to the CPU count)
+        tamanho_lote: Fights per chunk sent to a worker
+        semente: Seed for the chunk RNG streams
+        max_turnos: Turn limit per fight
+
+    Returns:
+        Merged tournament result
+    """
+    resultado = ResultadoTorneio(personagens)
+    tarefas = _gerar_tarefas(len(personagens), combates_por_confronto, tamanho_lote, semente, max_turnos)
+
+    if not tarefas:
+        return resultado
+
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_inicializar_worker,
+                             initargs=(personagens,)) as executor:
+        for contagem in executor.map(_executar_lote, tarefas, chunksize=max(1, len(tarefas) // (max_workers * 4))):
+            resultado.registrar(*contagem)
+
+    return resultado
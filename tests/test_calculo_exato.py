@@ -0,0 +1,63 @@
+"""
+Tests for the cap on the exact matchup DP (package.calculo_exato).
+"""
+
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.calculo_exato import CalculadoraExata, LimiteEstadosExcedido, calcular_probabilidades
+from package.personagens.arqueiro import Arqueiro
+from package.personagens.guerreiro import Guerreiro
+
+
+def _arqueiros(vida: int):
+    """Two archers with the given HP (the matchup with the most states)"""
+    arqueiro1, arqueiro2 = Arqueiro("a"), Arqueiro("b")
+    for arqueiro in (arqueiro1, arqueiro2):
+        arqueiro.vida_maxima = arqueiro.vida_atual = vida
+    return arqueiro1, arqueiro2
+
+
+class TestLimiteEstados(unittest.TestCase):
+    """The DP table stops growing at max_estados"""
+
+    def test_classes_padrao_ficam_exatas(self):
+        resultado = calcular_probabilidades(Guerreiro("g"), Arqueiro("a"))
+        self.assertTrue(resultado.exato)
+        self.assertAlmostEqual(resultado.vitoria1 + resultado.vitoria2 + resultado.empate, 1.0)
+
+    def test_limite_interrompe_e_libera_tabela(self):
+        calculadora = CalculadoraExata(*_arqueiros(2000), max_estados=1000)
+        with self.assertRaises(LimiteEstadosExcedido):
+            calculadora.calcular()
+        self.assertEqual(calculadora.estados_explorados, 0)
+
+    def test_sem_limite_igual_ao_limitado(self):
+        arqueiro1, arqueiro2 = _arqueiros(300)
+        limitado = CalculadoraExata(arqueiro1, arqueiro2, max_estados=10 ** 6).calcular()
+        sem_limite = CalculadoraExata(arqueiro1, arqueiro2, max_estados=None).calcular()
+        self.assertEqual(limitado, sem_limite)
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy não instalado")
+    def test_recai_em_monte_carlo(self):
+        resultado = calcular_probabilidades(*_arqueiros(2000), max_estados=1000, combates_estimativa=10_000)
+        self.assertFalse(resultado.exato)
+        self.assertAlmostEqual(resultado.vitoria1 + resultado.vitoria2 + resultado.empate, 1.0)
+
+    def test_sem_numpy_propaga_limite(self):
+        if importlib.util.find_spec("numpy"):
+            self.skipTest("NumPy instalado")
+        with self.assertRaises(LimiteEstadosExcedido):
+            calcular_probabilidades(*_arqueiros(2000), max_estados=1000)
+
+    def test_limite_invalido(self):
+        with self.assertRaises(ValueError):
+            CalculadoraExata(Guerreiro("g"), Arqueiro("a"), max_estados=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
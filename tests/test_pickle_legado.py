@@ -0,0 +1,53 @@
+"""
+Regression tests for characters pickled before the slots and the ability
+catalog (data/personagens_baseline.pkl was written by the baseline code).
+"""
+
+import os
+import pickle
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.personagens.guerreiro import Guerreiro
+
+ARQUIVO_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados", "personagens_baseline.pkl")
+
+
+class TestPickleLegado(unittest.TestCase):
+    """Characters pickled at the baseline (plain __dict__, full ability dicts)"""
+
+    def setUp(self):
+        with open(ARQUIVO_BASELINE, "rb") as arquivo:
+            self.guerreiro, self.mago, self.arqueiro = pickle.load(arquivo)
+
+    def test_habilidades_viram_ids(self):
+        self.assertEqual(self.guerreiro._habilidades, ("golpe_poderoso", "provocar", "postura_defensiva"))
+        self.assertEqual(self.arqueiro._habilidades[0], "tiro_certeiro")
+        self.assertIsNone(self.guerreiro._habilidades_ajustes)
+
+    def test_ajuste_preservado(self):
+        # The baseline pickle lowered the cost of the mage's first ability
+        self.assertEqual(self.mago._habilidades_ajustes, {"bola_de_fogo": {"custo": 20}})
+        self.assertEqual(self.mago.obter_habilidade("bola_de_fogo")["custo"], 20)
+
+    def test_atributos_ausentes_recebem_padrao(self):
+        for personagem in (self.guerreiro, self.mago, self.arqueiro):
+            self.assertIsNone(personagem.owner_id)
+
+    def test_usar_habilidade(self):
+        for personagem in (self.mago, self.arqueiro):
+            alvo = Guerreiro("Alvo")
+            resultado = personagem.usar_habilidade(personagem._habilidades[0], alvo)
+            self.assertTrue(resultado["sucesso"])
+            self.assertLess(alvo.vida_atual, alvo.vida_maxima)
+
+    def test_to_dict_e_novo_pickle(self):
+        copia = pickle.loads(pickle.dumps(self.mago))
+        self.assertEqual(copia.to_dict(), self.mago.to_dict())
+        self.assertEqual(copia.to_dict()["id"], "baseline-mago")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Medieval Fantasy Battle Simulator
+Round-robin tournament entry point
+
+Usage:
+    python torneio.py --combates 1000 --workers 4 --semente 42
+"""
+
+import argparse
+import json
+import time
+from package.banco import BancoDados
+from package.torneio import executar_torneio
+
+
+def imprimir_matriz(resultado) -> None:
+    """Print the win-rate matrix as a table"""
+    largura = max([len(nome) for nome in resultado.nomes] + [8])
+    print(" " * largura + " | " + " ".join(f"{i:>6}" for i in range(len(resultado.nomes))) + " |  geral")
+
+    for i, nome in enumerate(resultado.nomes):
+        taxas = []
+        for j in range(len(resultado.nomes)):
+            taxa = resultado.taxa_vitoria(i, j)
+            taxas.append("     -" if taxa is None else f"{taxa:>6.1%}")
+        geral = resultado.taxa_vitoria_geral(i)
+        geral_texto = "-" if geral is None else f"{geral:.1%}"
+        print(f"{nome:>{largura}} | " + " ".join(taxas) + f" | {geral_texto:>6}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Torneio todos-contra-todos entre os personagens salvos")
+    parser.add_argument("--combates", type=int, default=100, help="Combates por confronto (por ordem de lados)")
+    parser.add_argument("--workers", type=int, default=None, help="Número de processos (padrão: núcleos da CPU)")
+    parser.add_argument("--lote", type=int, default=500, help="Combates por tarefa enviada a um processo")
+    parser.add_argument("--semente", type=int, default=None, help="Semente para resultados reproduzíveis")
+    parser.add_argument("--json", action="store_true", help="Imprimir o resultado em JSON")
+    args = parser.parse_args()
+
+    personagens = BancoDados().carregar_todos_personagens()
+    if len(personagens) < 2:
+        print("São necessários pelo menos 2 personagens em data/personagens")
+        return
+
+    inicio = time.perf_counter()
+    resultado = executar_torneio(personagens, args.combates, args.workers, args.lote, args.semente)
+    duracao = time.perf_counter() - inicio
+
+    if args.json:
+        print(json.dumps(resultado.to_dict(), ensure_ascii=False, indent=2))
+        return
+
+    total = sum(map(sum, resultado.combates)) // 2
+    imprimir_matriz(resultado)
+    print(f"\n{total} combates em {duracao:.2f}s ({total / duracao:,.0f} combates/s)")
+
+
+if __name__ == '__main__':
+    main()